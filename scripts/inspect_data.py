@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import yaml
 
 from optimal_quoting.data.loader import CSVSpec, load_top_of_book_csv
@@ -29,6 +28,8 @@ def main() -> None:
 
     Path("reports/figures").mkdir(parents=True, exist_ok=True)
 
+    import matplotlib.pyplot as plt
+
     plt.figure()
     plt.plot(df["ts"], df["mid"])
     plt.title("Mid price")
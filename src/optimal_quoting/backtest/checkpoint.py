@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from optimal_quoting.backtest.engine import MMParams, ToySimulation
+from optimal_quoting.metrics.intraday import IntradayRiskMonitor
+from optimal_quoting.metrics.markout import MarkoutTracker
+
+STATE = "state.pkl"
+
+
+def _segment_path(directory: Path, start: int) -> Path:
+    return directory / f"segment_{start:012d}.npz"
+
+
+def run_checkpointed(
+    p: MMParams,
+    directory: str | Path,
+    segment_steps: int,
+    max_segments: int | None = None,
+    monitor: IntradayRiskMonitor | None = None,
+    markouts: MarkoutTracker | None = None,
+) -> ToySimulation:
+    """
+    Run the toy backtest of `p` in segments of `segment_steps` steps, with
+    the output columns of each segment written to
+    `<directory>/segment_<first step>.npz` and the simulation state to
+    `<directory>/state.pkl` after it.
+
+    If the directory already holds a state, the run resumes from it (the
+    params must be the same; `monitor` / `markouts` then come from the
+    state). A crash between a segment file and the state update only costs
+    that segment: it is recomputed bit-identically on resume. With
+    `max_segments`, stop after that many segments, e.g. to run a long
+    backtest as a chain of scheduler jobs.
+
+    Returns the simulation (`done` once the run is complete); read the
+    outputs with load_segments.
+    """
+    if segment_steps < 1:
+        raise ValueError("segment_steps must be >= 1")
+    directory = Path(directory)
+    state = directory / STATE
+    if state.exists():
+        sim = ToySimulation.load(state)
+        if sim.p != p:
+            raise ValueError(f"{state} was written for different params")
+    else:
+        directory.mkdir(parents=True, exist_ok=True)
+        sim = ToySimulation(p, monitor=monitor, markouts=markouts)
+
+    n_segments = 0
+    while not sim.done and (max_segments is None or n_segments < max_segments):
+        start = sim.t
+        out = sim.run(segment_steps)
+        np.savez(_segment_path(directory, start), **out)
+        sim.save(state)
+        n_segments += 1
+    return sim
+
+
+def load_segments(directory: str | Path) -> dict[str, np.ndarray]:
+    """
+    Output columns of a checkpointed run (run_checkpointed), concatenated in
+    step order; raises ValueError if a segment is missing.
+    """
+    directory = Path(directory)
+    paths = sorted(directory.glob("segment_*.npz"))
+    if not paths:
+        raise ValueError(f"no segments in {directory}")
+
+    parts = []
+    expected = 0
+    for path in paths:
+        start = int(path.stem.split("_")[1])
+        if start != expected:
+            raise ValueError(f"missing steps [{expected}, {start}) in {directory}")
+        with np.load(path) as seg:
+            part = {key: seg[key] for key in seg.files}
+        parts.append(part)
+        expected = start + len(part["time_s"])
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
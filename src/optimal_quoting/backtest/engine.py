@@ -2,12 +2,37 @@ from __future__ import annotations
 from optimal_quoting.strategy.avellaneda_stoikov import ASStrategyConfig, compute_as_quotes
 from optimal_quoting.strategy.probing import ProbingConfig, compute_probing_quotes
 from dataclasses import dataclass
+import math
+import os
+from pathlib import Path
+import pickle
+from typing import TYPE_CHECKING
+
 import numpy as np
-import pandas as pd
 
+from optimal_quoting.metrics.intraday import IntradayRiskMonitor
+from optimal_quoting.metrics.markout import MarkoutTracker
 from optimal_quoting.model.intensity import intensity_exp
+from optimal_quoting.sim.adverse_selection import AdverseSelectionConfig, AdverseSelectionState
+from optimal_quoting.sim.hawkes import HawkesExcitation
+from optimal_quoting.sim.lob import ASK, BID, LOBConfig, LOBSimulator
 from optimal_quoting.sim.poisson import event_happens
-from optimal_quoting.strategy.quotes import compute_quotes
+from optimal_quoting.sim.rng import make_rng_streams, seed_sequence
+from optimal_quoting.strategy.quote_manager import QuoteManager, QuoteManagerConfig
+from optimal_quoting.strategy.quotes import (
+    Quotes,
+    compute_quotes,
+    inventory_limit_sides,
+    snap_quotes_to_ticks,
+    suppress_sides,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+POLICIES = ("baseline", "probing", "as")
+FILL_MODELS = ("intensity", "lob")
 
 
 @dataclass(frozen=True)
@@ -23,72 +48,395 @@ class MMParams:
     order_size: float
     fee_bps: float
     seed: int = 42
+    spawn_key: tuple[int, ...] = ()  # SeedSequence spawn key under `seed` (sweeps: see sim.rng.sweep_seed)
     probing_p: float = 0.0
     probing_jitter: float = 0.0
     probing_widen_only: bool = True
     policy: str = "baseline"   # "baseline" | "probing" | "as"
     gamma: float = 0.1
+    rng_streams: bool = False  # per-purpose RNG streams (common random numbers across policies)
+    antithetic: bool = False   # flip the sign of the mid shocks (pair with a non-antithetic run)
+    tick_size: float = 0.0     # > 0: quotes and cash on an integer tick lattice
+    inv_limit: float | None = None  # hard |inventory| limit: quote one side only at the limit
+    adverse_jump: float = 0.0       # adverse selection: immediate mid move per lot filled
+    adverse_drift: float = 0.0      # adverse selection: further mid drift per lot filled
+    adverse_half_life: float = 0.0  # half-life (s) of the drift release
+    hawkes_alpha: float = 0.0       # self-exciting fills: jump in A per fill on the same side
+    hawkes_beta: float = 1.0        # decay rate (1/s) of the excitation
+    fill_model: str = "intensity"   # "intensity" (A exp(-k δ)) | "lob" (queue position, needs tick_size)
+    lob_levels: int = 20            # lob: price levels per side
+    lob_limit_rate: float = 1.0     # lob: limit orders per level per second
+    lob_cancel_rate: float = 0.1    # lob: cancellations per resting lot per second
+    lob_mo_rate: float = 0.5        # lob: market orders per side per second
+    lob_mo_size: int = 5            # lob: lots per market order
+    quote_tolerance: float = 0.0    # amend a resting quote only if it moved by more than this
+    quote_max_rate: float = 0.0     # order messages per second (0: unlimited)
+    quote_burst: int = 10           # messages that can go out back to back under quote_max_rate
+
+
+def policy_quotes(p: MMParams, mid: float, q: float, t_now: float, rng: np.random.Generator) -> Quotes:
+    """
+    Dispatch on p.policy:
+      - "as": Avellaneda–Stoikov quotes
+      - "probing": baseline + randomized probing (needs probing_p > 0 and probing_jitter > 0)
+      - otherwise: baseline quotes with inventory skew
+    """
+    if p.policy == "as":
+        return compute_as_quotes(
+            mid=mid,
+            q=q,
+            t=t_now,
+            T=p.T,
+            sigma=p.sigma,
+            k=p.k,
+            cfg=ASStrategyConfig(gamma=p.gamma),
+        )
+    if p.policy == "probing" and p.probing_p > 0.0 and p.probing_jitter > 0.0:
+        qcfg = ProbingConfig(p_explore=p.probing_p, jitter=p.probing_jitter, widen_only=p.probing_widen_only)
+        return compute_probing_quotes(mid, q, p.base_spread, p.phi, qcfg, rng)
+    return compute_quotes(mid, q, p.base_spread, p.phi)
+
+
+def run_mm_toy(
+    p: MMParams,
+    monitor: IntradayRiskMonitor | None = None,
+    markouts: MarkoutTracker | None = None,
+) -> pd.DataFrame:
+    """
+    Toy single-asset market-making backtest, as a DataFrame with columns
+    time_s, mid, inventory, cash, equity, bid, ask, fill_bid, fill_ask, messages.
+
+    See run_mm_toy_arrays for the model; this wrapper only builds the frame
+    (pandas is imported here, not at module import).
+    """
+    import pandas as pd
+
+    return pd.DataFrame(run_mm_toy_arrays(p, monitor=monitor, markouts=markouts))
+
+
+def run_mm_toy_arrays(
+    p: MMParams,
+    monitor: IntradayRiskMonitor | None = None,
+    markouts: MarkoutTracker | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    NumPy-only core of the toy backtest: returns the output columns as a dict
+    of arrays (same keys as the run_mm_toy frame), for workers that do not
+    need pandas.
+
+    State is kept on integer lattices: inventory as a count of `order_size`
+    lots and, when `tick_size > 0`, quotes and cash as integer ticks (quotes
+    are snapped outwards: bid down, ask up). Floats are only formed at output,
+    so inventory never accumulates rounding error and tick runs are exact.
+
+    With `inv_limit`, the side that would push |inventory| past the limit is
+    not quoted (NaN price in the output) and its fill draw is skipped.
 
+    Adverse selection (`adverse_jump` / `adverse_drift`): each fill moves the
+    subsequent mid against the filled side, see sim/adverse_selection.py.
 
+    Clustered flow (`hawkes_alpha > 0`): each side's intensity is
+        λ_t = (A + S_t) exp(-k δ_t),
+    where S_t jumps by hawkes_alpha at each fill on that side and decays at
+    rate hawkes_beta (sim/hawkes.py); the fill probability over a step uses
+    the exact integral of S over the step.
+
+    With `fill_model="lob"`, fills come from the queue-position book of
+    sim/lob.py instead of the intensity (A, k and the Hawkes fields are then
+    unused): our lot fills once market orders consume the volume ahead of it.
+
+    Quotes go through a QuoteManager (strategy/quote_manager.py): the resting
+    quote per side is amended only when the new price moved by more than
+    `quote_tolerance` (and at least a tick), within `quote_max_rate`
+    messages per second, and a fill consumes it. The bid / ask columns and
+    the fills are those of the resting quotes; `messages` counts the order
+    messages sent each step. With the defaults every price change is sent,
+    which reproduces re-quoting every step.
+
+    If `monitor` is given, it is updated after every step and the run stops
+    early (the returned arrays are truncated) as soon as it reports a breach.
+    If `markouts` is given, it is fed every step (streaming markout PnL).
+
+    This is one ToySimulation run over all steps; use ToySimulation directly
+    to run in segments or checkpoint / resume (backtest/checkpoint.py).
+    """
+    return ToySimulation(p, monitor=monitor, markouts=markouts).run()
+
+
+class ToySimulation:
+    """
+    Resumable state of the toy backtest (see run_mm_toy_arrays for the model).
+
+    Everything carried from one step to the next lives on the instance: the
+    generators (bit-generator states), last mid, inventory / cash / fee
+    accumulators, quote manager, adverse-selection, Hawkes and LOB states,
+    monitor, markouts and `t`, the index of the next step. `run(n)` advances
+    by n steps and returns that segment's output columns; the segments of a
+    run concatenate to exactly the columns of a single run() call.
+
+    The state pickles as a whole (`save` / `load`), so a long run can be
+    checkpointed to disk and resumed bit-identically in another process.
+    """
+
+    def __init__(
+        self,
+        p: MMParams,
+        monitor: IntradayRiskMonitor | None = None,
+        markouts: MarkoutTracker | None = None,
+    ) -> None:
+        if p.tick_size < 0:
+            raise ValueError("tick_size must be >= 0")
+        if p.inv_limit is not None and p.inv_limit < 0:
+            raise ValueError("inv_limit must be >= 0")
+        if p.fill_model not in FILL_MODELS:
+            raise ValueError("fill_model must be 'intensity' or 'lob'")
+        if p.fill_model == "lob" and p.tick_size <= 0:
+            raise ValueError("fill_model='lob' needs tick_size > 0")
+        self.p = p
+        self.monitor = monitor
+        self.markouts = markouts
+        self.n_steps = int(p.T / p.dt) + 1
+        self.t = 0
+        self.stopped = False          # the monitor reported a breach
+
+        ss = seed_sequence(p.seed, p.spawn_key)
+        if p.rng_streams:
+            streams = make_rng_streams(ss)
+            self.rng = streams.probing
+            self.rng_bid, self.rng_ask = streams.bid, streams.ask
+            # the mid path does not depend on the policy: shocks come from their own stream
+            self.rng_mid = streams.mid
+        else:
+            self.rng = np.random.default_rng(ss)
+            self.rng_bid = self.rng_ask = self.rng
+            self.rng_mid = None
+
+        adv_cfg = AdverseSelectionConfig(jump=p.adverse_jump, drift=p.adverse_drift, half_life=p.adverse_half_life)
+        self.adv = AdverseSelectionState(adv_cfg, p.dt) if adv_cfg.active else None
+        self.book = None
+        if p.fill_model == "lob":
+            lob_cfg = LOBConfig(
+                tick_size=p.tick_size,
+                n_levels=p.lob_levels,
+                limit_rate=p.lob_limit_rate,
+                cancel_rate=p.lob_cancel_rate,
+                mo_rate=p.lob_mo_rate,
+                mo_size=p.lob_mo_size,
+            )
+            self.book = LOBSimulator(lob_cfg, p.dt, p.mid0, self.rng_bid)
+        if p.hawkes_alpha > 0.0:
+            self.hawkes_bid = HawkesExcitation(p.hawkes_alpha, p.hawkes_beta, p.dt)
+            self.hawkes_ask = HawkesExcitation(p.hawkes_alpha, p.hawkes_beta, p.dt)
+        else:
+            self.hawkes_bid = self.hawkes_ask = None
 
-def run_mm_toy(p: MMParams) -> pd.DataFrame:
-    rng = np.random.default_rng(p.seed)
-    n = int(p.T / p.dt) + 1
-
-    mid = np.empty(n, dtype=float)
-    mid[0] = p.mid0
-
-    q = 0.0
-    cash = 0.0
-    fee = p.fee_bps * 1e-4
-
-    rows = []
-    for t in range(n):
-        if t > 0:
-            mid[t] = max(0.01, mid[t - 1] + rng.normal(0.0, p.sigma))
-
-        m = float(mid[t])
-        if p.probing_p > 0.0 and p.probing_jitter > 0.0:
-            qcfg = ProbingConfig(p_explore=p.probing_p, jitter=p.probing_jitter, widen_only=p.probing_widen_only)
-            t_now = t * p.dt
-            if p.policy == "as":
-                quotes = compute_as_quotes(
-                mid=m,
-                q=q,
-                t=t_now,
-                T=p.T,
-                sigma=p.sigma,
-                k=p.k,
-                cfg=ASStrategyConfig(gamma=p.gamma),
+        self.qm = QuoteManager(QuoteManagerConfig.from_params(p))
+
+        self.mid = p.mid0
+        self.q_lots = 0
+        self.cash = 0            # int ticks (ticked) or float currency
+        self.fees = 0.0
+
+    @property
+    def done(self) -> bool:
+        return self.stopped or self.t >= self.n_steps
+
+    def run(self, n_steps: int | None = None) -> dict[str, np.ndarray]:
+        """
+        Advance by n_steps (default: to the end) and return the output
+        columns of these steps (time_s keeps counting from the run start).
+        """
+        p = self.p
+        t0 = self.t
+        t1 = self.n_steps if n_steps is None else min(self.n_steps, t0 + max(0, int(n_steps)))
+        if self.stopped:
+            t1 = t0
+        n = t1 - t0
+        ticked = p.tick_size > 0.0
+
+        shocks = self.rng_mid.normal(0.0, p.sigma, size=n) if self.rng_mid is not None else None
+        sign = -1.0 if p.antithetic else 1.0
+        rng, rng_bid, rng_ask = self.rng, self.rng_bid, self.rng_ask
+        adv, book, qm = self.adv, self.book, self.qm
+        hawkes_bid, hawkes_ask = self.hawkes_bid, self.hawkes_ask
+        monitor, markouts = self.monitor, self.markouts
+
+        # --- preallocated output buffers (compact integer lattices)
+        mid = np.empty(n, dtype=float)
+        msgs = np.zeros(n, dtype=np.int32)
+        inv_lots = np.empty(n, dtype=np.int32)
+        fill_bid_arr = np.zeros(n, dtype=bool)
+        fill_ask_arr = np.zeros(n, dtype=bool)
+        bid_on = np.ones(n, dtype=bool)
+        ask_on = np.ones(n, dtype=bool)
+        if ticked:
+            bid_px = np.empty(n, dtype=np.int64)
+            ask_px = np.empty(n, dtype=np.int64)
+            cash_arr = np.empty(n, dtype=np.int64)   # cash in ticks per lot
+            fee_arr = np.empty(n, dtype=float)       # cumulative fees (currency)
+        else:
+            bid_px = np.empty(n, dtype=float)
+            ask_px = np.empty(n, dtype=float)
+            cash_arr = np.empty(n, dtype=float)
+            fee_arr = None
+
+        m = self.mid
+        q_lots = self.q_lots
+        cash = self.cash
+        fees = self.fees
+        fee = p.fee_bps * 1e-4
+        size = p.order_size
+        # hard limit |inventory| <= inv_limit, expressed in whole lots
+        max_lots = None if p.inv_limit is None else math.floor(p.inv_limit / size + 1e-9)
+
+        n_out = n
+        for i, t in enumerate(range(t0, t1)):
+            if t > 0:
+                eps = shocks[i] if shocks is not None else rng.normal(0.0, p.sigma)
+                dmid = sign * eps
+                if adv is not None:
+                    dmid += adv.step()
+                m = max(0.01, m + dmid)
+            mid[i] = m
+
+            m = float(m)
+            q = q_lots * size
+            quotes = policy_quotes(p, m, q, t * p.dt, rng)
+
+            quote_bid, quote_ask = inventory_limit_sides(q_lots, max_lots)
+            quotes = suppress_sides(quotes, bid=quote_bid, ask=quote_ask)
+
+            if ticked:
+                quotes, bid_t, ask_t = snap_quotes_to_ticks(quotes, m, p.tick_size)
+
+            # only the amendments that pass the quote manager reach the market
+            n_msgs = qm.n_messages
+            qm.update(BID, quotes.bid, t * p.dt)
+            qm.update(ASK, quotes.ask, t * p.dt)
+            msgs[i] = qm.n_messages - n_msgs
+            rest_bid, rest_ask = qm.resting
+            if rest_bid != quotes.bid or rest_ask != quotes.ask:
+                quotes = Quotes(
+                    bid=rest_bid,
+                    ask=rest_ask,
+                    delta_bid=None if rest_bid is None else max(0.0, m - rest_bid),
+                    delta_ask=None if rest_ask is None else max(0.0, rest_ask - m),
+                )
+                if ticked:
+                    bid_t = None if rest_bid is None else round(rest_bid / p.tick_size)
+                    ask_t = None if rest_ask is None else round(rest_ask / p.tick_size)
+            quote_bid, quote_ask = rest_bid is not None, rest_ask is not None
+
+            # a suppressed side costs neither an intensity evaluation nor a draw
+            if book is not None:
+                fill_bid, fill_ask = book.step(m, bid_t if quote_bid else None, ask_t if quote_ask else None)
+            elif hawkes_bid is None:
+                fill_bid = quote_bid and event_happens(intensity_exp(p.A, p.k, quotes.delta_bid), p.dt, rng_bid)
+                fill_ask = quote_ask and event_happens(intensity_exp(p.A, p.k, quotes.delta_ask), p.dt, rng_ask)
+            else:
+                x_bid = hawkes_bid.step()
+                x_ask = hawkes_ask.step()
+                fill_bid = quote_bid and event_happens(
+                    intensity_exp(p.A, p.k, quotes.delta_bid) * (1.0 + x_bid / (p.A * p.dt)), p.dt, rng_bid
+                )
+                fill_ask = quote_ask and event_happens(
+                    intensity_exp(p.A, p.k, quotes.delta_ask) * (1.0 + x_ask / (p.A * p.dt)), p.dt, rng_ask
+                )
+                hawkes_bid.excite(fill_bid)
+                hawkes_ask.excite(fill_ask)
+
+            if fill_bid:
+                qm.on_fill(BID)
+                q_lots += 1
+                if ticked:
+                    cash -= bid_t
+                    fees += fee * quotes.bid * size
+                else:
+                    cash -= quotes.bid * size
+                    cash -= fee * quotes.bid * size
+
+            if fill_ask:
+                qm.on_fill(ASK)
+                q_lots -= 1
+                if ticked:
+                    cash += ask_t
+                    fees += fee * quotes.ask * size
+                else:
+                    cash += quotes.ask * size
+                    cash -= fee * quotes.ask * size
+
+            if adv is not None and (fill_bid or fill_ask):
+                adv.on_fill(int(fill_bid) - int(fill_ask))
+            if markouts is not None:
+                markouts.update(
+                    m,
+                    (int(fill_bid) - int(fill_ask)) * size,
+                    ((quotes.bid if fill_bid else 0.0) - (quotes.ask if fill_ask else 0.0)) * size,
+                    int(fill_bid) + int(fill_ask),
                 )
-            elif p.policy == "probing" and p.probing_p > 0.0 and p.probing_jitter > 0.0:
-                qcfg = ProbingConfig(p_explore=p.probing_p, jitter=p.probing_jitter, widen_only=p.probing_widen_only)
-                quotes = compute_probing_quotes(m, q, p.base_spread, p.phi, qcfg, rng)
+
+            inv_lots[i] = q_lots
+            cash_arr[i] = cash
+            fill_bid_arr[i] = fill_bid
+            fill_ask_arr[i] = fill_ask
+            bid_on[i] = quote_bid
+            ask_on[i] = quote_ask
+            if ticked:
+                bid_px[i] = bid_t if quote_bid else 0
+                ask_px[i] = ask_t if quote_ask else 0
+                fee_arr[i] = fees
             else:
-                quotes = compute_quotes(m, q, p.base_spread, p.phi)
+                bid_px[i] = quotes.bid if quote_bid else np.nan
+                ask_px[i] = quotes.ask if quote_ask else np.nan
+
+            if monitor is not None:
+                cash_f = cash * p.tick_size * size - fees if ticked else cash
+                if monitor.update(t * p.dt, cash_f + q_lots * size * m, q_lots * size):
+                    n_out = i + 1
+                    self.stopped = True
+                    break
+
+        self.t = t0 + n_out
+        self.mid = m
+        self.q_lots, self.cash, self.fees = q_lots, cash, fees
 
+        # --- convert lattices to floats only at output
+        sl = slice(0, n_out)
+        inventory = inv_lots[sl] * size
+        if ticked:
+            cash_f = cash_arr[sl] * (p.tick_size * size) - fee_arr[sl]
+            bid_f = bid_px[sl] * p.tick_size
+            ask_f = ask_px[sl] * p.tick_size
+            bid_f = np.where(bid_on[sl], bid_f, np.nan)
+            ask_f = np.where(ask_on[sl], ask_f, np.nan)
         else:
-                quotes = compute_quotes(m, q, p.base_spread, p.phi)
-        lam_bid = intensity_exp(p.A, p.k, quotes.delta_bid)
-        lam_ask = intensity_exp(p.A, p.k, quotes.delta_ask)
-
-        fill_bid = event_happens(lam_bid, p.dt, rng)
-        fill_ask = event_happens(lam_ask, p.dt, rng)
-
-        if fill_bid:
-            q += p.order_size
-            cash -= quotes.bid * p.order_size
-            cash -= fee * quotes.bid * p.order_size
-
-        if fill_ask:
-            q -= p.order_size
-            cash += quotes.ask * p.order_size
-            cash -= fee * quotes.ask * p.order_size
-
-        equity = cash + q * m
-        rows.append((t * p.dt, m, q, cash, equity, quotes.bid, quotes.ask, fill_bid, fill_ask))
-
-    return pd.DataFrame(
-        rows,
-        columns=["time_s", "mid", "inventory", "cash", "equity", "bid", "ask", "fill_bid", "fill_ask"],
-    )
+            cash_f, bid_f, ask_f = cash_arr[sl], bid_px[sl], ask_px[sl]
+
+        return {
+            "time_s": np.arange(t0, t0 + n_out) * p.dt,
+            "mid": mid[sl],
+            "inventory": inventory,
+            "cash": cash_f,
+            "equity": cash_f + inventory * mid[sl],
+            "bid": bid_f,
+            "ask": ask_f,
+            "fill_bid": fill_bid_arr[sl],
+            "fill_ask": fill_ask_arr[sl],
+            "messages": msgs[sl],
+        }
+
+    def save(self, path: str | Path) -> None:
+        """Pickle the full state to `path` (written to a temp file, then renamed)."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            pickle.dump(self, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> ToySimulation:
+        with open(path, "rb") as fh:
+            sim = pickle.load(fh)
+        if not isinstance(sim, cls):
+            raise ValueError(f"{path} does not hold a {cls.__name__}")
+        return sim
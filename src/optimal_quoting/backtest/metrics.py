@@ -6,6 +6,8 @@ from typing import Any, Dict
 import numpy as np
 import pandas as pd
 
+from optimal_quoting.metrics.performance import performance_summary_batch
+
 
 @dataclass(frozen=True)
 class BacktestSummary:
@@ -25,34 +27,26 @@ def summarize_backtest(df: pd.DataFrame) -> Dict[str, float]:
       - inventory
     """
     if "equity" in df.columns:
-        pnl_series = df["equity"].astype(float)
+        pnl_series = df["equity"].to_numpy(dtype=float)
     elif "pnl" in df.columns:
-        pnl_series = df["pnl"].astype(float)
+        pnl_series = df["pnl"].to_numpy(dtype=float)
     else:
         # last resort: zeros
-        pnl_series = pd.Series(np.zeros(len(df), dtype=float))
+        pnl_series = np.zeros(len(df), dtype=float)
 
     if "inventory" in df.columns:
-        inv = df["inventory"].astype(float)
+        inv = df["inventory"].to_numpy(dtype=float)
     elif "inv" in df.columns:
-        inv = df["inv"].astype(float)
+        inv = df["inv"].to_numpy(dtype=float)
     else:
-        inv = pd.Series(np.zeros(len(df), dtype=float))
-
-    pnl_final = float(pnl_series.iloc[-1]) if len(pnl_series) else 0.0
-    pnl_incr = pnl_series.diff().dropna()
-    pnl_mean = float(pnl_incr.mean()) if len(pnl_incr) else 0.0
-    pnl_std = float(pnl_incr.std(ddof=0)) if len(pnl_incr) else 0.0
-
-    inv_mean = float(inv.mean()) if len(inv) else 0.0
-    inv_std = float(inv.std(ddof=0)) if len(inv) else 0.0
-    inv_max_abs = float(np.max(np.abs(inv.values))) if len(inv) else 0.0
-
-    return {
-        "pnl_final": pnl_final,
-        "pnl_mean": pnl_mean,
-        "pnl_std": pnl_std,
-        "inv_mean": inv_mean,
-        "inv_std": inv_std,
-        "inv_max_abs": inv_max_abs,
-    }
+        inv = np.zeros(len(df), dtype=float)
+
+    keys = ("pnl_final", "pnl_mean", "pnl_std", "inv_mean", "inv_std", "inv_max_abs")
+    if len(df) < 2:
+        out = dict.fromkeys(keys, 0.0)
+        if len(df):
+            out.update(pnl_final=float(pnl_series[-1]), inv_mean=float(inv[0]), inv_max_abs=float(abs(inv[0])))
+        return out
+
+    stats = performance_summary_batch(pnl_series, inv)
+    return {key: float(stats[key][0]) for key in keys}
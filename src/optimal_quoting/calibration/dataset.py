@@ -4,19 +4,16 @@ import numpy as np
 import pandas as pd
 
 
-def build_intensity_dataset_from_mm(df: pd.DataFrame, dt: float) -> tuple[np.ndarray, np.ndarray]:
+def build_intensity_panel_from_mm(df: pd.DataFrame, dt: float) -> tuple[np.ndarray, np.ndarray]:
     """
-    Build (delta, n) arrays from the toy market-making dataframe.
-
-    We use both sides:
-      delta_bid = mid - bid
-      delta_ask = ask - mid
-      n_bid = 1(fill_bid), n_ask = 1(fill_ask)
+    Time-indexed version of `build_intensity_dataset_from_mm`.
 
     Returns
     -------
-    delta : array (2T,)
-    n : array (2T,)
+    delta : array (T, 2)
+        columns are (delta_bid, delta_ask); NaN where the side was not quoted
+    n : array (T, 2)
+        columns are (n_bid, n_ask)
     """
     if dt <= 0:
         raise ValueError("dt must be > 0")
@@ -35,7 +32,30 @@ def build_intensity_dataset_from_mm(df: pd.DataFrame, dt: float) -> tuple[np.nda
     n_bid = df["fill_bid"].astype(int).to_numpy(dtype=float)
     n_ask = df["fill_ask"].astype(int).to_numpy(dtype=float)
 
-    delta = np.concatenate([delta_bid, delta_ask])
-    n = np.concatenate([n_bid, n_ask])
+    return np.column_stack([delta_bid, delta_ask]), np.column_stack([n_bid, n_ask])
+
+
+def build_intensity_dataset_from_mm(df: pd.DataFrame, dt: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Build (delta, n) arrays from the toy market-making dataframe.
+
+    We use both sides:
+      delta_bid = mid - bid
+      delta_ask = ask - mid
+      n_bid = 1(fill_bid), n_ask = 1(fill_ask)
+
+    Sides that were not quoted (inventory limit) are dropped.
+
+    Returns
+    -------
+    delta : array (<= 2T,)
+    n : array (<= 2T,)
+    """
+    delta, n = build_intensity_panel_from_mm(df, dt)
+
+    # side-major layout: all bid samples, then all ask samples
+    delta, n = delta.T.ravel(), n.T.ravel()
 
-    return delta, n
+    # steps where a side was not quoted carry no exposure
+    quoted = np.isfinite(delta)
+    return delta[quoted], n[quoted]
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+
+import numpy as np
+
+from optimal_quoting.sim.hawkes import HawkesParams
+
+
+@dataclass(frozen=True)
+class HawkesFit:
+    mu: float
+    alpha: float
+    beta: float
+    nll: float          # negative log-likelihood at the optimum
+    n_events: int
+    converged: bool
+
+    @property
+    def params(self) -> HawkesParams:
+        return HawkesParams(mu=self.mu, alpha=self.alpha, beta=self.beta)
+
+
+def _as_times(times: np.ndarray, T: float) -> np.ndarray:
+    t = np.asarray(times, dtype=float)
+    if t.ndim != 1:
+        raise ValueError("times must be 1D")
+    if T <= 0:
+        raise ValueError("T must be > 0")
+    if t.size and (t[0] < 0 or t[-1] > T or np.any(np.diff(t) < 0)):
+        raise ValueError("times must be sorted and within [0, T]")
+    return t
+
+
+def excitation_sums(times: np.ndarray, beta: float, chunk: int = 4096) -> np.ndarray:
+    """
+    R_i = sum_{j < i} exp(-beta (t_i - t_j)), via the recursion
+
+        R_0 = 0,   R_i = exp(-beta (t_i - t_{i-1})) * (1 + R_{i-1}),
+
+    which is O(N) instead of the O(N^2) double sum. The recursion is unrolled
+    in vectorized chunks of `chunk` events: with z_i = beta (t_i - a) for the
+    chunk anchor a and the carry c from earlier chunks,
+
+        R_i = exp( logsumexp(log c, z_start, ..., z_{i-1}) - z_i ),
+
+    where the running log-sum-exp is a single `np.logaddexp.accumulate` (no
+    overflow whatever beta * span); the carry links consecutive chunks.
+    """
+    t = np.asarray(times, dtype=float)
+    n = t.size
+    R = np.zeros(n, dtype=float)
+    if n < 2:
+        return R
+    if chunk < 1:
+        raise ValueError("chunk must be >= 1")
+
+    carry = 0.0          # sum_{j < start} exp(-beta (t_start - t_j))
+    with np.errstate(divide="ignore"):
+        for start in range(0, n, chunk):
+            stop = min(n, start + chunk)
+            z = beta * (t[start:stop] - t[start])
+            seq = np.concatenate(([math.log(carry) if carry > 0 else -np.inf], z[:-1]))
+            R[start:stop] = np.exp(np.logaddexp.accumulate(seq) - z)
+            if stop < n:
+                carry = (R[stop - 1] + 1.0) * math.exp(-beta * (t[stop] - t[stop - 1]))
+    return R
+
+
+def hawkes_loglik(times: np.ndarray, T: float, p: HawkesParams) -> float:
+    """
+    Exact log-likelihood of event times on [0, T], computed in O(N):
+
+        ll = sum_i log(mu + alpha R_i) - mu T - (alpha / beta) sum_i (1 - exp(-beta (T - t_i)))
+    """
+    t = _as_times(times, T)
+    R = excitation_sums(t, p.beta)
+    K = float(np.sum(-np.expm1(-p.beta * (T - t)))) / p.beta
+    return float(np.sum(np.log(p.mu + p.alpha * R)) - p.mu * T - p.alpha * K)
+
+
+def hawkes_residuals(times: np.ndarray, T: float, p: HawkesParams) -> np.ndarray:
+    """
+    Time-rescaling residuals: compensator increments between events, i.i.d.
+    Exp(1) under a correctly specified model (goodness-of-fit check). O(N).
+    """
+    t = _as_times(times, T)
+    if t.size == 0:
+        return t
+    R = excitation_sums(t, p.beta)
+    dt = np.diff(t, prepend=0.0)
+    prev = np.concatenate(([-1.0], R[:-1]))      # no excitation before the first event
+    return p.mu * dt + (p.alpha / p.beta) * (1.0 + prev - R)
+
+
+def _fit_mu_alpha(
+    R: np.ndarray, K: float, T: float, mu: float, alpha: float, max_iter: int, tol: float
+) -> tuple[float, float, float, bool]:
+    """
+    Maximize the (concave) log-likelihood in (mu, alpha) for fixed beta.
+
+    Newton steps with backtracking; when a Newton step cannot improve while
+    staying feasible (mu > 0, alpha >= 0, e.g. alpha near 0), fall back to an
+    EM step, which is always feasible and never decreases the likelihood.
+    """
+    n = R.size
+
+    def ll(m: float, a: float) -> float:
+        return float(np.sum(np.log(m + a * R))) - m * T - a * K
+
+    cur = ll(mu, alpha)
+    for _ in range(max_iter):
+        lam = mu + alpha * R
+        g = np.array([np.sum(1.0 / lam) - T, np.sum(R / lam) - K])
+        w = 1.0 / lam**2
+        H = -np.array([[np.sum(w), np.sum(R * w)], [np.sum(R * w), np.sum(R * R * w)]])
+
+        new = None
+        try:
+            d = -np.linalg.solve(H, g)
+        except np.linalg.LinAlgError:
+            d = None
+        if d is not None and np.all(np.isfinite(d)):
+            s = 1.0
+            for _ in range(30):
+                m, a = mu + s * d[0], alpha + s * d[1]
+                if m > 0 and a >= 0:
+                    val = ll(m, a)
+                    if val >= cur:
+                        new = (m, a, val)
+                        break
+                s *= 0.5
+        if new is None:
+            # EM step: expected background / triggered event counts
+            p_bg = mu / lam
+            m, a = float(np.sum(p_bg)) / T, float(n - np.sum(p_bg)) / K if K > 0 else 0.0
+            new = (m, a, ll(m, a))
+
+        m, a, val = new
+        done = abs(val - cur) <= tol * (1.0 + abs(cur))
+        mu, alpha, cur = m, a, val
+        if done:
+            return mu, alpha, cur, True
+    return mu, alpha, cur, False
+
+
+def fit_hawkes_mle(
+    times: np.ndarray,
+    T: float,
+    beta_bounds: tuple[float, float] | None = None,
+    grid_size: int = 24,
+    refine_iter: int = 30,
+    max_iter: int = 100,
+    tol: float = 1e-10,
+) -> HawkesFit:
+    """
+    MLE of (mu, alpha, beta) from event times on [0, T].
+
+    For fixed beta the likelihood is concave in (mu, alpha) and is maximized
+    by Newton/EM (each evaluation O(N) with the recursive R_i). beta is then
+    profiled: a log-spaced grid brackets the best beta and a golden-section
+    search refines it on log(beta).
+
+    Default beta bounds: [0.01, 1000] x the mean event rate N / T.
+    """
+    t = _as_times(times, T)
+    n = t.size
+    if n < 3:
+        raise ValueError("need at least 3 events")
+    if grid_size < 3:
+        raise ValueError("grid_size must be >= 3")
+
+    rate = n / T
+    lo, hi = beta_bounds if beta_bounds is not None else (0.01 * rate, 1000.0 * rate)
+    if not (0 < lo < hi):
+        raise ValueError("beta_bounds must satisfy 0 < lo < hi")
+
+    cache: dict[float, tuple[float, float, float, bool]] = {}
+
+    def profile(log_beta: float) -> float:
+        if log_beta not in cache:
+            beta = math.exp(log_beta)
+            R = excitation_sums(t, beta)
+            K = float(np.sum(-np.expm1(-beta * (T - t)))) / beta
+            cache[log_beta] = _fit_mu_alpha(R, K, T, 0.5 * rate, 0.25 * beta, max_iter, tol)
+        return cache[log_beta][2]
+
+    grid = np.linspace(math.log(lo), math.log(hi), grid_size)
+    vals = [profile(float(x)) for x in grid]
+    i = int(np.argmax(vals))
+    a, b = float(grid[max(i - 1, 0)]), float(grid[min(i + 1, grid_size - 1)])
+
+    # golden-section on log(beta) inside the bracketing grid cells
+    g = (math.sqrt(5.0) - 1.0) / 2.0
+    c, d = b - g * (b - a), a + g * (b - a)
+    for _ in range(refine_iter):
+        if profile(c) >= profile(d):
+            b, d = d, c
+            c = b - g * (b - a)
+        else:
+            a, c = c, d
+            d = a + g * (b - a)
+    best = max(cache, key=lambda x: cache[x][2])
+    mu, alpha, ll, converged = cache[best]
+    return HawkesFit(
+        mu=float(mu), alpha=float(alpha), beta=math.exp(best), nll=-float(ll), n_events=n, converged=converged
+    )
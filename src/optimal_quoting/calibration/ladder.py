@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+
+import numpy as np
+
+from optimal_quoting.calibration.mle import IntensityFit, fit_intensity_mle
+from optimal_quoting.calibration.taq import asof_join
+from optimal_quoting.data.schema import TopOfBookArray, TradeArray
+from optimal_quoting.model.intensity import IntensityFamily, get_intensity_family
+
+# number of set bits of every byte value
+_POPCOUNT = np.array([i.bit_count() for i in range(256)], dtype=np.uint8)
+
+
+@dataclass(frozen=True)
+class LadderMatrix:
+    """
+    Per-step exposure / fill indicators of a quote ladder, bit-packed along
+    steps (np.packbits(axis=0)): column c is a hypothetical quote at
+    distance delta[c] from the mid, row s the time step [s dt, (s+1) dt).
+
+      exposure[s, c] = 1 if the level was quoted during step s
+      fills[s, c]    = 1 if it would have been filled (only where exposed)
+
+    Storage is 2 bits per (step, level); `totals` reduces by chunks of rows
+    without unpacking the whole matrix.
+    """
+
+    delta: np.ndarray       # (K,)
+    exposure: np.ndarray    # (ceil(n_steps / 8), K) uint8
+    fills: np.ndarray       # (ceil(n_steps / 8), K) uint8
+    n_steps: int
+    dt: float
+
+    @property
+    def nbytes(self) -> int:
+        return self.exposure.nbytes + self.fills.nbytes
+
+    def unpack(self, start: int = 0, stop: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Dense (stop - start, K) bool blocks of exposure and fills (start must be a multiple of 8)."""
+        stop = self.n_steps if stop is None else min(stop, self.n_steps)
+        if start % 8:
+            raise ValueError("start must be a multiple of 8")
+        rows = slice(start // 8, -(-stop // 8))
+        n = stop - start
+        e = np.unpackbits(self.exposure[rows], axis=0, count=n).astype(bool)
+        f = np.unpackbits(self.fills[rows], axis=0, count=n).astype(bool)
+        return e, f
+
+    def totals(self, chunk_rows: int = 1 << 16) -> tuple[np.ndarray, np.ndarray]:
+        """(fills, exposed steps) per level, by popcount over chunks of packed rows."""
+        K = len(self.delta)
+        n = np.zeros(K, dtype=np.int64)
+        w = np.zeros(K, dtype=np.int64)
+        for r0 in range(0, self.exposure.shape[0], chunk_rows):
+            n += _POPCOUNT[self.fills[r0 : r0 + chunk_rows]].sum(axis=0, dtype=np.int64)
+            w += _POPCOUNT[self.exposure[r0 : r0 + chunk_rows]].sum(axis=0, dtype=np.int64)
+        return n, w
+
+    def samples(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(delta, n, w) sufficient statistics (w in steps of length dt)."""
+        n, w = self.totals()
+        return self.delta, n.astype(float), w.astype(float)
+
+
+def _check_deltas(deltas: np.ndarray) -> np.ndarray:
+    delta = np.asarray(deltas, dtype=float)
+    if delta.ndim != 1 or len(delta) == 0:
+        raise ValueError("deltas must be a non-empty 1D array")
+    if (delta < 0).any():
+        raise ValueError("deltas must be >= 0")
+    return delta
+
+
+def _pack_steps(
+    n_steps: int, K: int, chunk: int, block_fn
+) -> tuple[np.ndarray, np.ndarray]:
+    """Pack (exposure, fills) blocks of `chunk` steps produced by block_fn(s0, s1)."""
+    if chunk < 8 or chunk % 8:
+        raise ValueError("chunk must be a positive multiple of 8")
+    rows = -(-n_steps // 8)
+    exposure = np.empty((rows, K), dtype=np.uint8)
+    fills = np.empty((rows, K), dtype=np.uint8)
+    for s0 in range(0, n_steps, chunk):
+        s1 = min(n_steps, s0 + chunk)
+        e, f = block_fn(s0, s1)
+        exposure[s0 // 8 : -(-s1 // 8)] = np.packbits(e, axis=0)
+        fills[s0 // 8 : -(-s1 // 8)] = np.packbits(f & e, axis=0)
+    return exposure, fills
+
+
+def simulate_ladder(
+    A: float,
+    k: float,
+    deltas: np.ndarray,
+    dt: float,
+    n_steps: int,
+    rng: np.random.Generator,
+    family: str | IntensityFamily = "exp",
+    chunk: int = 1 << 14,
+) -> LadderMatrix:
+    """
+    Synthetic ladder under λ(δ) = A g(δ; k), every level always exposed.
+
+    Levels are coupled through one uniform per step (the depth the flow
+    reached): level c fills iff u_s < 1 - exp(-λ(δ_c) dt), so a fill at δ
+    implies fills at every smaller δ, as with real trade-throughs.
+    """
+    fam = get_intensity_family(family) if isinstance(family, str) else family
+    delta = _check_deltas(deltas)
+    if dt <= 0 or n_steps < 1:
+        raise ValueError("dt must be > 0 and n_steps >= 1")
+    p_fill = -np.expm1(-fam.intensity(np.array([A, k]), delta) * dt)
+
+    def block(s0: int, s1: int) -> tuple[np.ndarray, np.ndarray]:
+        u = rng.random((s1 - s0, 1))
+        return np.ones((s1 - s0, len(delta)), dtype=bool), u < p_fill
+
+    exposure, fills = _pack_steps(n_steps, len(delta), chunk, block)
+    return LadderMatrix(delta=delta, exposure=exposure, fills=fills, n_steps=n_steps, dt=dt)
+
+
+def ladder_from_taq(
+    quotes: TopOfBookArray,
+    trades: TradeArray,
+    deltas: np.ndarray,
+    dt: float,
+    max_staleness: float | None = None,
+    chunk: int = 1 << 14,
+) -> LadderMatrix:
+    """
+    Ladder matrix from market data, on steps of `dt` seconds from the first
+    quote update. Columns are the bid levels, then the ask levels, at the
+    distances `deltas`.
+
+    A step is exposed if the book prevailing at its start is valid (ask > bid,
+    not stale); a level fills in a step if a trade of that step, as-of joined
+    on the prevailing mid (calibration/taq.py), reached it. Only the deepest
+    level reached per (step, side) is kept, O(N) over trades. Exposure and
+    fills are built `chunk` steps at a time, so no dense per-step array of
+    the whole span is held besides the packed result.
+    """
+    delta = _check_deltas(deltas)
+    if dt <= 0:
+        raise ValueError("dt must be > 0")
+    K = len(delta)
+    q_ns = quotes.ts.view(np.int64)
+    step_ns = dt * 1e9
+    n_steps = int((q_ns[-1] - q_ns[0]) // step_ns)
+    if n_steps < 1:
+        raise ValueError("quotes span less than one step")
+
+    # per trade: step, side column (0 bid, 1 ask) and number of levels reached;
+    # trades are sorted, so the trades of steps [s0, s1) are one slice
+    join = asof_join(quotes, trades, max_staleness)
+    step = ((join.t_ns - q_ns[0]) // step_ns).astype(np.int64)
+    sells = join.side < 0
+    col = (~sells).astype(np.int64)
+    x = np.where(sells, join.mid - join.price, join.price - join.mid)
+    lvl = np.searchsorted(delta, x, side="right")
+
+    levels = np.arange(K)
+
+    def block(s0: int, s1: int) -> tuple[np.ndarray, np.ndarray]:
+        # exposure: book as of each step start
+        starts = q_ns[0] + (np.arange(s0, s1) * step_ns).astype(np.int64)
+        j = np.searchsorted(q_ns, starts, side="right") - 1
+        bid, ask = quotes.bid[j], quotes.ask[j]
+        exposed = np.isfinite(bid) & np.isfinite(ask) & (ask > bid)
+        if max_staleness is not None:
+            exposed &= (starts - q_ns[j]) * 1e-9 <= max_staleness
+
+        # deepest level reached per (step, side)
+        a, b = np.searchsorted(step, [s0, s1])
+        reached = np.zeros((s1 - s0, 2), dtype=np.int32)
+        np.maximum.at(reached, (step[a:b] - s0, col[a:b]), lvl[a:b])
+
+        e = np.repeat(exposed[:, None], 2 * K, axis=1)
+        f = np.concatenate([levels < reached[:, 0:1], levels < reached[:, 1:2]], axis=1)
+        return e, f
+
+    exposure, fills = _pack_steps(n_steps, 2 * K, chunk, block)
+    return LadderMatrix(
+        delta=np.concatenate([delta, delta]), exposure=exposure, fills=fills, n_steps=n_steps, dt=dt
+    )
+
+
+def fit_ladder_mle(
+    lm: LadderMatrix,
+    family: str | IntensityFamily = "exp",
+    k_bounds: tuple[float, float] = (0.0, 20.0),
+    max_iter: int = 100,
+    tol: float = 1e-10,
+) -> IntensityFit:
+    """
+    Joint MLE of (A, k) over all ladder levels from the per-step indicators.
+
+    Each exposed step of level c is a Bernoulli draw with
+        p_c = 1 - exp(-μ_c),   μ_c = λ(δ_c) dt = exp(a + log g(δ_c; k) + log dt),  a = log A,
+    so with n_c fills out of w_c exposed steps
+        ℓ(a, k) = Σ_c [ n_c log p_c - (w_c - n_c) μ_c ]
+    (a complementary log-log model). Unlike the Poisson approximation of
+    fit_intensity_mle it stays unbiased when λ dt is not small. Newton with
+    step halving on (a, k), started from the Poisson fit on the same
+    sufficient statistics.
+    """
+    fam = get_intensity_family(family) if isinstance(family, str) else family
+    delta, n, w = lm.samples()
+    if n.sum() == 0:
+        raise ValueError("no fills in the ladder")
+
+    start = fit_intensity_mle(delta, n, lm.dt, family=fam, w=w, k_bounds=k_bounds)
+    k_min, k_max = k_bounds
+    log_dt = math.log(lm.dt)
+
+    def terms(a: float, k: float, order: int):
+        hs = fam.log_shape(delta, np.array(k), order=order)
+        mu = np.exp(a + hs[0] + log_dt)
+        p = -np.expm1(-mu)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ll = float(np.sum(np.where(n > 0, n * np.log(p), 0.0)) - np.sum((w - n) * mu))
+        return ll, mu, p, hs
+
+    theta = np.array([math.log(start.A), start.k])
+    ll, mu, p, hs = terms(theta[0], theta[1], 2)
+    converged = False
+    it = 0
+    for it in range(1, max_iter + 1):
+        _, h1, h2 = hs
+        s = mu * (n / p - w)                                  # dℓ/dη
+        s2 = s - n * mu * mu * (1.0 - p) / (p * p)            # d²ℓ/dη²
+        g = np.array([s.sum(), s @ h1])
+        H = np.array([[s2.sum(), s2 @ h1], [s2 @ h1, s2 @ (h1 * h1) + s @ h2]])
+        if H[0, 0] < 0 and np.linalg.det(H) > 0:
+            step = -np.linalg.solve(H, g)
+        else:
+            step = g / (np.abs(np.diag(H)) + 1e-12)   # not concave here: scaled gradient step
+
+        t = 1.0
+        improved = False
+        while t > 1e-12:
+            cand = theta + t * step
+            cand[1] = min(max(cand[1], k_min), k_max)
+            ll_new, mu_n, p_n, hs_n = terms(cand[0], cand[1], 2)
+            if ll_new >= ll - 1e-12:
+                improved = True
+                break
+            t *= 0.5
+        if not improved:
+            break                  # line search failed: keep theta, not converged
+        moved = float(np.max(np.abs(cand - theta)))
+        theta, ll, mu, p, hs = cand, ll_new, mu_n, p_n, hs_n
+        if moved < tol:
+            converged = True
+            break
+
+    return IntensityFit(
+        family=fam.name,
+        A=float(math.exp(theta[0])),
+        k=float(theta[1]),
+        nll=-ll,
+        n_iter=it,
+        converged=converged,
+    )
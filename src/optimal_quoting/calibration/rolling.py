@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from optimal_quoting.model.intensity import IntensityFamily, get_intensity_family
+
+
+@dataclass(frozen=True)
+class IntensityPrefixStats:
+    """
+    Prefix sums of binned sufficient statistics for the Poisson intensity likelihood.
+
+    Time is cut into blocks of `block` steps. For bin b and block boundary j:
+        exposure[j, b] = #samples in bin b over steps [0, j * block)
+        counts[j, b]   = #events  in bin b over steps [0, j * block)
+
+    Statistics of any block-aligned segment [j0, j1) are then
+    exposure[j1] - exposure[j0] (same for counts), i.e. O(nbins) per segment
+    whatever its length.
+    """
+
+    centers: np.ndarray    # (nbins,) mean delta of the samples in each bin
+    exposure: np.ndarray   # (nblocks + 1, nbins)
+    counts: np.ndarray     # (nblocks + 1, nbins)
+    block: int
+    dt: float
+
+    @property
+    def n_blocks(self) -> int:
+        return self.exposure.shape[0] - 1
+
+
+@dataclass(frozen=True)
+class RollingIntensityFit:
+    start: np.ndarray   # window start (time step index, inclusive)
+    end: np.ndarray     # window end (time step index, exclusive)
+    A: np.ndarray
+    k: np.ndarray
+    nll: np.ndarray     # negative log-likelihood per window (binned Poisson approx)
+
+
+@dataclass(frozen=True)
+class ChangePointScan:
+    split: np.ndarray   # candidate split (time step index)
+    lr: np.ndarray      # 2 * (l_left + l_right - l_full) for each split
+    best_split: int
+    best_lr: float
+
+
+def intensity_prefix_stats(
+    delta: np.ndarray,
+    n: np.ndarray,
+    dt: float,
+    block: int = 1,
+    nbins: int = 40,
+    dmax_quantile: float = 0.995,
+) -> IntensityPrefixStats:
+    """
+    Bin (delta, n) samples and accumulate prefix sums over time blocks.
+
+    Parameters
+    ----------
+    delta, n : array, shape (T,) or (T, m)
+        time runs along axis 0; extra columns (e.g. bid/ask sides, see
+        `build_intensity_panel_from_mm`) are pooled within each time step.
+        NaN deltas (side not quoted) carry no exposure.
+    dt : float
+        time step
+    block : int
+        number of steps per block (window starts/ends are multiples of it)
+    nbins, dmax_quantile :
+        binning of the delta axis (same convention as `empirical_intensity_binned`)
+    """
+    delta = np.asarray(delta, dtype=float)
+    n = np.asarray(n, dtype=float)
+    if delta.shape != n.shape or delta.ndim not in (1, 2):
+        raise ValueError("delta and n must be 1D or 2D arrays with the same shape")
+    if dt <= 0:
+        raise ValueError("dt must be > 0")
+    if block < 1:
+        raise ValueError("block must be >= 1")
+    if nbins < 1:
+        raise ValueError("nbins must be >= 1")
+    if (delta < 0).any():
+        raise ValueError("delta must be >= 0")
+    if (n < 0).any():
+        raise ValueError("n must be >= 0")
+
+    if delta.ndim == 1:
+        delta = delta[:, None]
+        n = n[:, None]
+
+    T = delta.shape[0]
+    n_blocks = T // block
+    if n_blocks == 0:
+        raise ValueError("Need at least one full block of samples")
+    # drop the trailing partial block
+    delta = delta[: n_blocks * block]
+    n = n[: n_blocks * block]
+
+    quoted = np.isfinite(delta)
+    if not quoted.any():
+        raise ValueError("No quoted samples")
+    delta = np.where(quoted, delta, 0.0)
+    wq = quoted.astype(float)
+
+    dmax = max(float(np.quantile(delta[quoted], dmax_quantile)), 1e-12)
+    edges = np.linspace(0.0, dmax, nbins + 1)
+    bins = np.clip(np.digitize(delta, edges) - 1, 0, nbins - 1)
+
+    blk = np.broadcast_to((np.arange(delta.shape[0]) // block)[:, None], delta.shape)
+    flat = (blk * nbins + bins).ravel()
+    size = n_blocks * nbins
+    exposure = np.bincount(flat, weights=wq.ravel(), minlength=size).reshape(n_blocks, nbins)
+    counts = np.bincount(flat, weights=(n * wq).ravel(), minlength=size).reshape(n_blocks, nbins)
+
+    # representative delta per bin: sample mean (midpoint for empty bins)
+    tot = exposure.sum(axis=0)
+    dsum = np.bincount(bins.ravel(), weights=(delta * wq).ravel(), minlength=nbins)
+    mids = 0.5 * (edges[:-1] + edges[1:])
+    centers = np.where(tot > 0, dsum / np.maximum(tot, 1.0), mids)
+
+    zero = np.zeros((1, nbins))
+    return IntensityPrefixStats(
+        centers=centers,
+        exposure=np.concatenate([zero, np.cumsum(exposure, axis=0)]),
+        counts=np.concatenate([zero, np.cumsum(counts, axis=0)]),
+        block=int(block),
+        dt=float(dt),
+    )
+
+
+def _fit_segments(
+    E: np.ndarray,
+    N: np.ndarray,
+    centers: np.ndarray,
+    dt: float,
+    fam: IntensityFamily,
+    k_bounds: tuple[float, float],
+    grid_size: int,
+    newton_iter: int = 20,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Profile MLE of (A, k) for S segments at once from binned statistics.
+
+    E, N : (S, nbins) exposure counts and event counts per segment.
+    With Z(k) = Σ_b E_b g(c_b; k) and N = Σ_b N_b:
+        A_hat(k) = N / (dt Z(k))
+        l_p(k)   = N log A_hat(k) + Σ_b N_b log g(c_b; k) - N
+
+    A coarse k grid (one matrix product for all segments) is followed by a
+    vectorized safeguarded Newton step on l_p. Returns (A, k, loglik), each (S,).
+    """
+    k_min, k_max = k_bounds
+    if not (0 <= k_min < k_max):
+        raise ValueError("Invalid k_bounds")
+
+    n_tot = N.sum(axis=1)
+
+    def profile(kk: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # kk: (S,) -> A, l_p
+        (h0,) = fam.log_shape(centers, kk[:, None], order=0)
+        Z = np.einsum("sb,sb->s", E, np.exp(h0))
+        A = np.maximum(n_tot / np.maximum(dt * Z, 1e-300), 1e-12)
+        ll = n_tot * np.log(A) + np.einsum("sb,sb->s", N, h0) - A * dt * Z
+        return A, ll
+
+    # --- coarse grid, all segments in one shot
+    ks = np.linspace(k_min, k_max, grid_size)
+    (h0g,) = fam.log_shape(centers, ks[:, None], order=0)       # (G, nbins)
+    Zg = E @ np.exp(h0g).T                                       # (S, G)
+    Ag = np.maximum(n_tot[:, None] / np.maximum(dt * Zg, 1e-300), 1e-12)
+    llg = n_tot[:, None] * np.log(Ag) + N @ h0g.T - Ag * dt * Zg
+    i0 = np.argmax(llg, axis=1)
+
+    step = (k_max - k_min) / max(grid_size - 1, 1)
+    k = ks[i0]
+    lo = np.maximum(k_min, k - step)
+    hi = np.minimum(k_max, k + step)
+
+    # --- vectorized Newton on l_p(k) with bracket safeguard
+    for _ in range(newton_iter):
+        h0, h1, h2 = fam.log_shape(centers, k[:, None], order=2)
+        Eg = E * np.exp(h0)
+        Z = np.maximum(Eg.sum(axis=1), 1e-300)
+        Z1 = (Eg * h1).sum(axis=1) / Z
+        Z2 = (Eg * (h1 * h1 + h2)).sum(axis=1) / Z
+        d1 = -n_tot * Z1 + (N * h1).sum(axis=1)
+        d2 = -n_tot * (Z2 - Z1 * Z1) + (N * h2).sum(axis=1)
+
+        lo = np.where(d1 > 0, k, lo)
+        hi = np.where(d1 > 0, hi, k)
+        newton = k - d1 / np.where(d2 < 0, d2, -1.0)
+        k_new = np.where((d2 < 0) & (newton >= lo) & (newton <= hi), newton, 0.5 * (lo + hi))
+        done = np.abs(k_new - k) < 1e-10
+        k = k_new
+        if done.all():
+            break
+
+    A, ll = profile(k)
+    return A, k, ll
+
+
+def fit_intensity_rolling(
+    delta: np.ndarray,
+    n: np.ndarray,
+    dt: float,
+    window: int,
+    step: int,
+    family: str | IntensityFamily = "exp",
+    nbins: int = 40,
+    k_bounds: tuple[float, float] = (0.0, 20.0),
+    grid_size: int = 50,
+) -> RollingIntensityFit:
+    """
+    Fit (A, k) over sliding windows of `window` steps, advancing by `step` steps.
+
+    Sufficient statistics are binned once and prefix-summed over blocks of
+    `step` steps, so each window costs O(nbins) regardless of its length and
+    all windows are fitted together in vectorized form.
+
+    Parameters
+    ----------
+    delta, n : array, shape (T,) or (T, m)
+        time-indexed samples (see `build_intensity_panel_from_mm`)
+    window, step : int
+        window length and stride in time steps; window must be a multiple of step
+    """
+    if step < 1 or window < step:
+        raise ValueError("Need 1 <= step <= window")
+    if window % step != 0:
+        raise ValueError("window must be a multiple of step")
+
+    fam = get_intensity_family(family) if isinstance(family, str) else family
+    stats = intensity_prefix_stats(delta, n, dt, block=step, nbins=nbins)
+
+    wb = window // step
+    if wb > stats.n_blocks:
+        raise ValueError("window is longer than the data")
+
+    j0 = np.arange(stats.n_blocks - wb + 1)
+    E = stats.exposure[j0 + wb] - stats.exposure[j0]
+    N = stats.counts[j0 + wb] - stats.counts[j0]
+
+    A, k, ll = _fit_segments(E, N, stats.centers, dt, fam, k_bounds, grid_size)
+    start = j0 * step
+    return RollingIntensityFit(start=start, end=start + window, A=A, k=k, nll=-ll)
+
+
+def scan_change_point(
+    stats: IntensityPrefixStats,
+    start: int = 0,
+    end: int | None = None,
+    min_size: int = 1,
+    family: str | IntensityFamily = "exp",
+    k_bounds: tuple[float, float] = (0.0, 20.0),
+    grid_size: int = 50,
+) -> ChangePointScan:
+    """
+    Likelihood-ratio scan for a single change in (A, k) within blocks [start, end):
+        LR(τ) = 2 * ( l_hat[start, τ) + l_hat[τ, end) - l_hat[start, end) )
+
+    `start`, `end` and `min_size` are in blocks; returned splits are in time steps.
+    """
+    fam = get_intensity_family(family) if isinstance(family, str) else family
+    end = stats.n_blocks if end is None else int(end)
+    if min_size < 1:
+        raise ValueError("min_size must be >= 1")
+    if not (0 <= start < end <= stats.n_blocks):
+        raise ValueError("Invalid [start, end) block range")
+
+    taus = np.arange(start + min_size, end - min_size + 1)
+    if taus.size == 0:
+        raise ValueError("Segment too short for min_size")
+
+    P_E, P_N = stats.exposure, stats.counts
+    E = np.concatenate([P_E[taus] - P_E[start], P_E[end] - P_E[taus], (P_E[end] - P_E[start])[None]])
+    N = np.concatenate([P_N[taus] - P_N[start], P_N[end] - P_N[taus], (P_N[end] - P_N[start])[None]])
+
+    _, _, ll = _fit_segments(E, N, stats.centers, stats.dt, fam, k_bounds, grid_size)
+    m = taus.size
+    lr = 2.0 * (ll[:m] + ll[m : 2 * m] - ll[-1])
+    lr = np.maximum(lr, 0.0)
+
+    i = int(np.argmax(lr))
+    split = taus * stats.block
+    return ChangePointScan(split=split, lr=lr, best_split=int(split[i]), best_lr=float(lr[i]))
+
+
+def detect_change_points(
+    delta: np.ndarray,
+    n: np.ndarray,
+    dt: float,
+    block: int,
+    threshold: float = 25.0,
+    min_size: int = 5,
+    family: str | IntensityFamily = "exp",
+    nbins: int = 40,
+    k_bounds: tuple[float, float] = (0.0, 20.0),
+    grid_size: int = 50,
+) -> list[int]:
+    """
+    Binary segmentation with `scan_change_point`.
+
+    A segment is split at its best τ while LR(τ) > threshold and both sides
+    keep at least `min_size` blocks. Returns sorted change points in time steps.
+    """
+    stats = intensity_prefix_stats(delta, n, dt, block=block, nbins=nbins)
+
+    found: list[int] = []
+    stack = [(0, stats.n_blocks)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2 * min_size:
+            continue
+        scan = scan_change_point(
+            stats, start=a, end=b, min_size=min_size, family=family, k_bounds=k_bounds, grid_size=grid_size
+        )
+        if scan.best_lr <= threshold:
+            continue
+        tau = scan.best_split // stats.block
+        found.append(scan.best_split)
+        stack.append((a, tau))
+        stack.append((tau, b))
+
+    return sorted(found)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from optimal_quoting.data.schema import TopOfBookArray, TradeArray
+
+
+@dataclass(frozen=True)
+class LadderDataset:
+    """
+    Compressed intensity dataset for a hypothetical quote ladder.
+
+    For each ladder distance δ_j (from the mid):
+      n_bid[j]        : sell trades printed at or below mid - δ_j
+      n_ask[j]        : buy trades printed at or above mid + δ_j
+      exposure_bid[j] : seconds a bid at mid - δ_j would have rested
+      exposure_ask[j] : idem for the ask
+
+    This is the (δ, n, w) layout of compress_intensity_samples with the
+    exposure in seconds, i.e. fit with dt = 1:
+
+        delta, n, w = ds.samples()
+        fit = fit_intensity_mle(delta, n, dt=1.0, w=w)
+    """
+
+    delta: np.ndarray
+    n_bid: np.ndarray
+    n_ask: np.ndarray
+    exposure_bid: np.ndarray
+    exposure_ask: np.ndarray
+
+    def samples(self, side: str = "both") -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(delta, n, w) for one side ("bid" / "ask") or both pooled."""
+        if side == "bid":
+            return self.delta, self.n_bid, self.exposure_bid
+        if side == "ask":
+            return self.delta, self.n_ask, self.exposure_ask
+        if side == "both":
+            return self.delta, self.n_bid + self.n_ask, self.exposure_bid + self.exposure_ask
+        raise ValueError("side must be 'bid', 'ask' or 'both'")
+
+
+def _ensure_sorted(ts: np.ndarray, name: str) -> None:
+    if len(ts) > 1 and (np.diff(ts.view(np.int64)) < 0).any():
+        raise ValueError(f"{name} must be sorted by ts")
+
+
+@dataclass(frozen=True)
+class AsofJoin:
+    """Trades kept by the as-of join, with the mid prevailing before each."""
+
+    t_ns: np.ndarray     # trade time (ns since epoch)
+    mid: np.ndarray
+    price: np.ndarray
+    side: np.ndarray     # +1 buy / -1 sell
+
+
+def asof_join(quotes: TopOfBookArray, trades: TradeArray, max_staleness: float | None = None) -> AsofJoin:
+    """
+    Match every trade to the last quote update strictly before it
+    (np.searchsorted: O(N log Q)), so quote updates triggered by the trade
+    itself are not used. Trades matched to a crossed / locked book, printed
+    more than `max_staleness` seconds after that update, or after the last
+    update (whose end is unknown) are dropped. Both streams must be sorted.
+    """
+    _ensure_sorted(quotes.ts, "quotes")
+    _ensure_sorted(trades.ts, "trades")
+    q_ns = quotes.ts.view(np.int64)
+    t_ns = trades.ts.view(np.int64)
+    bid, ask = quotes.bid, quotes.ask
+    valid = np.isfinite(bid) & np.isfinite(ask) & (ask > bid)
+
+    j = np.searchsorted(q_ns, t_ns, side="left") - 1
+    keep = (j >= 0) & (j < len(quotes) - 1)
+    j = np.where(keep, j, 0)
+    keep &= valid[j]
+    if max_staleness is not None:
+        keep &= (t_ns - q_ns[j]) * 1e-9 <= max_staleness
+    j = j[keep]
+    return AsofJoin(
+        t_ns=t_ns[keep],
+        mid=0.5 * (bid[j] + ask[j]),
+        price=trades.price[keep],
+        side=trades.side[keep],
+    )
+
+
+def _levels_hit(x: np.ndarray, delta: np.ndarray) -> np.ndarray:
+    """
+    Trades that reached each level: a trade at distance x (beyond the mid,
+    on the side it hits) reaches every δ_j <= x. One searchsorted per trade
+    and a reverse cumulative sum, O(N log K + K).
+    """
+    K = len(delta)
+    reached = np.searchsorted(delta, x, side="right")       # levels reached per trade
+    hist = np.bincount(reached, minlength=K + 1)
+    return np.cumsum(hist[::-1])[::-1][1:].astype(float)
+
+
+def build_ladder_dataset(
+    quotes: TopOfBookArray,
+    trades: TradeArray,
+    deltas: np.ndarray,
+    max_staleness: float | None = None,
+) -> LadderDataset:
+    """
+    As-of join of trades on the prevailing top of book (see asof_join),
+    counted against a hypothetical ladder of quotes at distances `deltas`
+    from the mid. A sell trade at price p fills a hypothetical bid at
+    mid - δ iff p <= mid - δ (buys and asks symmetrically), so one trade can
+    fill several levels.
+
+    Exposure: each quote update with ask > bid holds until the next update,
+    at most `max_staleness` seconds (None: no cap). The trades dropped by the
+    join fall outside that exposure, so counts and exposure cover the same
+    time.
+    """
+    delta = np.unique(np.asarray(deltas, dtype=float))
+    if delta.ndim != 1 or len(delta) == 0:
+        raise ValueError("deltas must be a non-empty 1D array")
+    if (delta < 0).any():
+        raise ValueError("deltas must be >= 0")
+    if max_staleness is not None and max_staleness <= 0:
+        raise ValueError("max_staleness must be > 0")
+    if len(quotes) < 2:
+        raise ValueError("need at least two quote updates")
+
+    join = asof_join(quotes, trades, max_staleness)
+
+    bid, ask = quotes.bid, quotes.ask
+    valid = np.isfinite(bid) & np.isfinite(ask) & (ask > bid)
+    dur = np.diff(quotes.ts.view(np.int64)) * 1e-9
+    if max_staleness is not None:
+        dur = np.minimum(dur, max_staleness)
+    exposure = float(dur[valid[:-1]].sum())
+
+    sells = join.side < 0
+    n_bid = _levels_hit(join.mid[sells] - join.price[sells], delta)
+    n_ask = _levels_hit(join.price[~sells] - join.mid[~sells], delta)
+
+    expo = np.full(len(delta), exposure)
+    return LadderDataset(delta=delta, n_bid=n_bid, n_ask=n_ask, exposure_bid=expo, exposure_ask=expo.copy())
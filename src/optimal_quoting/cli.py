@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from optimal_quoting.backtest.engine import MMParams, run_mm_toy_arrays
+from optimal_quoting.config import (
+    SweepRun,
+    load_benchmark_config,
+    load_frontier_config,
+    load_optimize_config,
+    load_simulate_config,
+    load_stress_config,
+)
+from optimal_quoting.experiments.shared_results import SharedResults, run_cells_shared
+from optimal_quoting.metrics.performance import (
+    PERFORMANCE_METRICS,
+    messages_per_fill,
+    performance_summary_batch,
+)
+from optimal_quoting.metrics.variance_reduction import inventory_pnl_control
+
+REPORTS = Path("reports")
+FIGURES = REPORTS / "figures"
+
+
+# ---------------------------------------------------------------------
+# sweeps: resolved MMParams go to workers as pickled frozen dataclasses,
+# results come back through shared memory (experiments/shared_results.py)
+# ---------------------------------------------------------------------
+
+SWEEP_METRICS = ("n_rows", *PERFORMANCE_METRICS, "messages_per_fill", "inv_pnl_control")
+
+
+def _sweep_cell(p: MMParams) -> tuple[dict[str, float], np.ndarray, np.ndarray]:
+    out = run_mm_toy_arrays(p)
+    equity, inventory = out["equity"], out["inventory"]
+    perf = performance_summary_batch(equity[None, :], inventory[None, :])
+    metrics = {key: float(v[0]) for key, v in perf.items()}
+    metrics["n_rows"] = float(len(equity))
+    metrics["messages_per_fill"] = messages_per_fill(out["messages"], out["fill_bid"], out["fill_ask"])
+    metrics["inv_pnl_control"] = inventory_pnl_control(inventory, out["mid"])
+    return metrics, equity, inventory
+
+
+def run_sweep(runs: tuple[SweepRun, ...], workers: int = 1, keep_paths: bool = False) -> SharedResults:
+    """
+    Run every resolved run (cell id = position in `runs`) and collect the
+    SWEEP_METRICS (plus equity / inventory paths if keep_paths) in shared
+    memory. The caller closes the returned block.
+    """
+    n_steps = 0
+    if keep_paths:
+        lengths = {int(r.params.T / r.params.dt) + 1 for r in runs}
+        if len(lengths) != 1:
+            raise ValueError("keep_paths needs runs of equal length")
+        n_steps = lengths.pop()
+    return run_cells_shared(_sweep_cell, [r.params for r in runs], SWEEP_METRICS, n_steps=n_steps, workers=workers)
+
+
+def _save_paths(res: SharedResults, path: str) -> None:
+    np.savez_compressed(path, equity=res.equity, inventory=res.inventory)
+    print(f"Saved {path}")
+
+
+def _save_line(x, y, title: str, out_path: Path) -> None:
+    import matplotlib.pyplot as plt
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    plt.figure()
+    plt.plot(x, y)
+    plt.title(title)
+    plt.tight_layout()
+    plt.savefig(out_path)
+    plt.close()
+
+
+def _render_figures(names: list[str] | None, workers: int = 1, force: bool = False) -> None:
+    """Rebuild the stale figures among `names` (None: all) and the HTML report."""
+    from optimal_quoting.report import build_report
+
+    res = build_report(REPORTS, figures=names, workers=workers, force=force)
+    for name in res.rendered:
+        print(f"Rendered {FIGURES / name}.png")
+    if res.up_to_date:
+        print(f"Up to date: {', '.join(res.up_to_date)}")
+    if res.missing_tables:
+        print(f"Skipped (no results yet): {', '.join(res.missing_tables)}")
+    print(f"Saved {res.html}")
+
+
+# ---------------------------------------------------------------------
+# commands
+# ---------------------------------------------------------------------
+
+def cmd_simulate(args: argparse.Namespace) -> None:
+    from optimal_quoting.backtest.engine import run_mm_toy
+    from optimal_quoting.metrics.markout import MarkoutTracker
+
+    spec = load_simulate_config(args.config)
+    p = spec.params
+    markouts = MarkoutTracker(spec.markout_horizons)
+    if args.checkpoint:
+        import pandas as pd
+
+        from optimal_quoting.backtest.checkpoint import load_segments, run_checkpointed
+
+        sim = run_checkpointed(p, args.checkpoint, args.segment_steps, args.max_segments, markouts=markouts)
+        if not sim.done:
+            print(f"Checkpointed at step {sim.t}/{sim.n_steps} in {args.checkpoint} (run again to resume)")
+            return
+        df = pd.DataFrame(load_segments(args.checkpoint))
+        markouts = sim.markouts
+    else:
+        df = run_mm_toy(p, markouts=markouts)
+
+    out = Path(args.figure) if args.figure else FIGURES / f"{Path(args.config).stem}_equity.png"
+    _save_line(df["time_s"], df["equity"], f"Equity curve ({p.policy})", out)
+
+    print(df.tail())
+    mpf = messages_per_fill(df["messages"].to_numpy(), df["fill_bid"].to_numpy(), df["fill_ask"].to_numpy())
+    print(f"\nMessages per fill: {mpf:.2f}")
+    print("\nMarkouts:")
+    print(markouts.frame(dt=p.dt).to_string(index=False))
+    print(f"Saved {out}")
+
+
+def cmd_calibrate(args: argparse.Namespace) -> None:
+    from optimal_quoting.backtest.engine import run_mm_toy
+    from optimal_quoting.calibration.dataset import build_intensity_dataset_from_mm
+    from optimal_quoting.calibration.mle import compare_intensity_families, fit_intensity_exp_mle
+
+    spec = load_simulate_config(args.config)
+    p = spec.params
+    k_bounds, grid_size = spec.calibration.k_bounds, spec.calibration.grid_size
+
+    df = run_mm_toy(p)
+    delta, n = build_intensity_dataset_from_mm(df, dt=p.dt)
+    est = fit_intensity_exp_mle(delta, n, dt=p.dt, k_bounds=k_bounds, grid_size=grid_size)
+
+    print("=== True params ===")
+    print(f"A_true={p.A:.6f}, k_true={p.k:.6f}")
+    print("=== MLE estimate ===")
+    print(f"A_hat={est.A:.6f}, k_hat={est.k:.6f}, nll={est.nll:.3f}")
+
+    fits = compare_intensity_families(delta, n, dt=p.dt, k_bounds=k_bounds)
+    print("=== Family comparison (lower nll is better) ===")
+    for name, fit in sorted(fits.items(), key=lambda kv: kv[1].nll):
+        print(f"{name:8s}  A_hat={fit.A:.6f}  k_hat={fit.k:.6f}  nll={fit.nll:.3f}")
+
+    import pandas as pd
+
+    REPORTS.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame({"delta": delta, "n": n}).to_csv(REPORTS / "calibration_samples.csv", index=False)
+    pd.DataFrame(
+        [{"A_true": p.A, "k_true": p.k, "A_hat": est.A, "k_hat": est.k, "nll": est.nll, "dt": p.dt}]
+    ).to_csv(REPORTS / "calibration_fit.csv", index=False)
+    _render_figures(["intensity_fit", "intensity_empirical_fit", "intensity_profile_nll"])
+
+
+def cmd_frontier(args: argparse.Namespace) -> None:
+    from optimal_quoting.experiments.probing_frontier import (
+        AdaptiveFrontierConfig,
+        run_probing_frontier,
+        run_probing_frontier_adaptive,
+        summarize_frontier_cells,
+    )
+
+    spec = load_frontier_config(args.config)
+    cfg = spec.frontier
+    if isinstance(cfg, AdaptiveFrontierConfig):
+        df = run_probing_frontier_adaptive(spec.base, cfg)
+        cells = summarize_frontier_cells(df)
+        print(f"Adaptive sweep: {len(df)} runs over {len(cells)} cells "
+              f"(fixed-seed budget for these cells: {len(cells) * len(cfg.seeds)})")
+    else:
+        df = run_probing_frontier(spec.base, cfg, workers=args.workers)
+
+    REPORTS.mkdir(parents=True, exist_ok=True)
+    out_csv = REPORTS / "frontier_results.csv"
+    df.to_csv(out_csv, index=False)
+    print(f"Saved {out_csv}")
+
+    _render_figures(
+        ["frontier_pnl_heatmap", "frontier_inv_heatmap", "frontier_kerr_heatmap", "frontier_pnl_vs_kerr"],
+        workers=args.workers,
+    )
+
+
+def cmd_stress(args: argparse.Namespace) -> None:
+    spec = load_stress_config(args.config)
+    with run_sweep(spec.runs, workers=args.workers, keep_paths=bool(args.paths)) as shared:
+        res = shared.frame([dict(r.labels) for r in spec.runs])
+        if args.paths:
+            _save_paths(shared, args.paths)
+    res = res.drop(columns="inv_pnl_control").astype({"n_rows": int})
+
+    out = Path(spec.out_csv)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    res.to_csv(out, index=False)
+    print(f"Saved {out}")
+
+
+def cmd_bench(args: argparse.Namespace) -> None:
+    from optimal_quoting.metrics.variance_reduction import (
+        antithetic_average,
+        control_variate_adjust,
+        paired_difference,
+    )
+
+    spec = load_benchmark_config(args.config)
+    with run_sweep(spec.runs, workers=args.workers, keep_paths=bool(args.paths)) as shared:
+        res = shared.frame([dict(r.labels) for r in spec.runs]).drop(columns="n_rows")
+        if args.paths:
+            _save_paths(shared, args.paths)
+
+    out = Path(spec.out_csv)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    res.to_csv(out, index=False)
+
+    print(res.groupby("policy").mean(numeric_only=True))
+    print(f"Saved {out}")
+
+    # --- Policy differences vs the first policy, paired by seed
+    per_seed = {}
+    for name, g in res.groupby("policy", sort=False):
+        g = g.sort_values(["seed", "antithetic"])
+        y = g["pnl_final"].to_numpy()
+        x = g["inv_pnl_control"].to_numpy()
+        if spec.antithetic:
+            y = antithetic_average(y[0::2], y[1::2])
+            x = antithetic_average(x[0::2], x[1::2])
+        if spec.control_variate and len(y) > 1:
+            y, _ = control_variate_adjust(y, x, mu_x=0.0)
+        per_seed[name] = y
+
+    ref = spec.policies[0]
+    if len(spec.seeds) > 1:
+        print(f"=== pnl_final difference vs {ref} (paired by seed) ===")
+        for name, y in per_seed.items():
+            if name == ref:
+                continue
+            mean, se = paired_difference(y, per_seed[ref])
+            print(f"{name:10s}  diff={mean:+.4f}  se={se:.4f}")
+
+
+def cmd_optimize(args: argparse.Namespace) -> None:
+    from optimal_quoting.experiments.optimizer import optimize_policy
+
+    spec = load_optimize_config(args.config)
+    res = optimize_policy(spec.base, spec.optimizer, workers=args.workers, checkpoint=spec.checkpoint)
+    df = res.frame()
+
+    out = Path(spec.out_csv)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(out, index=False)
+
+    print(df.head(10).to_string(index=False))
+    print(f"\nRuns: {res.n_runs} ({res.n_new_runs} new)")
+    print("Best: " + "  ".join(f"{k}={v:.6g}" for k, v in res.best.items()) + f"  objective={res.best_objective:.6g}")
+    print(f"Saved {out}")
+
+
+def cmd_live(args: argparse.Namespace) -> None:
+    from optimal_quoting.live.quoting import run_mock_session
+
+    p = load_simulate_config(args.config).params
+    st = run_mock_session(p, n_ticks=args.ticks)
+    print(f"ticks={st.ticks}  fills={st.fills}  messages={st.messages}  equity={st.equity:.4f}")
+    print(
+        f"messages/fill={st.messages_per_fill:.2f}  suppressed={st.suppressed}  throttled={st.throttled}"
+    )
+    print(f"throughput: {st.updates_per_s:,.0f} updates/s ({st.elapsed_s:.2f} s)")
+    print("tick-to-quote latency (us): " + "  ".join(f"{k}={v:.1f}" for k, v in st.latency_us.items()))
+
+
+def cmd_report(args: argparse.Namespace) -> None:
+    _render_figures(None, workers=args.workers, force=args.force)
+
+
+COMMANDS: dict[str, tuple[Callable[[argparse.Namespace], None], str | None, str]] = {
+    "simulate": (cmd_simulate, "configs/mm_toy.yaml", "run one toy backtest (equity plot + markouts)"),
+    "calibrate": (cmd_calibrate, "configs/mm_toy.yaml", "simulate, then fit the fill intensity by MLE"),
+    "frontier": (cmd_frontier, "configs/mm_toy.yaml", "probing information-PnL frontier sweep"),
+    "stress": (cmd_stress, "configs/stress.yaml", "policies across (A, k, Hawkes) regimes"),
+    "bench": (cmd_bench, "configs/benchmark.yaml", "policy benchmark with variance reduction"),
+    "optimize": (cmd_optimize, "configs/optimize.yaml", "successive-halving search over policy parameters"),
+    "live": (cmd_live, "configs/mm_toy.yaml", "asyncio quoting loop against a local mock exchange"),
+    "report": (cmd_report, None, "re-render figures whose result tables changed, write reports/report.html"),
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="optimal-quoting", description="Optimal quoting experiments.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, (fn, default_cfg, help_text) in COMMANDS.items():
+        sp = sub.add_parser(name, help=help_text)
+        if default_cfg is not None:
+            sp.add_argument("--config", default=default_cfg, help=f"YAML config (default: {default_cfg})")
+        if name in ("stress", "bench", "frontier", "optimize", "report"):
+            sp.add_argument("--workers", type=int, default=1, help="worker processes (default: 1)")
+        if name in ("stress", "bench"):
+            sp.add_argument("--paths", default=None, help="also save equity/inventory paths (.npz)")
+        if name == "report":
+            sp.add_argument("--force", action="store_true", help="re-render every figure")
+        if name == "live":
+            sp.add_argument("--ticks", type=int, default=None, help="market-data updates (default: T / dt + 1)")
+        if name == "simulate":
+            sp.add_argument("--figure", default=None, help="equity plot path")
+            sp.add_argument("--checkpoint", default=None, help="run in segments, checkpointed to this directory")
+            sp.add_argument("--segment-steps", type=int, default=1_000_000, help="steps per checkpointed segment")
+            sp.add_argument("--max-segments", type=int, default=None, help="stop after N segments (resume later)")
+        sp.set_defaults(func=fn)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,347 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
+from dataclasses import MISSING, dataclass, fields
+import itertools
 from pathlib import Path
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict
 
-import yaml
+from optimal_quoting.backtest.engine import FILL_MODELS, POLICIES, MMParams
+from optimal_quoting.sim.rng import sweep_seed
+
+if TYPE_CHECKING:
+    from optimal_quoting.experiments.optimizer import OptimizerConfig
+    from optimal_quoting.experiments.probing_frontier import AdaptiveFrontierConfig, FrontierConfig
 
 
 def load_yaml(path: str) -> Dict[str, Any]:
+    import yaml   # deferred: keeps `import optimal_quoting.config` cheap for workers
+
     return yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+
+
+# ---------------------------------------------------------------------
+# MMParams resolution (validated once, then passed around as frozen params)
+# ---------------------------------------------------------------------
+
+# nested layout used by as_toy.yaml / benchmark.yaml: sections flattened into MMParams fields
+_PARAM_SECTIONS = ("intensity", "strategy", "costs")
+
+# string fields restricted to a set of values
+_CHOICES = {"policy": POLICIES, "fill_model": FILL_MODELS}
+
+
+def _as_int(value: Any) -> int:
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"{value!r} is not integral")    # int() would truncate it
+    return int(value)
+
+
+_COERCE = {"float": float, "int": _as_int, "str": str}
+
+
+def _coerce(name: str, annotation: str, value: Any) -> Any:
+    optional = annotation.endswith("| None")
+    base = annotation.replace("| None", "").strip()
+    if value is None:
+        if optional:
+            return None
+        raise ValueError(f"{name} must not be null")
+    if base == "bool":
+        if not isinstance(value, bool):
+            raise ValueError(f"{name} must be a boolean, got {value!r}")
+        return value
+    if base == "tuple[int, ...]":
+        try:
+            return tuple(_as_int(v) for v in value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{name} must be a list of integers, got {value!r}") from None
+    try:
+        return _COERCE[base](value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be {base}, got {value!r}") from None
+
+
+def _flatten_params(raw: Mapping[str, Any]) -> dict[str, Any]:
+    flat: dict[str, Any] = {}
+    for key, value in raw.items():
+        if key in _PARAM_SECTIONS and isinstance(value, Mapping):
+            flat.update(value)
+        elif key == "policy" and isinstance(value, Mapping):
+            # `policy: {name: as, gamma: 0.1}`
+            section = dict(value)
+            if "name" in section:
+                flat["policy"] = section.pop("name")
+            flat.update(section)
+        else:
+            flat[key] = value
+    return flat
+
+
+def resolve_mm_params(raw: Mapping[str, Any], **overrides: Any) -> MMParams:
+    """
+    Validate a params mapping and build MMParams.
+
+    Accepts the flat layout (mm_toy.yaml `mm_params`) and the nested one
+    (`intensity` / `strategy` / `costs` sections, `policy: {name, ...}`).
+    Unknown keys, missing required fields, values of the wrong type (including
+    non-integral numbers for int fields) and unknown `policy` / `fill_model`
+    names raise ValueError; values are coerced to the field types
+    (e.g. `T: 20000` -> float).
+    """
+    values = _flatten_params(raw)
+    values.update(overrides)
+
+    spec = {f.name: f for f in fields(MMParams)}
+    unknown = sorted(set(values) - set(spec))
+    if unknown:
+        raise ValueError(f"unknown MMParams fields: {unknown}")
+
+    missing = sorted(
+        name for name, f in spec.items()
+        if name not in values and f.default is MISSING and f.default_factory is MISSING
+    )
+    if missing:
+        raise ValueError(f"missing MMParams fields: {missing}")
+
+    coerced = {name: _coerce(name, str(spec[name].type), v) for name, v in values.items()}
+    for name, allowed in _CHOICES.items():
+        if name in coerced and coerced[name] not in allowed:
+            raise ValueError(f"{name} must be one of {list(allowed)}, got {coerced[name]!r}")
+    return MMParams(**coerced)
+
+
+def _section(raw: Mapping[str, Any], key: str) -> Mapping[str, Any]:
+    value = raw.get(key, {})
+    if not isinstance(value, Mapping):
+        raise TypeError(f"`{key}` must be a mapping")
+    return value
+
+
+def _params_block(raw: Mapping[str, Any], spec_keys: set[str]) -> Mapping[str, Any]:
+    """`mm_params:` if present, else every top-level key not used by the spec itself."""
+    if "mm_params" in raw:
+        return _section(raw, "mm_params")
+    return {k: v for k, v in raw.items() if k not in spec_keys}
+
+
+# ---------------------------------------------------------------------
+# Resolved command specs
+# ---------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class CalibrationSpec:
+    k_bounds: tuple[float, float] = (0.0, 5.0)
+    grid_size: int = 300
+
+
+@dataclass(frozen=True)
+class SimulateSpec:
+    params: MMParams
+    markout_horizons: tuple[int, ...] = (0, 1, 10, 60)
+    calibration: CalibrationSpec = CalibrationSpec()
+
+
+@dataclass(frozen=True)
+class FrontierSpec:
+    base: MMParams
+    frontier: FrontierConfig | AdaptiveFrontierConfig
+
+
+@dataclass(frozen=True)
+class SweepRun:
+    """One resolved run of a sweep: its labels (output columns) and params."""
+
+    labels: tuple[tuple[str, Any], ...]
+    params: MMParams
+
+
+@dataclass(frozen=True)
+class StressSpec:
+    runs: tuple[SweepRun, ...]
+    out_csv: str = "reports/stress_results.csv"
+
+
+@dataclass(frozen=True)
+class BenchmarkSpec:
+    runs: tuple[SweepRun, ...]
+    policies: tuple[str, ...]
+    seeds: tuple[int, ...]
+    antithetic: bool = False
+    control_variate: bool = False
+    out_csv: str = "reports/benchmark_results.csv"
+
+
+@dataclass(frozen=True)
+class OptimizeSpec:
+    base: MMParams
+    optimizer: OptimizerConfig
+    checkpoint: str | None = "reports/optimize_checkpoint.json"
+    out_csv: str = "reports/optimize_results.csv"
+
+
+def _calibration_spec(raw: Mapping[str, Any], key: str) -> CalibrationSpec:
+    cal = _section(raw, key)
+    kb = cal.get("k_bounds", CalibrationSpec.k_bounds)
+    if len(kb) != 2:
+        raise ValueError(f"{key}.k_bounds must have two entries")
+    return CalibrationSpec(
+        k_bounds=(float(kb[0]), float(kb[1])),
+        grid_size=int(cal.get("grid_size", CalibrationSpec.grid_size)),
+    )
+
+
+def _simulate_spec(raw: Mapping[str, Any]) -> SimulateSpec:
+    spec_keys = {"markout_horizons", "frontier", "intensity_calibration"}
+    return SimulateSpec(
+        params=resolve_mm_params(_params_block(raw, spec_keys)),
+        markout_horizons=tuple(int(h) for h in raw.get("markout_horizons", SimulateSpec.markout_horizons)),
+        calibration=_calibration_spec(raw, "intensity_calibration"),
+    )
+
+
+def load_simulate_config(path: str) -> SimulateSpec:
+    """mm_toy.yaml (flat `mm_params`) or as_toy.yaml (nested layout)."""
+    return _simulate_spec(load_yaml(path))
+
+
+def load_frontier_config(path: str) -> FrontierSpec:
+    from optimal_quoting.experiments.probing_frontier import AdaptiveFrontierConfig, FrontierConfig
+
+    raw = load_yaml(path)
+    sim = _simulate_spec(raw)
+    fr = _section(raw, "frontier")
+    common = dict(
+        p_grid=[float(x) for x in fr.get("p_grid", [0.0, 0.05, 0.1, 0.2, 0.3])],
+        jitter_grid=[float(x) for x in fr.get("jitter_grid", [0.0, 0.02, 0.05, 0.1])],
+        seeds=[int(x) for x in fr.get("seeds", [0, 1, 2, 3, 4])],
+        k_bounds=sim.calibration.k_bounds,
+        grid_size=sim.calibration.grid_size,
+        experiment=str(fr.get("experiment", Path(path).stem)),
+    )
+    adaptive = fr.get("adaptive")
+    if adaptive:
+        # seeds act as the per-cell budget; sampling stops once CIs are tight
+        cfg: FrontierConfig | AdaptiveFrontierConfig = AdaptiveFrontierConfig(
+            **common,
+            pnl_tol=float(adaptive["pnl_tol"]),
+            kerr_tol=float(adaptive["kerr_tol"]),
+            min_seeds=int(adaptive.get("min_seeds", 3)),
+            seeds_per_round=int(adaptive.get("seeds_per_round", 2)),
+            refine_rounds=int(adaptive.get("refine_rounds", 1)),
+        )
+    else:
+        cfg = FrontierConfig(**common)
+    return FrontierSpec(base=sim.params, frontier=cfg)
+
+
+def load_stress_config(path: str) -> StressSpec:
+    """
+    stress.yaml: flat base params; (A, k, hawkes_alpha, seed, policy) vary per run.
+
+    Each (A, k, hawkes_alpha) regime is a seeding cell and each seed a
+    replicate of it (sim.rng.sweep_seed, experiment id `experiment`,
+    default: the file name): policies share the streams of a regime and
+    seed, regimes get independent ones.
+    """
+    raw = load_yaml(path)
+    grid_keys = {"A_grid", "k_grid", "hawkes_alpha_grid", "seeds", "policies", "out_csv", "experiment"}
+    base = dict(_params_block(raw, grid_keys))
+    experiment = str(raw.get("experiment", Path(path).stem))
+
+    runs = []
+    regimes = itertools.product(raw["A_grid"], raw["k_grid"], raw.get("hawkes_alpha_grid", [0.0]))
+    for cell, (A, k, h_alpha) in enumerate(regimes):
+        for seed, policy in itertools.product(raw["seeds"], raw["policies"]):
+            p = resolve_mm_params(
+                base, A=A, k=k, hawkes_alpha=h_alpha, policy=policy, **sweep_seed(experiment, cell, int(seed))
+            )
+            labels = (
+                ("A", p.A), ("k", p.k), ("hawkes_alpha", p.hawkes_alpha), ("seed", int(seed)), ("policy", p.policy)
+            )
+            runs.append(SweepRun(labels=labels, params=p))
+    return StressSpec(runs=tuple(runs), out_csv=str(raw.get("out_csv", StressSpec.out_csv)))
+
+
+def load_benchmark_config(path: str) -> BenchmarkSpec:
+    """
+    benchmark.yaml: nested `base`, per-policy overrides, `variance_reduction` flags.
+
+    Seeds are replicates of a single seeding cell (sim.rng.sweep_seed,
+    experiment id `experiment`, default: the file name), shared by all
+    policies.
+    """
+    raw = load_yaml(path)
+    base = _section(raw, "base")
+    policies = _section(raw, "policies")
+    if not policies:
+        raise ValueError("benchmark config needs at least one policy")
+    seeds = tuple(int(s) for s in raw["seeds"])
+    experiment = str(raw.get("experiment", Path(path).stem))
+
+    vr = _section(raw, "variance_reduction")
+    antithetic = bool(vr.get("antithetic", False))
+    rng_streams = bool(vr.get("rng_streams", False))
+
+    runs = []
+    for name, overrides in policies.items():
+        for seed in seeds:
+            for anti in ([False, True] if antithetic else [False]):
+                p = resolve_mm_params(
+                    {**base, **dict(overrides)},
+                    rng_streams=rng_streams,
+                    antithetic=anti,
+                    **sweep_seed(experiment, 0, seed),
+                )
+                runs.append(SweepRun(labels=(("policy", name), ("seed", seed), ("antithetic", anti)), params=p))
+    return BenchmarkSpec(
+        runs=tuple(runs),
+        policies=tuple(policies),
+        seeds=seeds,
+        antithetic=antithetic,
+        control_variate=bool(vr.get("control_variate", False)),
+        out_csv=str(raw.get("out_csv", BenchmarkSpec.out_csv)),
+    )
+
+
+def load_optimize_config(path: str) -> OptimizeSpec:
+    """optimize.yaml: nested `base`, `search` bounds per field, `optimizer` settings."""
+    from optimal_quoting.experiments.optimizer import OptimizerConfig, SearchDim
+
+    raw = load_yaml(path)
+    base = resolve_mm_params(_section(raw, "base"))
+    search = _section(raw, "search")
+    if not search:
+        raise ValueError("optimize config needs at least one `search` field")
+    space = []
+    for name, bounds in search.items():
+        if not isinstance(bounds, Mapping) or "low" not in bounds or "high" not in bounds:
+            raise ValueError(f"search.{name} needs `low` and `high`")
+        space.append(
+            SearchDim(
+                name=name,
+                low=float(bounds["low"]),
+                high=float(bounds["high"]),
+                log=bool(bounds.get("log", False)),
+            )
+        )
+
+    opt = _section(raw, "optimizer")
+    budget = opt.get("budget")
+    cfg = OptimizerConfig(
+        space=tuple(space),
+        seeds=tuple(int(s) for s in opt.get("seeds", range(9))),
+        n_candidates=int(opt.get("n_candidates", OptimizerConfig.n_candidates)),
+        eta=int(opt.get("eta", OptimizerConfig.eta)),
+        min_seeds=int(opt.get("min_seeds", OptimizerConfig.min_seeds)),
+        risk_aversion=float(opt.get("risk_aversion", OptimizerConfig.risk_aversion)),
+        budget=None if budget is None else int(budget),
+        seed=int(opt.get("seed", OptimizerConfig.seed)),
+        experiment=str(opt.get("experiment", Path(path).stem)),
+    )
+    return OptimizeSpec(
+        base=base,
+        optimizer=cfg,
+        checkpoint=raw.get("checkpoint", OptimizeSpec.checkpoint),
+        out_csv=str(raw.get("out_csv", OptimizeSpec.out_csv)),
+    )
@@ -5,6 +5,8 @@ from pathlib import Path
 
 import pandas as pd
 
+from optimal_quoting.data.schema import TopOfBookArray
+
 
 @dataclass(frozen=True)
 class CSVSpec:
@@ -51,3 +53,8 @@ def load_top_of_book_csv(path: str | Path, spec: CSVSpec) -> pd.DataFrame:
 
     out = out.sort_values("ts").reset_index(drop=True)
     return out
+
+
+def load_top_of_book_array(path: str | Path, spec: CSVSpec) -> TopOfBookArray:
+    """load_top_of_book_csv, packed into 40-byte records (see data/schema.py)."""
+    return TopOfBookArray.from_frame(load_top_of_book_csv(path, spec))
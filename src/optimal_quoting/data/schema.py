@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Literal
+from typing import TYPE_CHECKING, ClassVar, Literal
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 Side = Literal["buy", "sell"]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Trade:
     ts: datetime
     price: float
@@ -15,7 +22,7 @@ class Trade:
     side: Side
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TopOfBook:
     ts: datetime
     bid: float
@@ -28,3 +35,206 @@ class TopOfBook:
 
     def spread(self) -> float:
         return self.ask - self.bid
+
+
+# ---------------------------------------------------------------------
+# Array-backed batches: one packed record per tick instead of one object
+# ---------------------------------------------------------------------
+
+# 40 bytes per quote update; missing sizes are NaN
+TOP_OF_BOOK_DTYPE = np.dtype(
+    [("ts", "M8[ns]"), ("bid", "f8"), ("ask", "f8"), ("bid_size", "f8"), ("ask_size", "f8")]
+)
+# 25 bytes per trade; side is +1 (buy) / -1 (sell)
+TRADE_DTYPE = np.dtype([("ts", "M8[ns]"), ("price", "f8"), ("size", "f8"), ("side", "i1")])
+
+SIDE_CODES: dict[str, int] = {"buy": 1, "sell": -1}
+
+
+class _RecordArray(ABC):
+    """
+    Batch of records in a NumPy structured array (`data`).
+
+    Field accessors return views; indexing with a slice or a mask returns a
+    batch over the selected rows, with an int a single record object.
+    """
+
+    __slots__ = ("data",)
+    dtype: ClassVar[np.dtype]
+
+    def __init__(self, data: np.ndarray) -> None:
+        if data.dtype != self.dtype or data.ndim != 1:
+            raise ValueError(f"data must be a 1D array of dtype {self.dtype}")
+        self.data = data
+
+    @classmethod
+    def empty(cls, n: int):
+        return cls(np.empty(n, dtype=cls.dtype))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    @property
+    def ts(self) -> np.ndarray:
+        return self.data["ts"]
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, np.integer)):
+            return self._record(self.data[idx])
+        return type(self)(self.data[idx])
+
+    @abstractmethod
+    def _record(self, row: np.void):
+        """One row as its record object (TopOfBook, Trade)."""
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame whose columns are views on `data` (no copy)."""
+        import pandas as pd
+
+        return pd.DataFrame({name: self.data[name] for name in self.dtype.names}, copy=False)
+
+    @classmethod
+    def _pack(cls, columns: dict[str, np.ndarray], n: int):
+        out = cls.empty(n)
+        for name in cls.dtype.names:
+            out.data[name] = columns[name]
+        return out
+
+
+def _frame_column(df: pd.DataFrame, name: str, dtype: str) -> np.ndarray:
+    if name not in df.columns:
+        raise ValueError(f"Missing column: {name}")
+    return df[name].to_numpy(dtype=dtype, copy=False)
+
+
+class TopOfBookArray(_RecordArray):
+    """Top-of-book updates as packed records (see TOP_OF_BOOK_DTYPE)."""
+
+    __slots__ = ()
+    dtype = TOP_OF_BOOK_DTYPE
+
+    @property
+    def bid(self) -> np.ndarray:
+        return self.data["bid"]
+
+    @property
+    def ask(self) -> np.ndarray:
+        return self.data["ask"]
+
+    @property
+    def bid_size(self) -> np.ndarray:
+        return self.data["bid_size"]
+
+    @property
+    def ask_size(self) -> np.ndarray:
+        return self.data["ask_size"]
+
+    def mid(self) -> np.ndarray:
+        return 0.5 * (self.bid + self.ask)
+
+    def spread(self) -> np.ndarray:
+        return self.ask - self.bid
+
+    def _record(self, row: np.void) -> TopOfBook:
+        bs, as_ = float(row["bid_size"]), float(row["ask_size"])
+        return TopOfBook(
+            ts=row["ts"].astype("M8[us]").item(),
+            bid=float(row["bid"]),
+            ask=float(row["ask"]),
+            bid_size=None if np.isnan(bs) else bs,
+            ask_size=None if np.isnan(as_) else as_,
+        )
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> TopOfBookArray:
+        """
+        From the loader's frame (ts, bid, ask[, bid_size, ask_size]): one
+        pass per column into the packed layout, no per-row objects.
+        """
+        n = len(df)
+        nan = np.full(n, np.nan)
+        return cls._pack(
+            {
+                "ts": _frame_column(df, "ts", "M8[ns]"),
+                "bid": _frame_column(df, "bid", "f8"),
+                "ask": _frame_column(df, "ask", "f8"),
+                "bid_size": _frame_column(df, "bid_size", "f8") if "bid_size" in df.columns else nan,
+                "ask_size": _frame_column(df, "ask_size", "f8") if "ask_size" in df.columns else nan,
+            },
+            n,
+        )
+
+    @classmethod
+    def from_records(cls, records: Iterable[TopOfBook]) -> TopOfBookArray:
+        rows = [
+            (
+                np.datetime64(r.ts, "ns"),
+                r.bid,
+                r.ask,
+                np.nan if r.bid_size is None else r.bid_size,
+                np.nan if r.ask_size is None else r.ask_size,
+            )
+            for r in records
+        ]
+        return cls(np.array(rows, dtype=cls.dtype))
+
+
+class TradeArray(_RecordArray):
+    """Trades as packed records (see TRADE_DTYPE)."""
+
+    __slots__ = ()
+    dtype = TRADE_DTYPE
+
+    @property
+    def price(self) -> np.ndarray:
+        return self.data["price"]
+
+    @property
+    def size(self) -> np.ndarray:
+        return self.data["size"]
+
+    @property
+    def side(self) -> np.ndarray:
+        return self.data["side"]
+
+    def signed_size(self) -> np.ndarray:
+        return self.side * self.size
+
+    def _record(self, row: np.void) -> Trade:
+        return Trade(
+            ts=row["ts"].astype("M8[us]").item(),
+            price=float(row["price"]),
+            size=float(row["size"]),
+            side="buy" if row["side"] > 0 else "sell",
+        )
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> TradeArray:
+        """From a (ts, price, size, side) frame; side as "buy"/"sell" or +1/-1."""
+        from pandas.api.types import is_numeric_dtype
+
+        if "side" not in df.columns:
+            raise ValueError("Missing column: side")
+        side = df["side"]
+        side_arr = side.to_numpy(dtype="i1") if is_numeric_dtype(side) else side.map(SIDE_CODES).to_numpy()
+        if not np.isin(side_arr, (-1, 1)).all():
+            raise ValueError("side must be 'buy' / 'sell' or +1 / -1")
+        n = len(df)
+        return cls._pack(
+            {
+                "ts": _frame_column(df, "ts", "M8[ns]"),
+                "price": _frame_column(df, "price", "f8"),
+                "size": _frame_column(df, "size", "f8"),
+                "side": side_arr,
+            },
+            n,
+        )
+
+    @classmethod
+    def from_records(cls, records: Iterable[Trade]) -> TradeArray:
+        rows = [(np.datetime64(r.ts, "ns"), r.price, r.size, SIDE_CODES[r.side]) for r in records]
+        return cls(np.array(rows, dtype=cls.dtype))
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, fields, replace
+import hashlib
+import json
+import math
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from optimal_quoting.backtest.engine import MMParams, run_mm_toy_arrays
+from optimal_quoting.experiments.shared_results import run_cells_shared
+from optimal_quoting.sim.rng import sweep_seed
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass(frozen=True)
+class SearchDim:
+    """One searched MMParams float field, sampled in [low, high] (log-uniform if log)."""
+
+    name: str
+    low: float
+    high: float
+    log: bool = False
+
+
+@dataclass(frozen=True)
+class OptimizerConfig:
+    """
+    Successive halving over policy parameters.
+
+    `n_candidates` points are drawn from `space` (Latin hypercube). Rung r
+    runs every surviving candidate on the first min_seeds * eta^r entries of
+    `seeds` and keeps the best 1 / eta of them, until one candidate is left
+    or the seeds run out. Each candidate is scored on the seeds of its rung by
+        J = mean(pnl_final) - risk_aversion * mean(inventory variance),
+    the inventory variance being taken over the steps of each run.
+
+    Every run uses per-purpose RNG streams, and the seeds are replicates of
+    one seeding cell of `experiment` (sim.rng.sweep_seed), so all candidates
+    see the same mid paths and fill uniforms for a given seed (common random
+    numbers): rankings compare candidates on identical scenarios.
+
+    `budget` caps the number of simulations (None: no cap); the search stops
+    before a rung whose new runs would exceed it. Rungs already in a
+    checkpoint are replayed whatever the budget.
+    """
+
+    space: tuple[SearchDim, ...]
+    seeds: tuple[int, ...]
+    n_candidates: int = 27
+    eta: int = 3
+    min_seeds: int = 1
+    risk_aversion: float = 0.0
+    budget: int | None = None
+    seed: int = 0                 # candidate sampling
+    experiment: str = "optimize"
+
+
+@dataclass(frozen=True)
+class OptimizationResult:
+    best: dict[str, float]
+    best_objective: float
+    rows: tuple[dict, ...]        # one per candidate, at the last rung it reached
+    n_runs: int                   # simulations in the checkpoint (all sessions)
+    n_new_runs: int               # simulations run by this call
+
+    def frame(self) -> pd.DataFrame:
+        """Candidates ranked by rung reached, then objective (best first)."""
+        import pandas as pd
+
+        df = pd.DataFrame(list(self.rows))
+        return df.sort_values(["rung", "objective"], ascending=False, ignore_index=True)
+
+
+OBJECTIVE_METRICS = ("pnl_final", "inv_var")
+
+
+def _objective_cell(p: MMParams) -> tuple[dict[str, float], None, None]:
+    """Worker entry point: one run -> final PnL and inventory variance."""
+    out = run_mm_toy_arrays(p)
+    return {"pnl_final": float(out["equity"][-1]), "inv_var": float(np.var(out["inventory"]))}, None, None
+
+
+def _check_config(base: MMParams, cfg: OptimizerConfig) -> None:
+    floats = {f.name for f in fields(MMParams) if str(f.type) == "float"}
+    if not cfg.space:
+        raise ValueError("space must not be empty")
+    for dim in cfg.space:
+        if dim.name not in floats:
+            raise ValueError(f"{dim.name} is not a float MMParams field")
+        if not dim.low < dim.high:
+            raise ValueError(f"{dim.name}: low must be < high")
+        if dim.log and dim.low <= 0:
+            raise ValueError(f"{dim.name}: log scale needs low > 0")
+    if len({d.name for d in cfg.space}) != len(cfg.space):
+        raise ValueError("space has duplicate fields")
+    if cfg.n_candidates < 1 or cfg.eta < 2 or cfg.min_seeds < 1:
+        raise ValueError("need n_candidates >= 1, eta >= 2 and min_seeds >= 1")
+    if len(cfg.seeds) < cfg.min_seeds:
+        raise ValueError("seeds must contain at least min_seeds entries")
+
+
+def sample_candidates(cfg: OptimizerConfig) -> list[dict[str, float]]:
+    """Latin hypercube over `space`: one point per stratum of every dimension."""
+    rng = np.random.default_rng(cfg.seed)
+    n = cfg.n_candidates
+    cols = {}
+    for dim in cfg.space:
+        u = (rng.permutation(n) + rng.random(n)) / n
+        if dim.log:
+            lo, hi = math.log(dim.low), math.log(dim.high)
+            cols[dim.name] = np.exp(lo + u * (hi - lo))
+        else:
+            cols[dim.name] = dim.low + u * (dim.high - dim.low)
+    return [{name: float(v[i]) for name, v in cols.items()} for i in range(n)]
+
+
+def _fingerprint(base: MMParams, cfg: OptimizerConfig) -> str:
+    # the budget is left out: a search can be resumed with a larger one
+    search = {k: v for k, v in asdict(cfg).items() if k != "budget"}
+    blob = json.dumps({"base": asdict(base), "cfg": search}, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def _load_checkpoint(path: Path, fingerprint: str) -> dict[str, list[float]]:
+    if not path.exists():
+        return {}
+    state = json.loads(path.read_text())
+    if state.get("fingerprint") != fingerprint:
+        raise ValueError(f"{path} was written for a different search (base params or optimizer config)")
+    return state["results"]
+
+
+def _save_checkpoint(path: Path, fingerprint: str, candidates: list[dict], results: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps({"fingerprint": fingerprint, "candidates": candidates, "results": results}))
+    os.replace(tmp, path)     # atomic: an interrupted write keeps the previous checkpoint
+
+
+def optimize_policy(
+    base: MMParams,
+    cfg: OptimizerConfig,
+    workers: int = 1,
+    checkpoint: str | Path | None = None,
+) -> OptimizationResult:
+    """
+    Search the parameters of `base` listed in cfg.space (e.g. gamma for the
+    AS policy, base_spread / phi for the baseline) by successive halving,
+    see OptimizerConfig.
+
+    Each rung's missing (candidate, seed) runs are evaluated as one batch
+    over `workers` processes (experiments/shared_results.py). With
+    `checkpoint`, every run result is saved to that JSON file after each
+    rung; calling again with the same file replays the finished rungs from
+    it and only simulates what is missing. A checkpoint written for other
+    base params or another config is refused.
+    """
+    _check_config(base, cfg)
+    candidates = sample_candidates(cfg)
+    fingerprint = _fingerprint(base, cfg)
+    path = Path(checkpoint) if checkpoint is not None else None
+    results = _load_checkpoint(path, fingerprint) if path is not None else {}
+    n_new = 0
+
+    def score(i: int, n_seeds: int) -> tuple[float, float, float]:
+        runs = np.array([results[f"{i}:{s}"] for s in cfg.seeds[:n_seeds]])
+        pnl, inv_var = runs.mean(axis=0)
+        return float(pnl - cfg.risk_aversion * inv_var), float(pnl), float(inv_var)
+
+    alive = list(range(len(candidates)))
+    reached: dict[int, tuple[int, int]] = {}    # candidate -> (rung, seeds)
+    rung = 0
+    while True:
+        n_seeds = min(len(cfg.seeds), cfg.min_seeds * cfg.eta ** rung)
+        todo = [(i, s) for i in alive for s in cfg.seeds[:n_seeds] if f"{i}:{s}" not in results]
+        # runs already in the checkpoint are spent: only new runs are held to the budget
+        if todo and cfg.budget is not None and len(results) + len(todo) > cfg.budget:
+            if rung == 0:
+                raise ValueError(
+                    f"budget {cfg.budget} is too small for the first rung "
+                    f"({len(todo)} runs, {len(results)} already done)"
+                )
+            break
+
+        if todo:
+            tasks = [
+                replace(base, **candidates[i], **sweep_seed(cfg.experiment, 0, int(s)), rng_streams=True)
+                for i, s in todo
+            ]
+            with run_cells_shared(_objective_cell, tasks, OBJECTIVE_METRICS, workers=workers) as res:
+                values = res.metrics.copy()
+            for (i, s), row in zip(todo, values):
+                results[f"{i}:{s}"] = [float(row[0]), float(row[1])]
+            n_new += len(todo)
+            if path is not None:
+                _save_checkpoint(path, fingerprint, candidates, results)
+
+        for i in alive:
+            reached[i] = (rung, n_seeds)
+        if len(alive) == 1 or n_seeds == len(cfg.seeds):
+            break
+        alive = sorted(alive, key=lambda i: score(i, n_seeds)[0], reverse=True)[: math.ceil(len(alive) / cfg.eta)]
+        rung += 1
+
+    rows = []
+    for i, (r, n_seeds) in sorted(reached.items()):
+        objective, pnl, inv_var = score(i, n_seeds)
+        rows.append(
+            {"candidate": i, **candidates[i], "rung": r, "n_seeds": n_seeds,
+             "pnl_mean": pnl, "inv_var": inv_var, "objective": objective}
+        )
+    # best: highest objective among the candidates of the last rung evaluated
+    top = max(reached.values())
+    best = max((row for row in rows if (row["rung"], row["n_seeds"]) == top), key=lambda row: row["objective"])
+    return OptimizationResult(
+        best={d.name: best[d.name] for d in cfg.space},
+        best_objective=best["objective"],
+        rows=tuple(rows),
+        n_runs=len(results),
+        n_new_runs=n_new,
+    )
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import math
+
+import numpy as np
 import pandas as pd
 
 from optimal_quoting.backtest.engine import MMParams, run_mm_toy
-from optimal_quoting.metrics.performance import performance_summary
+from optimal_quoting.experiments.shared_results import run_cells_shared
+from optimal_quoting.metrics.performance import PERFORMANCE_METRICS, performance_summary_batch
 from optimal_quoting.calibration.dataset import build_intensity_dataset_from_mm
 from optimal_quoting.calibration.mle import fit_intensity_exp_mle
+from optimal_quoting.sim.rng import sweep_seed
 
 
 @dataclass(frozen=True)
@@ -16,65 +21,270 @@ class FrontierConfig:
     seeds: list[int]
     k_bounds: tuple[float, float] = (0.0, 5.0)
     grid_size: int = 300
+    experiment: str = "frontier"    # seeding: runs are replicates of one cell (sim.rng.sweep_seed)
+
+
+@dataclass(frozen=True)
+class AdaptiveFrontierConfig:
+    """
+    Adaptive version of FrontierConfig.
+
+    Seeds are drawn in order from `seeds` (the budget per cell), in rounds of
+    `seeds_per_round`, until the CI half-widths of mean pnl_final and mean
+    k_abs_error both fall below their tolerances:
+        half_width = z * std(ddof=1) / sqrt(n_seeds)
+
+    Once every cell has stopped, the p_explore grid is refined (at most
+    `refine_rounds` times) by inserting midpoints around the grid points where
+    the (k_abs_error, pnl_final) frontier bends more than `refine_angle_deg`.
+    """
+
+    p_grid: list[float]
+    jitter_grid: list[float]
+    seeds: list[int]
+    pnl_tol: float
+    kerr_tol: float
+    min_seeds: int = 3
+    seeds_per_round: int = 2
+    z: float = 1.96
+    refine_rounds: int = 1
+    refine_angle_deg: float = 30.0
+    max_new_points: int = 4
+    k_bounds: tuple[float, float] = (0.0, 5.0)
+    grid_size: int = 300
+    experiment: str = "frontier"
+
+
+def _base_dict(base: MMParams) -> dict:
+    # Build a dict copy once; remove per-run fields to avoid duplicate kwargs on rebuild.
+    base_dict = dict(base.__dict__)
+    for k in ("seed", "spawn_key", "policy", "probing_p", "probing_jitter", "probing_widen_only"):
+        base_dict.pop(k, None)
+    return base_dict
+
+
+def _run_frontier_cell(
+    base_dict: dict,
+    p_explore: float,
+    jitter: float,
+    seed: int,
+    k_bounds: tuple[float, float],
+    grid_size: int,
+    experiment: str,
+) -> tuple[dict, np.ndarray, np.ndarray]:
+    """
+    One (p_explore, jitter, seed) run: backtest + intensity MLE.
+    Returns (row, equity path, inventory path).
+
+    Every (p_explore, jitter) cell probes the same market: `seed` is a
+    replicate of the single seeding cell of `experiment`.
+    """
+    policy = "probing" if (p_explore > 0.0 and jitter > 0.0) else "baseline"
+
+    p = MMParams(
+        **base_dict,
+        **sweep_seed(experiment, 0, int(seed)),
+        policy=policy,
+        probing_p=float(p_explore),
+        probing_jitter=float(jitter),
+        probing_widen_only=True,
+    )
+
+    # Run backtest
+    df = run_mm_toy(p)
+
+    # Intensity dataset + MLE fit (A_hat, k_hat)
+    delta, n = build_intensity_dataset_from_mm(df, dt=p.dt)
+    est = fit_intensity_exp_mle(delta, n, dt=p.dt, k_bounds=k_bounds, grid_size=grid_size)
+
+    row = {
+        "p_explore": float(p_explore),
+        "jitter": float(jitter),
+        "seed": int(seed),
+        "A_hat": float(est.A),
+        "k_hat": float(est.k),
+        "k_abs_error": float(abs(est.k - p.k)),
+    }
+    return row, df["equity"].to_numpy(dtype=float), df["inventory"].to_numpy(dtype=float)
+
 
+def _frontier_frame(rows: list[dict], equity_paths: list[np.ndarray], inventory_paths: list[np.ndarray]) -> pd.DataFrame:
+    out = pd.DataFrame(rows)
+    if rows:
+        # Trading performance metrics (pnl_final, sharpe, inv_std, inv_max_abs, ...)
+        perf = performance_summary_batch(np.stack(equity_paths), np.stack(inventory_paths))
+        for key, values in perf.items():
+            out[key] = values
+    return out
 
-def run_probing_frontier(base: MMParams, cfg: FrontierConfig) -> pd.DataFrame:
+
+FRONTIER_METRICS = ("A_hat", "k_hat", "k_abs_error", *PERFORMANCE_METRICS)
+
+
+def _frontier_task(task: tuple) -> tuple[dict[str, float], None, None]:
+    """Worker entry point: one cell -> its FRONTIER_METRICS (paths are not kept)."""
+    row, eq, inv = _run_frontier_cell(*task)
+    perf = performance_summary_batch(eq[None, :], inv[None, :])
+    metrics = {key: row[key] for key in ("A_hat", "k_hat", "k_abs_error")}
+    metrics.update({key: float(v[0]) for key, v in perf.items()})
+    return metrics, None, None
+
+
+def run_probing_frontier(base: MMParams, cfg: FrontierConfig, workers: int = 1) -> pd.DataFrame:
     """
     Sweep (probing_p, probing_jitter) and seeds, run toy MM backtest,
     compute trading metrics + intensity MLE identifiability metrics.
 
     Notes:
     - MMParams is frozen/immutable => we rebuild a new MMParams per run.
+    - with workers > 1 the cells run on a process pool; each worker writes its
+      metrics row into shared memory and the table is built once at the end.
+    """
+    base_dict = _base_dict(base)
+    tasks = [
+        (base_dict, float(p_explore), float(jitter), int(seed), cfg.k_bounds, cfg.grid_size, cfg.experiment)
+        for p_explore in cfg.p_grid
+        for jitter in cfg.jitter_grid
+        for seed in cfg.seeds
+    ]
+    labels = [{"p_explore": t[1], "jitter": t[2], "seed": t[3]} for t in tasks]
+    with run_cells_shared(_frontier_task, tasks, FRONTIER_METRICS, workers=workers) as res:
+        return res.frame(labels)
+
+
+def _ci_half_width(x: list[float], z: float) -> float:
+    if len(x) < 2:
+        return math.inf
+    return float(z * np.std(x, ddof=1) / math.sqrt(len(x)))
+
+
+def _refine_points(
+    p_grid: list[float],
+    kerr: np.ndarray,
+    pnl: np.ndarray,
+    angle_deg: float,
+    max_new: int,
+) -> list[float]:
+    """
+    New p_explore values around the bends of the frontier.
+
+    kerr, pnl : (len(p_grid), n_jitter) cell means, p_grid sorted ascending.
+    The frontier for each jitter is the polyline p -> (kerr, pnl), with both
+    axes rescaled to [0, 1]. At interior point i the turning angle between
+    segments (i-1, i) and (i, i+1) is measured; the largest bends above
+    angle_deg get midpoints inserted on both sides.
+    """
+    if len(p_grid) < 3:
+        return []
+
+    def scale(a: np.ndarray) -> np.ndarray:
+        span = float(np.nanmax(a) - np.nanmin(a))
+        return (a - np.nanmin(a)) / span if span > 0 else np.zeros_like(a)
+
+    x, y = scale(kerr), scale(pnl)
+    v1 = np.stack([x[1:-1] - x[:-2], y[1:-1] - y[:-2]])
+    v2 = np.stack([x[2:] - x[1:-1], y[2:] - y[1:-1]])
+    n1 = np.hypot(v1[0], v1[1])
+    n2 = np.hypot(v2[0], v2[1])
+    cos = (v1 * v2).sum(axis=0) / np.maximum(n1 * n2, 1e-12)
+    angle = np.degrees(np.arccos(np.clip(cos, -1.0, 1.0)))
+    angle = np.where((n1 > 0) & (n2 > 0), angle, 0.0)
+    bend = np.nanmax(angle, axis=1)   # worst bend over jitters, per interior p
+
+    new: list[float] = []
+    for j in np.argsort(-bend):
+        if bend[j] <= angle_deg or len(new) >= max_new:
+            break
+        i = int(j) + 1
+        for a, b in ((p_grid[i - 1], p_grid[i]), (p_grid[i], p_grid[i + 1])):
+            mid = 0.5 * (a + b)
+            if mid not in new and mid not in p_grid and len(new) < max_new:
+                new.append(mid)
+    return sorted(new)
+
+
+def run_probing_frontier_adaptive(base: MMParams, cfg: AdaptiveFrontierConfig) -> pd.DataFrame:
     """
+    Same output as `run_probing_frontier` (one row per run), but seeds are
+    allocated in rounds and a cell stops sampling once its confidence
+    intervals are tight; the p_explore grid is then refined where the
+    frontier curves. Cells end up with different numbers of seeds, so
+    aggregate with groupby means (see `summarize_frontier_cells`).
+    """
+    if cfg.min_seeds < 2:
+        raise ValueError("min_seeds must be >= 2")
+    if cfg.seeds_per_round < 1:
+        raise ValueError("seeds_per_round must be >= 1")
+    if len(cfg.seeds) < cfg.min_seeds:
+        raise ValueError("seeds must contain at least min_seeds entries")
+
+    base_dict = _base_dict(base)
     rows: list[dict] = []
+    equity_paths: list[np.ndarray] = []
+    inventory_paths: list[np.ndarray] = []
 
-    # Build a dict copy once; remove seed to avoid duplicate kwarg on rebuild.
-    base_dict = dict(base.__dict__)
-    base_dict = dict(base.__dict__)
-    for k in ("seed", "policy", "probing_p", "probing_jitter", "probing_widen_only"):
-        base_dict.pop(k, None)
+    p_grid = sorted(map(float, cfg.p_grid))
+    jitter_grid = [float(j) for j in cfg.jitter_grid]
+    pnl: dict[tuple[float, float], list[float]] = {}
+    kerr: dict[tuple[float, float], list[float]] = {}
 
-    for p_explore in cfg.p_grid:
-        for jitter in cfg.jitter_grid:
-            for seed in cfg.seeds:
-                policy = "probing" if (p_explore > 0.0 and jitter > 0.0) else "baseline"
-
-                p = MMParams(
-                    **base_dict,
-                    seed=int(seed),
-                    policy=policy,
-                    probing_p=float(p_explore),
-                    probing_jitter=float(jitter),
-                    probing_widen_only=True,
-                )
+    def add_cells(ps: list[float]) -> None:
+        for p_explore in ps:
+            for jitter in jitter_grid:
+                pnl[(p_explore, jitter)] = []
+                kerr[(p_explore, jitter)] = []
 
-                # Run backtest
-                df = run_mm_toy(p)
+    def converged(cell: tuple[float, float]) -> bool:
+        return (
+            _ci_half_width(pnl[cell], cfg.z) <= cfg.pnl_tol
+            and _ci_half_width(kerr[cell], cfg.z) <= cfg.kerr_tol
+        )
 
-                # Trading performance metrics (expects keys like pnl_final, inv_std, inv_max_abs, etc.)
-                perf = performance_summary(df)
+    add_cells(p_grid)
+    refinements = 0
+    while True:
+        active = [
+            c for c in pnl
+            if len(pnl[c]) < len(cfg.seeds) and (len(pnl[c]) < cfg.min_seeds or not converged(c))
+        ]
 
-                # Intensity dataset + MLE fit (A_hat, k_hat)
-                delta, n = build_intensity_dataset_from_mm(df, dt=p.dt)
-                est = fit_intensity_exp_mle(
-                    delta,
-                    n,
-                    dt=p.dt,
-                    k_bounds=cfg.k_bounds,
-                    grid_size=cfg.grid_size,
-                )
+        if not active:
+            if refinements >= cfg.refine_rounds:
+                break
+            refinements += 1
+            mean_kerr = np.array([[np.mean(kerr[(p, j)]) for j in jitter_grid] for p in p_grid])
+            mean_pnl = np.array([[np.mean(pnl[(p, j)]) for j in jitter_grid] for p in p_grid])
+            new_ps = _refine_points(p_grid, mean_kerr, mean_pnl, cfg.refine_angle_deg, cfg.max_new_points)
+            if not new_ps:
+                break
+            add_cells(new_ps)
+            p_grid = sorted(p_grid + new_ps)
+            continue
 
-                rows.append(
-                    {
-                        "p_explore": float(p_explore),
-                        "jitter": float(jitter),
-                        "seed": int(seed),
-                        "A_hat": float(est.A),
-                        "k_hat": float(est.k),
-                        "k_abs_error": float(abs(est.k - p.k)),
-                        **perf,
-                    }
+        for cell in active:
+            done = len(pnl[cell])
+            take = cfg.min_seeds - done if done < cfg.min_seeds else cfg.seeds_per_round
+            for seed in cfg.seeds[done : done + take]:
+                row, eq, inv = _run_frontier_cell(
+                    base_dict, cell[0], cell[1], seed, cfg.k_bounds, cfg.grid_size, cfg.experiment
                 )
+                rows.append(row)
+                equity_paths.append(eq)
+                inventory_paths.append(inv)
+                pnl[cell].append(float(eq[-1]))
+                kerr[cell].append(row["k_abs_error"])
 
-    return pd.DataFrame(rows)
+    return _frontier_frame(rows, equity_paths, inventory_paths)
 
+
+def summarize_frontier_cells(df: pd.DataFrame, z: float = 1.96) -> pd.DataFrame:
+    """
+    Per-cell means, CI half-widths and seed counts of pnl_final and k_abs_error.
+    """
+    g = df.groupby(["p_explore", "jitter"])
+    out = g[["pnl_final", "k_abs_error"]].mean()
+    sem = g[["pnl_final", "k_abs_error"]].sem(ddof=1)
+    out["pnl_ci"] = z * sem["pnl_final"]
+    out["kerr_ci"] = z * sem["k_abs_error"]
+    out["n_seeds"] = g.size()
+    return out.reset_index()
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from typing_extensions import Self
+
+# run task -> (metrics, equity path or None, inventory path or None)
+CellFn = Callable[[Any], "tuple[Mapping[str, float], np.ndarray | None, np.ndarray | None]"]
+
+
+@dataclass(frozen=True)
+class SharedResultsSpec:
+    """
+    Picklable handle on a SharedResults block (what workers receive): the
+    shared-memory segment names and the array shapes.
+    """
+
+    metric_names: tuple[str, ...]
+    n_cells: int
+    n_steps: int                 # path length (0: no paths kept)
+    metrics_name: str
+    paths_name: str | None
+
+
+class SharedResults:
+    """
+    Per-cell sweep results in preallocated shared memory, indexed by cell id.
+
+      metrics   : (n_cells, n_metrics) float64, NaN until written
+      done      : (n_cells,) bool
+      equity    : (n_cells, n_steps) float64   (only if n_steps > 0)
+      inventory : (n_cells, n_steps) float64
+
+    Workers attach by name for one batch of cells and write their rows in
+    place, so only a count travels back through the pool; the parent reads
+    the same pages (no copy) and builds the results table once.
+
+    The creating process owns the segments: `close()` there also unlinks
+    them. Use as a context manager.
+    """
+
+    def __init__(self, spec: SharedResultsSpec, owner: bool) -> None:
+        self.spec = spec
+        self.owner = owner
+        m = len(spec.metric_names)
+
+        self._shm_metrics = shared_memory.SharedMemory(name=spec.metrics_name)
+        block = np.ndarray((spec.n_cells, m + 1), dtype=np.float64, buffer=self._shm_metrics.buf)
+        self.metrics = block[:, :m]
+        self._done = block[:, m]
+
+        self._shm_paths = None
+        self.equity = self.inventory = None
+        if spec.paths_name is not None:
+            self._shm_paths = shared_memory.SharedMemory(name=spec.paths_name)
+            paths = np.ndarray((2, spec.n_cells, spec.n_steps), dtype=np.float64, buffer=self._shm_paths.buf)
+            self.equity, self.inventory = paths[0], paths[1]
+
+    @classmethod
+    def create(cls, n_cells: int, metric_names: Sequence[str], n_steps: int = 0) -> SharedResults:
+        if n_cells < 1:
+            raise ValueError("n_cells must be >= 1")
+        if n_steps < 0:
+            raise ValueError("n_steps must be >= 0")
+        names = tuple(metric_names)
+        shm_m = shared_memory.SharedMemory(create=True, size=8 * n_cells * (len(names) + 1))
+        shm_p = shared_memory.SharedMemory(create=True, size=8 * 2 * n_cells * n_steps) if n_steps else None
+        spec = SharedResultsSpec(
+            metric_names=names,
+            n_cells=n_cells,
+            n_steps=n_steps,
+            metrics_name=shm_m.name,
+            paths_name=shm_p.name if shm_p is not None else None,
+        )
+        out = cls(spec, owner=True)
+        # the constructor attached its own handles; release the creation ones
+        shm_m.close()
+        if shm_p is not None:
+            shm_p.close()
+        out.metrics[:] = np.nan
+        out._done[:] = 0.0
+        return out
+
+    @classmethod
+    def attach(cls, spec: SharedResultsSpec) -> SharedResults:
+        return cls(spec, owner=False)
+
+    @property
+    def done(self) -> np.ndarray:
+        return self._done > 0
+
+    def write(
+        self,
+        cell: int,
+        metrics: Mapping[str, float],
+        equity: np.ndarray | None = None,
+        inventory: np.ndarray | None = None,
+    ) -> None:
+        self.metrics[cell] = [metrics[name] for name in self.spec.metric_names]
+        if self.equity is not None:
+            if equity is None or inventory is None:
+                raise ValueError("paths are kept: equity and inventory are required")
+            if len(equity) != self.spec.n_steps or len(inventory) != self.spec.n_steps:
+                raise ValueError(f"paths must have {self.spec.n_steps} steps")
+            self.equity[cell] = equity
+            self.inventory[cell] = inventory
+        self._done[cell] = 1.0
+
+    def frame(self, labels: Sequence[Mapping[str, Any]] | None = None) -> pd.DataFrame:
+        """Results table (label columns, then metrics); built once, in the parent."""
+        import pandas as pd
+
+        if not self.done.all():
+            raise RuntimeError(f"{int((~self.done).sum())} cells were not written")
+        out = pd.DataFrame(self.metrics.copy(), columns=list(self.spec.metric_names))
+        if labels is not None:
+            out = pd.concat([pd.DataFrame(list(labels)), out], axis=1)
+        return out
+
+    def close(self) -> None:
+        # drop the numpy views before closing the mappings
+        self.metrics = self._done = self.equity = self.inventory = None
+        for shm in (self._shm_metrics, self._shm_paths):
+            if shm is None:
+                continue
+            shm.close()
+            if self.owner:
+                shm.unlink()
+        self._shm_metrics = self._shm_paths = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _run_batch(args: tuple[SharedResultsSpec, CellFn, list[tuple[int, Any]]]) -> int:
+    """
+    Worker entry point: run a batch of cells. The worker attaches to the
+    block for the batch only, so no mapping outlives its sweep in a
+    long-lived process.
+    """
+    spec, fn, batch = args
+    with SharedResults.attach(spec) as res:
+        for cell, task in batch:
+            metrics, equity, inventory = fn(task)
+            res.write(cell, metrics, equity, inventory)
+    return len(batch)
+
+
+def run_cells_shared(
+    fn: CellFn,
+    tasks: Sequence[Any],
+    metric_names: Sequence[str],
+    n_steps: int = 0,
+    workers: int = 1,
+) -> SharedResults:
+    """
+    Run fn(task) for every task (cell id = position in `tasks`) and collect
+    its metrics (and paths, if n_steps > 0) into a new SharedResults.
+
+    With workers > 1, tasks run on a process pool; fn must be a picklable
+    module-level function. The caller owns the returned block:
+
+        with run_cells_shared(fn, tasks, names, workers=8) as res:
+            df = res.frame(labels)
+    """
+    res = SharedResults.create(len(tasks), metric_names, n_steps=n_steps)
+    try:
+        if workers <= 1:
+            for cell, task in enumerate(tasks):
+                metrics, equity, inventory = fn(task)
+                res.write(cell, metrics, equity, inventory)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            cells = list(enumerate(tasks))
+            size = max(1, len(cells) // (4 * workers))
+            batches = [(res.spec, fn, cells[i : i + size]) for i in range(0, len(cells), size)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for _ in pool.map(_run_batch, batches):
+                    pass
+    except BaseException:
+        res.close()
+        raise
+    return res
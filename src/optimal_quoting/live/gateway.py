@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Protocol
+
+from optimal_quoting.sim.lob import ASK, BID
+
+SIDES = (BID, ASK)
+
+
+@dataclass(frozen=True)
+class Tick:
+    """
+    Market-data update. `recv_ns` is the local receive time
+    (time.perf_counter_ns), the start of the tick-to-quote latency.
+    """
+
+    seq: int
+    t: float          # exchange time (s)
+    mid: float
+    recv_ns: int
+
+
+@dataclass(frozen=True)
+class Fill:
+    side: int         # BID (we bought) | ASK (we sold)
+    price: float
+    size: float
+    fee: float        # currency paid on this fill
+    t: float
+
+
+class Gateway(Protocol):
+    """
+    Order entry: one resting quote per side, amended in place.
+
+    `replace` moves (or places) the quote on a side, `cancel` pulls it.
+    Fills come back through the callback the gateway was built with.
+    """
+
+    async def replace(self, side: int, price: float, size: float) -> None: ...
+
+    async def cancel(self, side: int) -> None: ...
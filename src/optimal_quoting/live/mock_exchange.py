@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+import math
+import time
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from optimal_quoting.live.gateway import ASK, BID, Fill, Tick
+
+if TYPE_CHECKING:
+    from optimal_quoting.backtest.engine import MMParams
+
+
+@dataclass(frozen=True)
+class MockExchangeConfig:
+    """
+    Local exchange stand-in: a Gaussian random-walk mid and fills drawn from
+    the toy intensity model, as in the backtest engine. A quote resting at
+    distance δ from the mid over one step of length dt fills with
+        P(fill) = 1 - exp(-A exp(-k δ) dt),
+    a fill takes the whole quote, and a quote through the mid counts as δ = 0.
+    """
+
+    dt: float
+    mid0: float
+    sigma: float              # per-step stdev of the mid
+    A: float
+    k: float
+    fee_bps: float = 0.0
+    seed: int = 0
+    block: int = 4096         # steps of shocks / uniforms drawn per RNG call
+    yield_every: int = 256    # ticks between yields to the event loop
+
+    def __post_init__(self) -> None:
+        if self.dt <= 0:
+            raise ValueError("dt must be > 0")
+        if self.sigma < 0:
+            raise ValueError("sigma must be >= 0")
+        if self.A <= 0 or self.k <= 0:
+            raise ValueError("A and k must be > 0")
+        if self.block < 1 or self.yield_every < 1:
+            raise ValueError("block and yield_every must be >= 1")
+
+    @classmethod
+    def from_params(cls, p: MMParams) -> MockExchangeConfig:
+        return cls(dt=p.dt, mid0=p.mid0, sigma=p.sigma, A=p.A, k=p.k, fee_bps=p.fee_bps, seed=p.seed)
+
+
+class MockExchange:
+    """
+    In-process Gateway plus market-data feed.
+
+    `feed(n_ticks)` publishes the mid one step at a time; before each new
+    tick, the quotes that rested over the previous step are matched and the
+    fills are passed to `on_fill` (synchronously, so the quoting side sees
+    them before the next tick).
+    """
+
+    def __init__(self, cfg: MockExchangeConfig, on_fill: Callable[[Fill], None] | None = None) -> None:
+        self.cfg = cfg
+        self.on_fill = on_fill
+        self.mid = cfg.mid0
+        self.price = [math.nan, math.nan]    # resting price per side (nan: none)
+        self.size = [0.0, 0.0]
+        self.n_replace = 0
+        self.n_cancel = 0
+        self.n_fills = 0
+
+    @property
+    def n_messages(self) -> int:
+        return self.n_replace + self.n_cancel
+
+    async def replace(self, side: int, price: float, size: float) -> None:
+        if size <= 0:
+            raise ValueError("size must be > 0")
+        self.price[side] = price
+        self.size[side] = size
+        self.n_replace += 1
+
+    async def cancel(self, side: int) -> None:
+        self.price[side] = math.nan
+        self.size[side] = 0.0
+        self.n_cancel += 1
+
+    def _match(self, u_bid: float, u_ask: float, t: float) -> None:
+        c = self.cfg
+        for side, u in ((BID, u_bid), (ASK, u_ask)):
+            size = self.size[side]
+            if size <= 0.0:
+                continue
+            price = self.price[side]
+            delta = max(0.0, self.mid - price if side == BID else price - self.mid)
+            if u >= -math.expm1(-c.A * math.exp(-c.k * delta) * c.dt):
+                continue
+            self.price[side] = math.nan
+            self.size[side] = 0.0
+            self.n_fills += 1
+            if self.on_fill is not None:
+                self.on_fill(Fill(side=side, price=price, size=size, fee=c.fee_bps * 1e-4 * price * size, t=t))
+
+    async def feed(self, n_ticks: int) -> AsyncIterator[Tick]:
+        if n_ticks < 1:
+            raise ValueError("n_ticks must be >= 1")
+        c = self.cfg
+        rng = np.random.default_rng(c.seed)
+        for b0 in range(0, n_ticks, c.block):
+            b1 = min(n_ticks, b0 + c.block)
+            shocks = rng.normal(0.0, c.sigma, b1 - b0)
+            u = rng.random((b1 - b0, 2))
+            for i, t in enumerate(range(b0, b1)):
+                if t > 0:
+                    self._match(u[i, 0], u[i, 1], t * c.dt)
+                    self.mid = max(0.01, self.mid + float(shocks[i]))
+                if t % c.yield_every == 0:
+                    await asyncio.sleep(0)
+                yield Tick(seq=t, t=t * c.dt, mid=self.mid, recv_ns=time.perf_counter_ns())
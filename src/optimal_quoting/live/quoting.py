@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterable, Callable, Sequence
+from dataclasses import dataclass
+import math
+import time
+
+import numpy as np
+
+from optimal_quoting.backtest.engine import MMParams, policy_quotes
+from optimal_quoting.live.gateway import ASK, BID, Fill, Gateway, Tick
+from optimal_quoting.live.mock_exchange import MockExchange, MockExchangeConfig
+from optimal_quoting.sim.rng import seed_sequence
+from optimal_quoting.strategy.quote_manager import CANCEL, REPLACE, QuoteManager, QuoteManagerConfig
+from optimal_quoting.strategy.quotes import (
+    Quotes,
+    inventory_limit_sides,
+    snap_quotes_to_ticks,
+    suppress_sides,
+)
+
+# (mid, inventory, t) -> quotes
+Quoter = Callable[[float, float, float], Quotes]
+
+
+def policy_quoter(p: MMParams) -> Quoter:
+    """The backtest policy of `p` (baseline / probing / AS) as a live quoter."""
+    rng = np.random.default_rng(seed_sequence(p.seed, p.spawn_key))   # probing draws
+
+    def quoter(mid: float, q: float, t: float) -> Quotes:
+        return policy_quotes(p, mid, q, t, rng)
+
+    return quoter
+
+
+class LatencyRecorder:
+    """Latency samples (ns) in a growable int64 buffer; percentiles in µs."""
+
+    def __init__(self, capacity: int = 1 << 16) -> None:
+        self._ns = np.empty(max(1, capacity), dtype=np.int64)
+        self.n = 0
+
+    def record(self, ns: int) -> None:
+        if self.n == len(self._ns):
+            self._ns = np.concatenate([self._ns, np.empty_like(self._ns)])
+        self._ns[self.n] = ns
+        self.n += 1
+
+    def percentiles(self, qs: Sequence[float] = (50.0, 90.0, 99.0, 99.9)) -> dict[str, float]:
+        if self.n == 0:
+            return {f"p{q:g}": math.nan for q in qs}
+        vals = np.percentile(self._ns[: self.n], qs) * 1e-3
+        return {f"p{q:g}": float(v) for q, v in zip(qs, vals)}
+
+
+@dataclass(frozen=True)
+class LiveStats:
+    ticks: int
+    fills: int
+    messages: int              # replace + cancel sent
+    suppressed: int            # updates within tolerance (resting quote kept)
+    throttled: int             # updates dropped by the message-rate limit
+    messages_per_fill: float
+    inventory: float
+    cash: float
+    equity: float              # cash + inventory * last mid
+    elapsed_s: float
+    updates_per_s: float
+    latency_us: dict[str, float]   # tick-to-quote percentiles
+
+
+class QuotingService:
+    """
+    Asyncio quoting loop: on every market-data tick, recompute the quotes
+    for the current inventory and pass them through a QuoteManager, which
+    decides what reaches the gateway (a replace when a side moved enough and
+    the rate limit allows it, a cancel when a resting side is pulled).
+
+    Tick-to-quote latency is measured from `Tick.recv_ns` to the return of
+    the last gateway call for that tick. Fills must be routed to `on_fill`.
+    """
+
+    def __init__(
+        self,
+        gateway: Gateway,
+        quoter: Quoter,
+        order_size: float,
+        inv_limit: float | None = None,
+        tick_size: float = 0.0,
+        manager: QuoteManager | None = None,
+    ) -> None:
+        if order_size <= 0:
+            raise ValueError("order_size must be > 0")
+        self.gateway = gateway
+        self.quoter = quoter
+        self.order_size = order_size
+        self.tick_size = tick_size
+        self.manager = manager if manager is not None else QuoteManager(QuoteManagerConfig(tick_size=tick_size))
+        self._max_lots = None if inv_limit is None else math.floor(inv_limit / order_size + 1e-9)
+
+        self.inventory = 0.0
+        self.cash = 0.0
+        self.n_ticks = 0
+        self.n_fills = 0
+        self.last_mid = math.nan
+        self.latency = LatencyRecorder()
+
+    def on_fill(self, fill: Fill) -> None:
+        signed = fill.size if fill.side == BID else -fill.size
+        self.inventory += signed
+        self.cash -= signed * fill.price + fill.fee
+        self.manager.on_fill(fill.side)
+        self.n_fills += 1
+
+    async def _send(self, side: int, price: float | None, t: float) -> None:
+        action = self.manager.update(side, price, t)
+        if action == REPLACE:
+            await self.gateway.replace(side, price, self.order_size)
+        elif action == CANCEL:
+            await self.gateway.cancel(side)
+
+    async def on_tick(self, tick: Tick) -> None:
+        quotes = self.quoter(tick.mid, self.inventory, tick.t)
+        q_lots = round(self.inventory / self.order_size)
+        quote_bid, quote_ask = inventory_limit_sides(q_lots, self._max_lots)
+        quotes = suppress_sides(quotes, bid=quote_bid, ask=quote_ask)
+        if self.tick_size > 0:
+            quotes, _, _ = snap_quotes_to_ticks(quotes, tick.mid, self.tick_size)
+
+        await self._send(BID, quotes.bid, tick.t)
+        await self._send(ASK, quotes.ask, tick.t)
+        self.latency.record(time.perf_counter_ns() - tick.recv_ns)
+        self.last_mid = tick.mid
+        self.n_ticks += 1
+
+    def stats(self, elapsed_s: float) -> LiveStats:
+        qm = self.manager
+        return LiveStats(
+            ticks=self.n_ticks,
+            fills=self.n_fills,
+            messages=qm.n_messages,
+            suppressed=qm.n_suppressed,
+            throttled=qm.n_throttled,
+            messages_per_fill=qm.n_messages / self.n_fills if self.n_fills else math.nan,
+            inventory=self.inventory,
+            cash=self.cash,
+            equity=self.cash + self.inventory * self.last_mid,
+            elapsed_s=elapsed_s,
+            updates_per_s=self.n_ticks / elapsed_s if elapsed_s > 0 else math.nan,
+            latency_us=self.latency.percentiles(),
+        )
+
+    async def run(self, feed: AsyncIterable[Tick]) -> LiveStats:
+        t0 = time.perf_counter()
+        async for tick in feed:
+            await self.on_tick(tick)
+        return self.stats(time.perf_counter() - t0)
+
+
+def run_mock_session(p: MMParams, n_ticks: int | None = None) -> LiveStats:
+    """
+    Quote the policy of `p` against a MockExchange built from the same
+    params, for n_ticks steps (default: the backtest horizon, T / dt + 1).
+    Amendment tolerance and rate limit come from the quote_* fields.
+    """
+    n = int(p.T / p.dt) + 1 if n_ticks is None else n_ticks
+    if p.policy == "as" and (n - 1) * p.dt > p.T:
+        raise ValueError("policy 'as' needs (n_ticks - 1) * dt <= T")
+
+    exchange = MockExchange(MockExchangeConfig.from_params(p))
+    service = QuotingService(
+        exchange,
+        policy_quoter(p),
+        p.order_size,
+        inv_limit=p.inv_limit,
+        tick_size=p.tick_size,
+        manager=QuoteManager(QuoteManagerConfig.from_params(p)),
+    )
+    exchange.on_fill = service.on_fill
+    return asyncio.run(service.run(exchange.feed(n)))
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass(frozen=True)
+class IntradayRiskConfig:
+    """
+    Rolling risk metrics computed while the backtest runs.
+
+    window         : rolling window length (steps) for sharpe / drawdown / VaR
+    snapshot_every : emit a RiskSnapshot every N steps (0 disables snapshots)
+    var_level      : confidence level of the historical VaR of PnL increments
+    inv_limit      : |inventory| level counted as "at limit" (None disables)
+
+    Risk limits (None disables); a breach stops the run early:
+    max_drawdown   : rolling drawdown below -max_drawdown
+    max_abs_inventory : |inventory| above this level
+    max_var        : VaR (checked at snapshot times) above this level
+    """
+
+    window: int = 1000
+    snapshot_every: int = 1000
+    var_level: float = 0.99
+    inv_limit: float | None = None
+    max_drawdown: float | None = None
+    max_abs_inventory: float | None = None
+    max_var: float | None = None
+
+
+@dataclass(frozen=True)
+class RiskSnapshot:
+    step: int
+    time_s: float
+    equity: float
+    inventory: float
+    rolling_sharpe: float
+    rolling_drawdown: float
+    rolling_range: float       # rolling max - rolling min of equity
+    var: float                 # historical VaR of PnL increments (positive = loss)
+    frac_at_inv_limit: float   # fraction of steps so far with |q| >= inv_limit
+
+
+class RollingMoments:
+    """
+    Fixed-size ring buffer with O(1) rolling mean / std.
+
+    Running sums are rebuilt from the buffer once per wrap-around to keep the
+    floating-point drift of add/subtract updates bounded (amortized O(1)).
+    """
+
+    def __init__(self, window: int) -> None:
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = int(window)
+        self.buf = np.zeros(self.window, dtype=float)
+        self.count = 0
+        self._pos = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    def push(self, x: float) -> None:
+        if self.count == self.window:
+            old = self.buf[self._pos]
+            self._sum -= old
+            self._sumsq -= old * old
+        else:
+            self.count += 1
+        self.buf[self._pos] = x
+        self._sum += x
+        self._sumsq += x * x
+        self._pos += 1
+        if self._pos == self.window:
+            self._pos = 0
+            self._sum = float(self.buf.sum())
+            self._sumsq = float(np.dot(self.buf, self.buf))
+
+    def values(self) -> np.ndarray:
+        return self.buf[: self.count] if self.count < self.window else self.buf
+
+    def mean(self) -> float:
+        return self._sum / self.count if self.count else 0.0
+
+    def std(self) -> float:
+        if self.count == 0:
+            return 0.0
+        mu = self._sum / self.count
+        return math.sqrt(max(self._sumsq / self.count - mu * mu, 0.0))
+
+
+class MonotonicWindow:
+    """
+    Rolling max (or min) over the last `window` pushes with a monotonic deque.
+    Each value enters and leaves the deque once: O(1) amortized per push.
+    """
+
+    def __init__(self, window: int, mode: str = "max") -> None:
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        if mode not in ("max", "min"):
+            raise ValueError("mode must be 'max' or 'min'")
+        self.window = int(window)
+        self._sign = 1.0 if mode == "max" else -1.0
+        self._dq: deque[tuple[int, float]] = deque()
+        self._i = 0
+
+    def push(self, x: float) -> float:
+        """Add x and return the current rolling extreme."""
+        v = self._sign * x
+        dq = self._dq
+        while dq and dq[-1][1] <= v:
+            dq.pop()
+        dq.append((self._i, v))
+        if dq[0][0] <= self._i - self.window:
+            dq.popleft()
+        self._i += 1
+        return self._sign * dq[0][1]
+
+
+class IntradayRiskMonitor:
+    """
+    Incremental risk monitor plugged into the engine step loop.
+
+    Usage:
+        mon = IntradayRiskMonitor(IntradayRiskConfig(window=600, max_drawdown=5.0))
+        df = run_mm_toy(p, monitor=mon)     # stops early on breach
+        mon.snapshot_frame()
+
+    `update` is O(1) per step; VaR (a quantile over the window) is only
+    evaluated when a snapshot is emitted.
+    """
+
+    def __init__(self, cfg: IntradayRiskConfig) -> None:
+        if not (0.0 < cfg.var_level < 1.0):
+            raise ValueError("var_level must be in (0, 1)")
+        if cfg.snapshot_every < 0:
+            raise ValueError("snapshot_every must be >= 0")
+        self.cfg = cfg
+        self.returns = RollingMoments(cfg.window)
+        self.eq_max = MonotonicWindow(cfg.window, mode="max")
+        self.eq_min = MonotonicWindow(cfg.window, mode="min")
+        self.snapshots: list[RiskSnapshot] = []
+        self.breached = False
+        self.breach_reason: str | None = None
+        self.steps = 0
+        self.steps_at_limit = 0
+        self._last_equity: float | None = None
+        self._drawdown = 0.0
+        self._range = 0.0
+
+    def update(self, time_s: float, equity: float, inventory: float) -> bool:
+        """
+        Feed one step. Returns True if a risk limit is breached (stop the run).
+        """
+        cfg = self.cfg
+        if self._last_equity is not None:
+            self.returns.push(equity - self._last_equity)
+        self._last_equity = equity
+
+        hi = self.eq_max.push(equity)
+        lo = self.eq_min.push(equity)
+        self._drawdown = equity - hi
+        self._range = hi - lo
+
+        if cfg.inv_limit is not None and abs(inventory) >= cfg.inv_limit:
+            self.steps_at_limit += 1
+        self.steps += 1
+
+        snap = None
+        if cfg.snapshot_every and self.steps % cfg.snapshot_every == 0:
+            snap = self.snapshot(time_s, equity, inventory)
+            self.snapshots.append(snap)
+
+        if cfg.max_drawdown is not None and -self._drawdown > cfg.max_drawdown:
+            return self._breach("max_drawdown")
+        if cfg.max_abs_inventory is not None and abs(inventory) > cfg.max_abs_inventory:
+            return self._breach("max_abs_inventory")
+        if cfg.max_var is not None and snap is not None and snap.var > cfg.max_var:
+            return self._breach("max_var")
+        return False
+
+    def _breach(self, reason: str) -> bool:
+        self.breached = True
+        self.breach_reason = reason
+        return True
+
+    def var(self) -> float:
+        """Historical VaR of PnL increments over the window (positive = loss)."""
+        if self.returns.count == 0:
+            return 0.0
+        return float(-np.quantile(self.returns.values(), 1.0 - self.cfg.var_level))
+
+    def snapshot(self, time_s: float, equity: float, inventory: float) -> RiskSnapshot:
+        sig = self.returns.std()
+        return RiskSnapshot(
+            step=self.steps - 1,
+            time_s=float(time_s),
+            equity=float(equity),
+            inventory=float(inventory),
+            rolling_sharpe=self.returns.mean() / sig if sig > 1e-12 else 0.0,
+            rolling_drawdown=float(self._drawdown),
+            rolling_range=float(self._range),
+            var=self.var(),
+            frac_at_inv_limit=self.steps_at_limit / self.steps,
+        )
+
+    def snapshot_frame(self) -> pd.DataFrame:
+        import pandas as pd
+
+        return pd.DataFrame([s.__dict__ for s in self.snapshots])
@@ -1,7 +1,16 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 import numpy as np
-import pandas as pd
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# keys of performance_summary_batch, in order
+PERFORMANCE_METRICS = (
+    "pnl_final", "pnl_mean", "pnl_std", "sharpe", "max_drawdown", "inv_mean", "inv_std", "inv_max_abs",
+)
 
 
 def pnl_series(df: pd.DataFrame) -> np.ndarray:
@@ -26,6 +35,14 @@ def max_drawdown(equity: np.ndarray) -> float:
     return float(np.min(dd))
 
 
+def messages_per_fill(messages: np.ndarray, fill_bid: np.ndarray, fill_ask: np.ndarray) -> float:
+    """Order messages sent per fill over a run (NaN without fills)."""
+    fills = int(np.sum(fill_bid)) + int(np.sum(fill_ask))
+    if fills == 0:
+        return float("nan")
+    return float(np.sum(messages)) / fills
+
+
 def inventory_stats(df: pd.DataFrame) -> dict[str, float]:
     q = df["inventory"].values
     return {
@@ -36,15 +53,47 @@ def inventory_stats(df: pd.DataFrame) -> dict[str, float]:
 
 
 def performance_summary(df: pd.DataFrame) -> dict[str, float]:
-    equity = pnl_series(df)
-    rets = returns_from_equity(equity)
-
-    out = {
-        "pnl_final": float(equity[-1]),
-        "pnl_mean": float(np.mean(rets)),
-        "pnl_std": float(np.std(rets)),
-        "sharpe": sharpe_ratio(rets),
-        "max_drawdown": max_drawdown(equity),
+    stats = performance_summary_batch(pnl_series(df), df["inventory"].values)
+    return {key: float(val[0]) for key, val in stats.items()}
+
+
+def performance_summary_batch(
+    equity: np.ndarray,
+    inventory: np.ndarray,
+    eps: float = 1e-12,
+) -> dict[str, np.ndarray]:
+    """
+    Same statistics as `performance_summary`, for many runs at once.
+
+    Parameters
+    ----------
+    equity, inventory : array, shape (runs, steps)
+        one row per run (a 1D array is treated as a single run)
+
+    Returns
+    -------
+    dict of arrays of shape (runs,), keyed like `performance_summary`.
+    """
+    equity = np.atleast_2d(np.asarray(equity, dtype=float))
+    inventory = np.atleast_2d(np.asarray(inventory, dtype=float))
+    if equity.shape != inventory.shape:
+        raise ValueError("equity and inventory must have the same shape (runs, steps)")
+    if equity.shape[1] < 2:
+        raise ValueError("Need at least 2 steps per run")
+
+    rets = np.diff(equity, axis=1)
+    mu = rets.mean(axis=1)
+    sig = rets.std(axis=1)
+    sharpe = np.divide(mu, sig, out=np.zeros_like(mu), where=sig >= eps)
+    max_dd = (equity - np.maximum.accumulate(equity, axis=1)).min(axis=1)
+
+    return {
+        "pnl_final": equity[:, -1].copy(),
+        "pnl_mean": mu,
+        "pnl_std": sig,
+        "sharpe": sharpe,
+        "max_drawdown": max_dd,
+        "inv_mean": inventory.mean(axis=1),
+        "inv_std": inventory.std(axis=1),
+        "inv_max_abs": np.abs(inventory).max(axis=1),
     }
-    out.update(inventory_stats(df))
-    return out
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+
+def inventory_pnl_control(inventory: np.ndarray, mid: np.ndarray) -> np.ndarray:
+    """
+    Mark-to-market PnL of the inventory, used as a control variate:
+        X = Σ_t q_{t-1} (mid_t - mid_{t-1})
+
+    For a driftless mid (the toy simulator, away from the 0.01 floor) and a
+    policy that does not anticipate the next shock, E[X] = 0, while X carries
+    most of the variance of the final PnL.
+
+    inventory, mid : array, shape (steps,) or (runs, steps)
+    Returns an array of shape (runs,) (or a 0-d array for 1D inputs).
+    """
+    inventory = np.asarray(inventory, dtype=float)
+    mid = np.asarray(mid, dtype=float)
+    if inventory.shape != mid.shape:
+        raise ValueError("inventory and mid must have the same shape")
+    return np.sum(inventory[..., :-1] * np.diff(mid, axis=-1), axis=-1)
+
+
+def control_variate_adjust(
+    y: np.ndarray,
+    x: np.ndarray,
+    mu_x: float = 0.0,
+) -> tuple[np.ndarray, float]:
+    """
+    Control-variate estimator:
+        y_cv = y - beta (x - mu_x),   beta = cov(y, x) / var(x)
+
+    y_cv has the same mean as y and variance (1 - corr(y, x)^2) var(y).
+    Returns (y_cv, beta).
+    """
+    y = np.asarray(y, dtype=float)
+    x = np.asarray(x, dtype=float)
+    if y.shape != x.shape or y.ndim != 1:
+        raise ValueError("y and x must be 1D arrays with same length")
+    if len(y) < 2:
+        raise ValueError("Need at least 2 samples")
+
+    var_x = float(np.var(x, ddof=1))
+    beta = float(np.cov(y, x, ddof=1)[0, 1] / var_x) if var_x > 0 else 0.0
+    return y - beta * (x - mu_x), beta
+
+
+def antithetic_average(y: np.ndarray, y_anti: np.ndarray) -> np.ndarray:
+    """Average of each run with its antithetic twin (mid shocks flipped)."""
+    y = np.asarray(y, dtype=float)
+    y_anti = np.asarray(y_anti, dtype=float)
+    if y.shape != y_anti.shape:
+        raise ValueError("y and y_anti must have the same shape")
+    return 0.5 * (y + y_anti)
+
+
+def paired_difference(y_a: np.ndarray, y_b: np.ndarray) -> tuple[float, float]:
+    """
+    Mean and standard error of y_a - y_b for runs paired by seed.
+
+    With common random numbers the pairs are positively correlated and the
+    standard error is much smaller than for independent samples.
+    """
+    d = np.asarray(y_a, dtype=float) - np.asarray(y_b, dtype=float)
+    if d.ndim != 1 or len(d) < 2:
+        raise ValueError("Need at least 2 paired samples")
+    return float(np.mean(d)), float(np.std(d, ddof=1) / math.sqrt(len(d)))
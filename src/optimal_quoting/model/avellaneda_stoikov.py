@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 import math
 
+import numpy as np
+
 
 @dataclass(frozen=True)
 class ASParams:
@@ -26,6 +28,17 @@ class ASParams:
     T: float         # horizon in seconds
 
 
+def _check_params(p: ASParams, gamma: np.ndarray | None = None) -> None:
+    if (p.gamma if gamma is None else np.min(gamma, initial=np.inf)) <= 0:
+        raise ValueError("gamma must be > 0")
+    if p.sigma < 0:
+        raise ValueError("sigma must be >= 0")
+    if p.k <= 0:
+        raise ValueError("k must be > 0")
+    if p.T <= 0:
+        raise ValueError("T must be > 0")
+
+
 def as_deltas(q: float, t: float, p: ASParams) -> tuple[float, float]:
     """
     Returns (delta_bid, delta_ask) for inventory q at time t.
@@ -34,14 +47,7 @@ def as_deltas(q: float, t: float, p: ASParams) -> tuple[float, float]:
     - deltas are clipped to be >= 0
     - t in [0, T]
     """
-    if p.gamma <= 0:
-        raise ValueError("gamma must be > 0")
-    if p.sigma < 0:
-        raise ValueError("sigma must be >= 0")
-    if p.k <= 0:
-        raise ValueError("k must be > 0")
-    if p.T <= 0:
-        raise ValueError("T must be > 0")
+    _check_params(p)
     if t < 0 or t > p.T:
         raise ValueError("t must be in [0, T]")
 
@@ -63,3 +69,205 @@ def as_quotes(mid: float, q: float, t: float, p: ASParams) -> tuple[float, float
     bid = mid - d_bid
     ask = mid + d_ask
     return bid, ask, d_bid, d_ask
+
+
+# ---------------------------------------------------------------------
+# Vectorized quotes
+# ---------------------------------------------------------------------
+
+def as_deltas_grid(
+    q: np.ndarray, t: np.ndarray, p: ASParams, gamma: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    as_deltas over arrays: q, t and gamma (overrides p.gamma) broadcast
+    against each other, e.g. q[:, None] and t[None, :] for an inventory x
+    time grid. Same formula and clipping as the scalar version.
+    """
+    _check_params(p, gamma)
+    t = np.asarray(t, dtype=float)
+    if t.size and (t.min() < 0 or t.max() > p.T):
+        raise ValueError("t must be in [0, T]")
+    g = p.gamma if gamma is None else np.asarray(gamma, dtype=float)
+
+    tau = p.T - t
+    base = 1.0 / p.k
+    skew = 0.5 * g * (p.sigma ** 2) * tau * np.asarray(q, dtype=float)
+    return np.maximum(0.0, base - skew), np.maximum(0.0, base + skew)
+
+
+def as_quotes_grid(
+    mid: np.ndarray, q: np.ndarray, t: np.ndarray, p: ASParams, gamma: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns (bid, ask, delta_bid, delta_ask) arrays, see as_deltas_grid.
+    """
+    d_bid, d_ask = as_deltas_grid(q, t, p, gamma)
+    mid = np.asarray(mid, dtype=float)
+    return mid - d_bid, mid + d_ask, d_bid, d_ask
+
+
+# ---------------------------------------------------------------------
+# Analytics under λ(δ) = A exp(-k δ)
+# ---------------------------------------------------------------------
+
+def as_fill_rates(
+    q: np.ndarray, t: np.ndarray, A: float, p: ASParams, gamma: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (λ_bid, λ_ask): fill intensities (per second) of the AS quotes,
+        λ_side = A exp(-k δ_side(q, t)).
+    """
+    if A <= 0:
+        raise ValueError("A must be > 0")
+    d_bid, d_ask = as_deltas_grid(q, t, p, gamma)
+    return A * np.exp(-p.k * d_bid), A * np.exp(-p.k * d_ask)
+
+
+def as_spread_capture(
+    q: np.ndarray, t: np.ndarray, A: float, p: ASParams, gamma: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Expected spread captured per second and unit size at (q, t):
+        λ_bid δ_bid + λ_ask δ_ask.
+    At q = 0 (or t = T) both deltas are 1/k, i.e. 2 A / (e k).
+    """
+    d_bid, d_ask = as_deltas_grid(q, t, p, gamma)
+    return A * (d_bid * np.exp(-p.k * d_bid) + d_ask * np.exp(-p.k * d_ask))
+
+
+def birth_death_stationary(up: np.ndarray, down: np.ndarray) -> np.ndarray:
+    """
+    Stationary distribution of a birth–death chain on states 0..J-1 (last
+    axis; leading axes are independent chains):
+        up[..., j]   = P(j -> j+1),   down[..., j] = P(j -> j-1).
+    Detailed balance gives
+        π_{j+1} / π_j = up_j / down_{j+1},
+    accumulated in log space. up[..., -1] and down[..., 0] are not used;
+    the other entries must be > 0 (irreducible chain).
+    """
+    up = np.asarray(up, dtype=float)
+    down = np.asarray(down, dtype=float)
+    if up.shape != down.shape or up.shape[-1] < 1:
+        raise ValueError("up and down must have the same non-empty shape")
+    if (up[..., :-1] <= 0).any() or (down[..., 1:] <= 0).any():
+        raise ValueError("inner transition probabilities must be > 0")
+
+    log_r = np.log(up[..., :-1]) - np.log(down[..., 1:])
+    log_pi = np.concatenate([np.zeros(up.shape[:-1] + (1,)), np.cumsum(log_r, axis=-1)], axis=-1)
+    pi = np.exp(log_pi - log_pi.max(axis=-1, keepdims=True))
+    return pi / pi.sum(axis=-1, keepdims=True)
+
+
+@dataclass(frozen=True)
+class ASExpectations:
+    """
+    Horizon expectations of the AS policy (see as_expectations). Every field
+    has the shape of the `gamma` argument (scalar: shape ()).
+    """
+
+    gamma: np.ndarray
+    fill_rate_bid: np.ndarray     # fills per second (time average)
+    fill_rate_ask: np.ndarray
+    spread_capture: np.ndarray    # E[spread captured] per second, in currency
+    inventory_mean: np.ndarray    # time average of E[q_t]
+    inventory_var: np.ndarray     # time average of Var[q_t]
+    expected_pnl: np.ndarray      # E[equity_T]: spread capture over [0, T] minus fees
+    pnl_std: np.ndarray           # sqrt(mark-to-market + spread-capture variance)
+
+
+def as_expectations(
+    p: ASParams,
+    A: float,
+    dt: float,
+    order_size: float,
+    max_lots: int,
+    gamma: np.ndarray | float | None = None,
+    fee_bps: float = 0.0,
+    mid0: float | None = None,
+    n_nodes: int = 32,
+) -> ASExpectations:
+    """
+    Expected fills, spread capture, inventory moments and PnL of AS quoting
+    over [0, T], without simulating, for one gamma or a whole array of them.
+
+    Model (the toy backtest with policy "as"): inventory is a count of
+    `order_size` lots in [-max_lots, max_lots] (max_lots = the engine's
+    floor(inv_limit / order_size)); each step of `dt`, the bid fills with
+    probability p_b = 1 - exp(-λ_bid dt) and the ask with p_a, independently,
+    and the side at the limit is not quoted. Inventory is then a birth–death
+    chain with
+        up = p_b (1 - p_a),   down = p_a (1 - p_b).
+
+    The quotes drift with τ = T - t, so expectations use the chain's
+    stationary distribution π_t at the current quotes (birth_death_stationary;
+    quasi-stationary, accurate when inventory mixes quickly relative to T)
+    and integrate over t with n_nodes-point Gauss–Legendre quadrature.
+
+    Since the mid is a martingale independent of fills (no adverse
+    selection), the expected final equity is the spread captured net of
+    fees (charged on mid0 ∓ δ). Its variance is the mark-to-market part
+    Σ_steps σ² E[q_t²] (sigma per step, as in the engine) plus the spread
+    part Σ_steps E[p_b (1 - p_b) δ_b² + p_a (1 - p_a) δ_a²] size², fills
+    being treated as independent across steps.
+
+    All gammas, nodes and inventory states are evaluated as one broadcast
+    array of shape (G, n_nodes, 2 max_lots + 1): screening a gamma grid takes
+    milliseconds.
+    """
+    if A <= 0:
+        raise ValueError("A must be > 0")
+    if dt <= 0:
+        raise ValueError("dt must be > 0")
+    if order_size <= 0:
+        raise ValueError("order_size must be > 0")
+    if max_lots < 1:
+        raise ValueError("max_lots must be >= 1")
+    if n_nodes < 1:
+        raise ValueError("n_nodes must be >= 1")
+    if fee_bps != 0.0 and mid0 is None:
+        raise ValueError("fees need mid0")
+
+    g = np.asarray(p.gamma if gamma is None else gamma, dtype=float)
+    x, wq = np.polynomial.legendre.leggauss(n_nodes)
+    t = 0.5 * p.T * (x + 1.0)
+    w = 0.5 * p.T * wq                                     # Σ w = T
+    lots = np.arange(-max_lots, max_lots + 1)
+    q = lots * order_size
+
+    d_bid, d_ask = as_deltas_grid(
+        q[None, None, :], t[None, :, None], p, g.reshape(-1, 1, 1)
+    )                                                      # (G, N, J)
+    p_bid = -np.expm1(-A * np.exp(-p.k * d_bid) * dt)
+    p_ask = -np.expm1(-A * np.exp(-p.k * d_ask) * dt)
+    p_bid[..., -1] = 0.0                                   # long limit: no bid
+    p_ask[..., 0] = 0.0                                    # short limit: no ask
+
+    pi = birth_death_stationary(p_bid * (1.0 - p_ask), p_ask * (1.0 - p_bid))
+
+    def time_avg(per_node: np.ndarray) -> np.ndarray:
+        return (per_node @ w / p.T).reshape(g.shape)
+
+    rate_bid = (pi * p_bid).sum(axis=-1) / dt              # (G, N)
+    rate_ask = (pi * p_ask).sum(axis=-1) / dt
+    capture = order_size * (pi * (p_bid * d_bid + p_ask * d_ask)).sum(axis=-1) / dt
+    m1 = pi @ q
+    m2 = pi @ (q * q)
+    var_step = p.sigma ** 2 * m2 + order_size ** 2 * (
+        pi * (p_bid * (1.0 - p_bid) * d_bid ** 2 + p_ask * (1.0 - p_ask) * d_ask ** 2)
+    ).sum(axis=-1)
+
+    fees = np.zeros_like(capture)
+    if fee_bps != 0.0:
+        px = p_bid * (mid0 - d_bid) + p_ask * (mid0 + d_ask)
+        fees = fee_bps * 1e-4 * order_size * (pi * px).sum(axis=-1) / dt
+
+    return ASExpectations(
+        gamma=g,
+        fill_rate_bid=time_avg(rate_bid),
+        fill_rate_ask=time_avg(rate_ask),
+        spread_capture=time_avg(capture),
+        inventory_mean=time_avg(m1),
+        inventory_var=time_avg(m2 - m1 * m1),
+        expected_pnl=((capture - fees) @ w).reshape(g.shape),
+        pnl_std=np.sqrt(var_step @ w / dt).reshape(g.shape),
+    )
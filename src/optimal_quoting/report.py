@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+import dis
+import hashlib
+import html
+import importlib
+import inspect
+import json
+from pathlib import Path
+from types import CodeType
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+REPORTS = Path("reports")
+MANIFEST = "report_manifest.json"
+
+
+# ---------------------------------------------------------------------
+# Figure registry: each figure is a pure function of its result tables
+# ---------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class FigureSpec:
+    name: str                     # output file: <reports>/figures/<name>.png
+    tables: tuple[str, ...]       # input CSVs, relative to the reports directory
+    title: str
+    render: Callable[[list[pd.DataFrame], Path], None]
+
+
+FIGURES: dict[str, FigureSpec] = {}
+
+
+def figure(name: str, tables: Sequence[str], title: str):
+    """Register `render(tables, out_path)` as the figure `name`."""
+
+    def register(fn: Callable[[list[pd.DataFrame], Path], None]):
+        FIGURES[name] = FigureSpec(name=name, tables=tuple(tables), title=title, render=fn)
+        return fn
+
+    return register
+
+
+def _heatmap_mean(df: pd.DataFrame, value_col: str, title: str, out_path: Path) -> None:
+    """Heatmap over (p_explore, jitter) of mean(value_col) over seeds."""
+    import matplotlib.pyplot as plt
+
+    pivot = df.groupby(["p_explore", "jitter"])[value_col].mean().unstack()
+
+    plt.figure(figsize=(7, 5))
+    im = plt.imshow(pivot.values, origin="lower", aspect="auto", cmap="viridis")
+    plt.colorbar(im, label=f"Mean {value_col}")
+    plt.xticks(range(len(pivot.columns)), [f"{x:.2f}" for x in pivot.columns])
+    plt.yticks(range(len(pivot.index)), [f"{x:.2f}" for x in pivot.index])
+    plt.xlabel("jitter")
+    plt.ylabel("p_explore")
+    plt.title(title)
+    plt.tight_layout()
+    plt.savefig(out_path)
+    plt.close()
+
+
+@figure("frontier_pnl_heatmap", ["frontier_results.csv"], "PnL final (mean over seeds)")
+def _frontier_pnl(tables: list[pd.DataFrame], out: Path) -> None:
+    _heatmap_mean(tables[0], "pnl_final", "PnL final (mean over seeds)", out)
+
+
+@figure("frontier_inv_heatmap", ["frontier_results.csv"], "Max |inventory| (mean over seeds)")
+def _frontier_inv(tables: list[pd.DataFrame], out: Path) -> None:
+    _heatmap_mean(tables[0], "inv_max_abs", "Max |inventory| (mean over seeds)", out)
+
+
+@figure("frontier_kerr_heatmap", ["frontier_results.csv"], "|k_hat - k_true| (mean over seeds)")
+def _frontier_kerr(tables: list[pd.DataFrame], out: Path) -> None:
+    _heatmap_mean(tables[0], "k_abs_error", "|k_hat - k_true| (mean over seeds)", out)
+
+
+@figure("frontier_pnl_vs_kerr", ["frontier_results.csv"], "PnL vs identifiability")
+def _frontier_scatter(tables: list[pd.DataFrame], out: Path) -> None:
+    import matplotlib.pyplot as plt
+
+    agg = tables[0].groupby(["p_explore", "jitter"]).mean(numeric_only=True).reset_index()
+    plt.figure(figsize=(7, 5))
+    plt.scatter(agg["k_abs_error"].values, agg["pnl_final"].values, s=40)
+    plt.xlabel("|k_hat - k_true|")
+    plt.ylabel("PnL final")
+    plt.title("PnL vs Identifiability (mean over seeds)")
+    plt.tight_layout()
+    plt.savefig(out)
+    plt.close()
+
+
+@figure("intensity_fit", ["calibration_fit.csv", "calibration_samples.csv"], "Intensity fit")
+def _intensity_fit(tables: list[pd.DataFrame], out: Path) -> None:
+    import matplotlib.pyplot as plt
+
+    fit, samples = tables[0].iloc[0], tables[1]
+    xs = np.linspace(0.0, float(np.quantile(samples["delta"], 0.995)), 200)
+    plt.figure()
+    plt.plot(xs, fit["A_true"] * np.exp(-fit["k_true"] * xs), label="true")
+    plt.plot(xs, fit["A_hat"] * np.exp(-fit["k_hat"] * xs), label="fitted")
+    plt.title("Intensity fit: λ(δ)=A exp(-kδ)")
+    plt.xlabel("delta")
+    plt.ylabel("lambda")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(out)
+    plt.close()
+
+
+@figure(
+    "intensity_empirical_fit", ["calibration_fit.csv", "calibration_samples.csv"], "Empirical intensity vs fitted"
+)
+def _intensity_empirical(tables: list[pd.DataFrame], out: Path) -> None:
+    import matplotlib.pyplot as plt
+
+    from optimal_quoting.calibration.diagnostics import empirical_intensity_binned
+
+    fit, samples = tables[0].iloc[0], tables[1]
+    emp = empirical_intensity_binned(
+        samples["delta"].to_numpy(), samples["n"].to_numpy(), dt=fit["dt"], nbins=40, dmax_quantile=0.995
+    )
+    plt.figure()
+    plt.plot(emp.bin_centers, emp.lambda_hat, label="empirical (binned)")
+    plt.plot(emp.bin_centers, fit["A_hat"] * np.exp(-fit["k_hat"] * emp.bin_centers), label="fitted")
+    plt.title("Empirical intensity vs fitted")
+    plt.xlabel("delta (bin centers)")
+    plt.ylabel("lambda")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(out)
+    plt.close()
+
+
+@figure("intensity_profile_nll", ["calibration_fit.csv", "calibration_samples.csv"], "Profile NLL(k)")
+def _intensity_profile(tables: list[pd.DataFrame], out: Path) -> None:
+    import matplotlib.pyplot as plt
+
+    from optimal_quoting.calibration.mle import profile_nll_over_k
+
+    fit, samples = tables[0].iloc[0], tables[1]
+    k_grid = np.linspace(0.0, 5.0, 250)
+    _, nlls = profile_nll_over_k(samples["delta"].to_numpy(), samples["n"].to_numpy(), dt=fit["dt"], k_grid=k_grid)
+    plt.figure()
+    plt.plot(k_grid, nlls - np.nanmin(nlls))
+    plt.title("Profile NLL(k) (shifted)")
+    plt.xlabel("k")
+    plt.ylabel("NLL(k) - min")
+    plt.tight_layout()
+    plt.savefig(out)
+    plt.close()
+
+
+@figure("probing_khat_comparison", ["probing_results.csv"], "k_hat: baseline vs probing")
+def _probing_khat(tables: list[pd.DataFrame], out: Path) -> None:
+    import matplotlib.pyplot as plt
+
+    df = tables[0]
+    plt.figure()
+    plt.bar(df["name"], df["k_hat"])
+    plt.axhline(float(df["k_true"].iloc[0]), linestyle="--")
+    plt.title("k_hat: baseline vs probing")
+    plt.ylabel("k_hat")
+    plt.tight_layout()
+    plt.savefig(out)
+    plt.close()
+
+
+# ---------------------------------------------------------------------
+# Incremental build
+# ---------------------------------------------------------------------
+
+def file_hash(path: Path, chunk: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(chunk):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _referenced_functions(code: CodeType, namespace: dict[str, Any]) -> list[Callable]:
+    """
+    Functions a code object refers to: globals it loads (attribute lookups
+    such as plt.figure are not globals) and names it imports inside its body
+    (`from mod import name`), including in nested code (comprehensions).
+    """
+    found = []
+    module = None
+    for ins in dis.get_instructions(code):
+        if ins.opname == "LOAD_GLOBAL":
+            found.append(namespace.get(ins.argval))
+        elif ins.opname == "IMPORT_NAME":
+            module = ins.argval
+        elif ins.opname == "IMPORT_FROM" and module is not None:
+            found.append(getattr(importlib.import_module(module), ins.argval, None))
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            found += _referenced_functions(const, namespace)
+    return [f for f in found if inspect.isfunction(f)]
+
+
+def _render_sources(fn: Callable, seen: set[Callable] | None = None) -> list[str]:
+    """
+    Source of `fn` and of the functions it uses, whether module globals
+    (e.g. _heatmap_mean for the frontier heatmaps) or imported inside the
+    renderer (e.g. profile_nll_over_k); followed recursively through the
+    functions of this package.
+    """
+    seen = set() if seen is None else seen
+    seen.add(fn)
+    sources = [inspect.getsource(fn)]
+    for helper in _referenced_functions(fn.__code__, fn.__globals__):
+        if helper in seen:
+            continue
+        if helper.__module__.startswith("optimal_quoting."):
+            sources += _render_sources(helper, seen)
+        else:
+            seen.add(helper)
+            sources.append(inspect.getsource(helper))
+    return sources
+
+
+def _figure_key(spec: FigureSpec, table_hashes: dict[str, str]) -> str:
+    """Content key of a figure: its input tables and the source of its renderer and helpers."""
+    h = hashlib.sha256(spec.name.encode())
+    for t in spec.tables:
+        h.update(table_hashes[t].encode())
+    for source in _render_sources(spec.render):
+        h.update(source.encode())
+    return h.hexdigest()
+
+
+def _render_one(args: tuple[str, str]) -> str:
+    """Worker entry point: render one registered figure (Agg backend)."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import pandas as pd
+
+    name, root = args
+    spec = FIGURES[name]
+    tables = [pd.read_csv(Path(root) / t) for t in spec.tables]
+    out = Path(root) / "figures" / f"{name}.png"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    spec.render(tables, out)
+    return name
+
+
+@dataclass(frozen=True)
+class ReportBuild:
+    rendered: tuple[str, ...]
+    up_to_date: tuple[str, ...]
+    missing_tables: tuple[str, ...]    # figures skipped: an input table does not exist
+    html: Path | None
+
+
+def build_report(
+    root: str | Path = REPORTS,
+    figures: Iterable[str] | None = None,
+    workers: int = 1,
+    force: bool = False,
+    html_out: str | None = "report.html",
+) -> ReportBuild:
+    """
+    Re-render the figures whose inputs changed, then (optionally) write the
+    HTML report.
+
+    A figure is rebuilt when its PNG is missing or its key changed; the key
+    hashes the content of its input tables and the source of its render
+    function and of the helpers it uses (see _render_sources), so editing one plot
+    function (or a shared helper such as _heatmap_mean) or rewriting one
+    table only rebuilds the figures that depend on it. Keys are kept in
+    `<root>/report_manifest.json`. Stale figures render on a process pool
+    when workers > 1 (matplotlib Agg backend in every worker).
+    """
+    root = Path(root)
+    names = list(FIGURES) if figures is None else list(figures)
+    unknown = sorted(set(names) - set(FIGURES))
+    if unknown:
+        raise ValueError(f"unknown figures: {unknown}")
+
+    manifest_path = root / MANIFEST
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    figs = manifest.setdefault("figures", {})
+
+    table_hashes: dict[str, str] = {}
+    for t in sorted({t for n in FIGURES.values() for t in n.tables}):
+        if (root / t).exists():
+            table_hashes[t] = file_hash(root / t)
+
+    stale, fresh, missing = [], [], []
+    keys = {}
+    for name in names:
+        spec = FIGURES[name]
+        if any(t not in table_hashes for t in spec.tables):
+            missing.append(name)
+            continue
+        keys[name] = _figure_key(spec, table_hashes)
+        png = root / "figures" / f"{name}.png"
+        if force or not png.exists() or figs.get(name) != keys[name]:
+            stale.append(name)
+        else:
+            fresh.append(name)
+
+    jobs = [(name, str(root)) for name in stale]
+    if workers > 1 and len(jobs) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            list(pool.map(_render_one, jobs))
+    else:
+        for job in jobs:
+            _render_one(job)
+
+    for name in stale:
+        figs[name] = keys[name]
+    manifest["tables"] = table_hashes
+    root.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+    out_html = write_html(root, root / html_out, table_hashes) if html_out else None
+    return ReportBuild(
+        rendered=tuple(stale), up_to_date=tuple(fresh), missing_tables=tuple(missing), html=out_html
+    )
+
+
+def write_html(root: Path, out: Path, table_hashes: dict[str, str]) -> Path:
+    """One page: the result tables (rows, content hash) and every available figure."""
+    import pandas as pd
+
+    parts = [
+        "<!doctype html>",
+        '<html><head><meta charset="utf-8"><title>optimal-quoting report</title>',
+        (
+            "<style>body{font-family:sans-serif;max-width:960px;margin:auto}"
+            "img{max-width:100%}td,th{padding:2px 8px;text-align:left}</style>"
+        ),
+        "</head><body>",
+        "<h1>optimal-quoting report</h1>",
+        "<h2>Result tables</h2>",
+        "<table><tr><th>table</th><th>rows</th><th>sha256</th></tr>",
+    ]
+    for t, digest in table_hashes.items():
+        rows = len(pd.read_csv(root / t))
+        parts.append(f"<tr><td>{html.escape(t)}</td><td>{rows}</td><td><code>{digest[:12]}</code></td></tr>")
+    parts.append("</table>")
+
+    for name, spec in FIGURES.items():
+        png = root / "figures" / f"{name}.png"
+        if not png.exists() or any(t not in table_hashes for t in spec.tables):
+            continue
+        parts.append(f"<h2>{html.escape(spec.title)}</h2>")
+        parts.append(f'<img src="figures/{name}.png" alt="{html.escape(name)}">')
+    parts.append("</body></html>")
+
+    out.write_text("\n".join(parts), encoding="utf-8")
+    return out
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class AdverseSelectionConfig:
+    """
+    Post-fill mid impact (markout kernel) per lot filled.
+
+    A fill that leaves us long (bid hit) moves the mid down, a fill that leaves
+    us short moves it up. With s = -(signed lots filled), the cumulative mid
+    move h steps after the fill is
+
+        G(h) = s * ( jump + drift * (1 - rho^h) ),    rho = 2^(-dt / half_life)
+
+    i.e. an immediate jump on the next step plus a drift that is released
+    geometrically with the given half-life (half_life = 0: drift released on
+    the next step, like a jump).
+    """
+
+    jump: float = 0.0
+    drift: float = 0.0
+    half_life: float = 0.0     # seconds
+
+    @property
+    def active(self) -> bool:
+        return self.jump != 0.0 or self.drift != 0.0
+
+
+class AdverseSelectionState:
+    """
+    Decaying-state implementation of the kernel: the effect of all past fills
+    is summarized by the pending jump and the unreleased drift, so each step
+    is O(1) whatever the number of past fills (no convolution over history).
+
+    The state is a float for a single path or an array of any shape for
+    batched paths (e.g. one entry per asset).
+    """
+
+    def __init__(self, cfg: AdverseSelectionConfig, dt: float, shape: tuple[int, ...] | None = None) -> None:
+        if cfg.jump < 0 or cfg.drift < 0:
+            raise ValueError("jump and drift must be >= 0")
+        if cfg.half_life < 0:
+            raise ValueError("half_life must be >= 0")
+        if dt <= 0:
+            raise ValueError("dt must be > 0")
+        self.cfg = cfg
+        self.rho = math.exp(-math.log(2.0) * dt / cfg.half_life) if cfg.half_life > 0 else 0.0
+        self.pending = 0.0 if shape is None else np.zeros(shape, dtype=float)     # jump for the next step
+        self.unreleased = 0.0 if shape is None else np.zeros(shape, dtype=float)  # drift not yet released
+
+    def on_fill(self, signed_lots):
+        """Register the net lots bought (+) / sold (-) this step."""
+        self.pending = self.pending - self.cfg.jump * signed_lots
+        self.unreleased = self.unreleased - self.cfg.drift * signed_lots
+
+    def step(self):
+        """Mid shift to add this step; advances the state by one step."""
+        release = (1.0 - self.rho) * self.unreleased
+        shift = self.pending + release
+        self.unreleased = self.unreleased - release
+        self.pending = 0.0
+        return shift
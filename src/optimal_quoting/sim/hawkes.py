@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class HawkesParams:
+    """
+    Univariate Hawkes process with exponential kernel:
+
+        λ(t) = mu + sum_{t_i < t} alpha * exp(-beta (t - t_i))
+
+    Each event raises the intensity by alpha, which then decays at rate beta.
+    The branching ratio alpha / beta (expected children per event) must be
+    < 1 for a stationary process, whose mean rate is mu / (1 - alpha / beta).
+    """
+
+    mu: float
+    alpha: float
+    beta: float
+
+    def __post_init__(self) -> None:
+        if self.mu <= 0:
+            raise ValueError("mu must be > 0")
+        if self.alpha < 0:
+            raise ValueError("alpha must be >= 0")
+        if self.beta <= 0:
+            raise ValueError("beta must be > 0")
+
+    @property
+    def branching_ratio(self) -> float:
+        return self.alpha / self.beta
+
+    @property
+    def stationary_rate(self) -> float:
+        if self.branching_ratio >= 1.0:
+            return math.inf
+        return self.mu / (1.0 - self.branching_ratio)
+
+
+def simulate_hawkes(p: HawkesParams, T: float, rng: np.random.Generator) -> np.ndarray:
+    """
+    Exact event times on [0, T] by Ogata thinning.
+
+    Between events the intensity only decays, so λ just after the current
+    time bounds it until the next candidate. The excitation
+        S(t) = λ(t) - mu
+    is carried recursively (S <- S * exp(-beta * w) over a gap w, S <- S + alpha
+    at an accepted event), so each candidate costs O(1) regardless of how many
+    events came before.
+    """
+    if T <= 0:
+        raise ValueError("T must be > 0")
+    mu, alpha, beta = p.mu, p.alpha, p.beta
+
+    times: list[float] = []
+    t = 0.0
+    s = 0.0
+    while True:
+        lam_bar = mu + s
+        w = rng.exponential(1.0 / lam_bar)
+        t += w
+        if t > T:
+            break
+        s *= math.exp(-beta * w)
+        if rng.random() * lam_bar <= mu + s:
+            times.append(t)
+            s += alpha
+    return np.asarray(times, dtype=float)
+
+
+class HawkesExcitation:
+    """
+    Per-step excitation state for discrete-time engines.
+
+    Over a step of length dt starting with excitation S, the integrated
+    excitation is S * (1 - exp(-beta dt)) / beta (exact for the exponential
+    kernel); `step` returns it and decays S, `excite` adds alpha per event.
+    `s` may be a float or an array (one entry per side / path).
+    """
+
+    def __init__(self, alpha: float, beta: float, dt: float, s0=0.0) -> None:
+        if alpha < 0:
+            raise ValueError("alpha must be >= 0")
+        if beta <= 0:
+            raise ValueError("beta must be > 0")
+        if dt <= 0:
+            raise ValueError("dt must be > 0")
+        self.alpha = alpha
+        self.decay = math.exp(-beta * dt)
+        self.weight = -math.expm1(-beta * dt) / beta
+        self.s = s0
+
+    def step(self):
+        """Integrated excitation over the next step; advances the decay."""
+        integrated = self.s * self.weight
+        self.s = self.s * self.decay
+        return integrated
+
+    def excite(self, events) -> None:
+        self.s = self.s + self.alpha * events
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+
+import numpy as np
+
+BID, ASK = 0, 1
+
+
+@dataclass(frozen=True)
+class LOBConfig:
+    """
+    Queue-based L2 book around an exogenous mid (volumes in lots).
+
+    tick_size   : price grid
+    n_levels    : price levels kept per side, counted from the touch
+    limit_rate  : limit orders (1 lot each) arriving per level per second
+    cancel_rate : cancellation rate per resting lot per second
+    mo_rate     : market orders per side per second
+    mo_size     : lots per market order
+
+    Without market orders a level holds Poisson(limit_rate / cancel_rate) lots
+    in steady state; levels entering the book are drawn from that law.
+    """
+
+    tick_size: float
+    n_levels: int = 20
+    limit_rate: float = 1.0
+    cancel_rate: float = 0.1
+    mo_rate: float = 0.5
+    mo_size: int = 5
+
+    def __post_init__(self) -> None:
+        if self.tick_size <= 0:
+            raise ValueError("tick_size must be > 0")
+        if self.n_levels < 1:
+            raise ValueError("n_levels must be >= 1")
+        if self.limit_rate < 0 or self.mo_rate < 0:
+            raise ValueError("limit_rate and mo_rate must be >= 0")
+        if self.cancel_rate <= 0:
+            raise ValueError("cancel_rate must be > 0")
+        if self.mo_size < 1:
+            raise ValueError("mo_size must be >= 1")
+
+
+class LOBSimulator:
+    """
+    Fill model with queue priority for one resting lot per side.
+
+    Each side is a ring buffer of `n_levels` aggregate volumes (int64), with
+    `head[side]` the slot of the touch. When the mid moves by d ticks only the
+    d levels entering / leaving the book are rewritten (O(|d|), no shifting of
+    the whole array). Orders are not stored individually: for our order only
+    its price and the volume queued ahead of it are tracked, which is all FIFO
+    priority needs:
+
+      - limit orders join the back of a level (behind us),
+      - cancellations hit resting lots uniformly at random (binomial per
+        level; the part ahead of us is hypergeometric),
+      - market orders walk the book from the touch; our lot fills once the
+        volume at better prices and the volume ahead of us are consumed.
+
+    Keeping the same price across steps keeps the queue position; a new price
+    joins the back of that level. Events of one step are drawn with one
+    vectorized call per event type.
+    """
+
+    def __init__(self, cfg: LOBConfig, dt: float, mid0: float, rng: np.random.Generator) -> None:
+        if dt <= 0:
+            raise ValueError("dt must be > 0")
+        self.cfg = cfg
+        self.dt = dt
+        self.rng = rng
+        n = cfg.n_levels
+        self._n = n
+        self._fresh_mean = cfg.limit_rate / cfg.cancel_rate
+        self._p_cancel = -math.expm1(-cfg.cancel_rate * dt)
+        self._lam_limit = cfg.limit_rate * dt
+        self._lam_mo = cfg.mo_rate * dt
+        self._sgn = (1, -1)                       # bid prices decrease with depth, ask prices increase
+
+        self.vol = rng.poisson(self._fresh_mean, size=(2, n)).astype(np.int64)
+        self.head = [0, 0]
+        self.touch = list(self._touch_ticks(mid0))
+        self.order_tick: list[int | None] = [None, None]
+        self.ahead = [0, 0]
+        self.n_events = 0
+
+    def _touch_ticks(self, mid: float) -> tuple[int, int]:
+        x = mid / self.cfg.tick_size
+        return math.ceil(x - 1e-9) - 1, math.floor(x + 1e-9) + 1
+
+    def depth(self, side: int) -> np.ndarray:
+        """Volumes ordered from the touch outwards."""
+        return np.roll(self.vol[side], -self.head[side])
+
+    def _slot(self, side: int, level: int) -> int:
+        return (self.head[side] + level) % self._n
+
+    def _level_of(self, side: int, tick: int) -> int:
+        return self._sgn[side] * (self.touch[side] - tick)
+
+    def _shift(self, side: int, new_touch: int) -> None:
+        d = self._sgn[side] * (new_touch - self.touch[side])   # > 0: levels enter at the top
+        if d == 0:
+            return
+        n = self._n
+        tick = self.order_tick[side]
+        was_deep = tick is not None and self._level_of(side, tick) >= n
+        self.touch[side] = new_touch
+        k = min(abs(d), n)
+        if d > 0:
+            self.head[side] = (self.head[side] - k) % n
+            start = self.head[side]
+        else:
+            start = self.head[side]
+            self.head[side] = (self.head[side] + k) % n
+        slots = (start + np.arange(k)) % n
+        self.vol[side, slots] = self.rng.poisson(self._fresh_mean, size=k)
+        if was_deep:
+            level = self._level_of(side, tick)
+            if 0 <= level < n:
+                # our order scrolled back into the tracked depth: its level was
+                # just redrawn, so the queue ahead of it is the fresh volume
+                self.ahead[side] = int(self.vol[side, self._slot(side, level)])
+
+    def _place(self, side: int, tick: int | None) -> None:
+        if tick is None:
+            self.order_tick[side] = None
+            return
+        level = self._level_of(side, tick)
+        if tick == self.order_tick[side]:
+            if level < 0:
+                self.ahead[side] = 0               # the levels ahead of us left the book
+            return
+        self.order_tick[side] = tick
+        if level < 0:
+            self.ahead[side] = 0                   # improving the touch: first in line
+        elif level < self._n:
+            self.ahead[side] = int(self.vol[side, self._slot(side, level)])
+        else:
+            self.ahead[side] = round(self._fresh_mean)
+
+    def _market_order(self, side: int, m: int) -> bool:
+        """Walk the book with m lots; return True if our lot is filled."""
+        tick = self.order_tick[side]
+        level = self._level_of(side, tick) if tick is not None else self._n
+        filled = False
+        if level < 0 and m > 0:
+            filled = True
+            m -= 1
+        vol = self.vol[side]
+        for lvl in range(self._n):
+            if m <= 0:
+                break
+            slot = self._slot(side, lvl)
+            if lvl == level and not filled:
+                ahead = self.ahead[side]
+                if m > ahead:
+                    filled = True
+                    vol[slot] -= ahead
+                    m -= ahead + 1
+                else:
+                    vol[slot] -= m
+                    self.ahead[side] = ahead - m
+                    m = 0
+                    break
+            take = min(m, int(vol[slot]))
+            vol[slot] -= take
+            m -= take
+        if filled:
+            self.order_tick[side] = None
+            self.ahead[side] = 0
+        return filled
+
+    def step(self, mid: float, bid_tick: int | None, ask_tick: int | None) -> tuple[bool, bool]:
+        """
+        Advance the book by dt around `mid` with our lots at the given ticks
+        (None: side not quoted). Returns (fill_bid, fill_ask).
+        """
+        rng = self.rng
+        touch = self._touch_ticks(mid)
+        for side, tick in ((BID, bid_tick), (ASK, ask_tick)):
+            self._shift(side, touch[side])
+            self._place(side, tick)
+
+        # cancellations, uniform over resting lots
+        cancels = rng.binomial(self.vol, self._p_cancel)
+        for side in (BID, ASK):
+            tick = self.order_tick[side]
+            if tick is None or self.ahead[side] == 0:
+                continue
+            level = self._level_of(side, tick)
+            if 0 <= level < self._n:
+                slot = self._slot(side, level)
+                c = int(cancels[side, slot])
+                if c:
+                    ahead = min(self.ahead[side], int(self.vol[side, slot]))
+                    self.ahead[side] = ahead - int(rng.hypergeometric(ahead, int(self.vol[side, slot]) - ahead, c))
+        self.vol -= cancels
+
+        # market orders (sells hit the bid side, buys the ask side)
+        n_mo = rng.poisson(self._lam_mo, size=2)
+        fills = (
+            self._market_order(BID, int(n_mo[BID]) * self.cfg.mo_size),
+            self._market_order(ASK, int(n_mo[ASK]) * self.cfg.mo_size),
+        )
+
+        # limit order arrivals join the back of each level
+        arrivals = rng.poisson(self._lam_limit, size=self.vol.shape)
+        self.vol += arrivals
+
+        self.n_events += int(cancels.sum() + arrivals.sum() + n_mo.sum())
+        return fills
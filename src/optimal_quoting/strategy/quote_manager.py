@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from optimal_quoting.backtest.engine import MMParams
+
+REPLACE, CANCEL = "replace", "cancel"
+
+
+@dataclass(frozen=True)
+class QuoteManagerConfig:
+    """
+    tolerance : a resting quote is amended only if the new price moved by
+                more than `tolerance` (currency)
+    tick_size : > 0: ... and by at least one tick
+    max_rate  : order messages per second (token bucket); 0: unlimited
+    burst     : bucket capacity (messages that can go out back to back)
+    """
+
+    tolerance: float = 0.0
+    tick_size: float = 0.0
+    max_rate: float = 0.0
+    burst: int = 10
+
+    def __post_init__(self) -> None:
+        if self.tolerance < 0 or self.tick_size < 0:
+            raise ValueError("tolerance and tick_size must be >= 0")
+        if self.max_rate < 0:
+            raise ValueError("max_rate must be >= 0")
+        if self.burst < 1:
+            raise ValueError("burst must be >= 1")
+
+    @classmethod
+    def from_params(cls, p: MMParams) -> QuoteManagerConfig:
+        return cls(
+            tolerance=p.quote_tolerance,
+            tick_size=p.tick_size,
+            max_rate=p.quote_max_rate,
+            burst=p.quote_burst,
+        )
+
+
+class QuoteManager:
+    """
+    Delta-based order amendment: keeps the resting quote per side and turns
+    each newly computed quote into at most one message.
+
+      - side pulled (price None) while resting  -> CANCEL (never throttled)
+      - move <= tolerance or < one tick          -> suppressed, quote stays
+      - otherwise, if the rate limit allows      -> REPLACE (or new order)
+      - rate limit exhausted                     -> throttled, quote stays
+
+    A fill consumes the resting quote (`on_fill`), so the next update on that
+    side places a new order.
+    """
+
+    def __init__(self, cfg: QuoteManagerConfig | None = None) -> None:
+        self.cfg = cfg if cfg is not None else QuoteManagerConfig()
+        self.resting: list[float | None] = [None, None]
+        self.n_replace = 0
+        self.n_cancel = 0
+        self.n_suppressed = 0
+        self.n_throttled = 0
+        self._tokens = float(self.cfg.burst)
+        self._last_t = 0.0
+        # moves smaller than this (relative slack for float prices on the grid) are not sent
+        self._min_move = self.cfg.tick_size * (1.0 - 1e-9)
+
+    @property
+    def n_messages(self) -> int:
+        return self.n_replace + self.n_cancel
+
+    def _take(self, t: float, force: bool = False) -> bool:
+        c = self.cfg
+        if c.max_rate <= 0.0:
+            return True
+        self._tokens = min(float(c.burst), self._tokens + (t - self._last_t) * c.max_rate)
+        self._last_t = t
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        if force:
+            self._tokens = 0.0
+            return True
+        return False
+
+    def update(self, side: int, price: float | None, t: float) -> str | None:
+        """Reconcile the desired quote on `side` at time t; returns the message sent, if any."""
+        old = self.resting[side]
+        if price is None:
+            if old is None:
+                return None
+            self._take(t, force=True)
+            self.resting[side] = None
+            self.n_cancel += 1
+            return CANCEL
+        if old is not None:
+            move = abs(price - old)
+            if move <= self.cfg.tolerance or move < self._min_move:
+                self.n_suppressed += 1
+                return None
+        if not self._take(t):
+            self.n_throttled += 1
+            return None
+        self.resting[side] = price
+        self.n_replace += 1
+        return REPLACE
+
+    def on_fill(self, side: int) -> None:
+        self.resting[side] = None
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+import math
 
 
 @dataclass(frozen=True)
 class Quotes:
-    bid: float
-    ask: float
-    delta_bid: float
-    delta_ask: float
+    """
+    Two-sided quote. A side set to None (price and delta) is not quoted.
+    """
+    bid: float | None
+    ask: float | None
+    delta_bid: float | None
+    delta_ask: float | None
 
 
 def compute_quotes(mid: float, q: float, base_spread: float, phi: float) -> Quotes:
@@ -29,3 +33,55 @@ def compute_quotes(mid: float, q: float, base_spread: float, phi: float) -> Quot
     ask = mid + delta_ask
     bid = mid - delta_bid
     return Quotes(bid=bid, ask=ask, delta_bid=delta_bid, delta_ask=delta_ask)
+
+
+def snap_quotes_to_ticks(
+    quotes: Quotes, mid: float, tick_size: float
+) -> tuple[Quotes, int | None, int | None]:
+    """
+    Snap quotes outwards onto the tick grid (bid rounded down, ask rounded up),
+    so deltas never shrink. Returns (snapped quotes, bid_ticks, ask_ticks);
+    suppressed sides stay None.
+    """
+    if tick_size <= 0:
+        raise ValueError("tick_size must be > 0")
+
+    bid_t = ask_t = None
+    bid = delta_bid = ask = delta_ask = None
+    # small tolerance so prices already on the grid are not moved a full tick
+    if quotes.bid is not None:
+        bid_t = math.floor(quotes.bid / tick_size + 1e-9)
+        bid = bid_t * tick_size
+        delta_bid = max(0.0, mid - bid)
+    if quotes.ask is not None:
+        ask_t = math.ceil(quotes.ask / tick_size - 1e-9)
+        ask = ask_t * tick_size
+        delta_ask = max(0.0, ask - mid)
+    snapped = Quotes(bid=bid, ask=ask, delta_bid=delta_bid, delta_ask=delta_ask)
+    return snapped, bid_t, ask_t
+
+
+def suppress_sides(quotes: Quotes, bid: bool = True, ask: bool = True) -> Quotes:
+    """
+    Keep only the requested sides; a suppressed side gets None price and delta.
+    """
+    if bid and ask:
+        return quotes
+    out = quotes
+    if not bid:
+        out = replace(out, bid=None, delta_bid=None)
+    if not ask:
+        out = replace(out, ask=None, delta_ask=None)
+    return out
+
+
+def inventory_limit_sides(q_lots: int, max_lots: int | None) -> tuple[bool, bool]:
+    """
+    One-sided quoting under a hard inventory limit of +/- max_lots lots.
+
+    Returns (quote_bid, quote_ask): the bid is pulled when one more buy would
+    exceed +max_lots, the ask when one more sell would go below -max_lots.
+    """
+    if max_lots is None:
+        return True, True
+    return q_lots < max_lots, q_lots > -max_lots
@@ -0,0 +1,19 @@
+import pytest
+
+from optimal_quoting.backtest.engine import MMParams
+
+# toy market shared by the engine tests; each test overrides what it exercises
+MM_DEFAULTS = dict(
+    dt=1.0, T=2000.0, mid0=100.0, sigma=0.02, A=1.2, k=1.0,
+    base_spread=0.2, phi=0.0, order_size=1.0, fee_bps=0.0,
+)
+
+
+@pytest.fixture
+def mm_params():
+    """Factory: mm_params(**overrides) -> MMParams (or `params_cls`) on the toy market."""
+
+    def make(params_cls=MMParams, **overrides):
+        return params_cls(**{**MM_DEFAULTS, **overrides})
+
+    return make
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from optimal_quoting.backtest.engine import run_mm_toy
+from optimal_quoting.metrics.markout import MarkoutTracker
+from optimal_quoting.sim.adverse_selection import AdverseSelectionConfig, AdverseSelectionState
+
+
+def test_kernel_matches_closed_form():
+    cfg = AdverseSelectionConfig(jump=0.01, drift=0.03, half_life=4.0)
+    st = AdverseSelectionState(cfg, dt=1.0)
+    st.on_fill(1)                      # bought one lot -> mid moves down
+    path = np.cumsum([st.step() for _ in range(50)])
+
+    h = np.arange(1, 51)
+    rho = 2.0 ** (-1.0 / 4.0)
+    expected = -(cfg.jump + cfg.drift * (1.0 - rho**h))
+    assert np.allclose(path, expected)
+
+
+def test_kernel_is_linear_in_fills_and_batched():
+    cfg = AdverseSelectionConfig(jump=0.0, drift=1.0, half_life=2.0)
+    st = AdverseSelectionState(cfg, dt=0.5, shape=(2,))
+    st.on_fill(np.array([2, -1]))
+    total = sum(st.step() for _ in range(200))
+    assert np.allclose(total, [-2.0, 1.0])
+
+
+def test_engine_without_impact_is_unchanged(mm_params):
+    df0 = run_mm_toy(mm_params(T=500.0, seed=5))
+    df1 = run_mm_toy(mm_params(T=500.0, seed=5, adverse_half_life=3.0), markouts=MarkoutTracker([0, 5]))
+    assert df0.equals(df1)
+
+
+def test_adverse_selection_erodes_markouts(mm_params):
+    p = mm_params(
+        T=3000.0, sigma=0.0, A=0.5, seed=7, adverse_jump=0.02, adverse_drift=0.02, adverse_half_life=2.0
+    )
+    mk = MarkoutTracker([0, 50])
+    run_mm_toy(p, markouts=mk)
+    per_fill = mk.per_fill()
+
+    assert per_fill[0] == pytest.approx(0.1)          # half-spread captured at fill time
+    assert per_fill[1] < per_fill[0] - 0.01
@@ -24,3 +24,96 @@ def test_as_inventory_skew_direction():
     # If q<0 (short), ask should tighten, bid should widen
     assert dan < da0
     assert dbn > db0
+
+
+def test_as_grid_matches_scalar():
+    import numpy as np
+
+    from optimal_quoting.model.avellaneda_stoikov import as_deltas_grid, as_quotes_grid
+
+    p = ASParams(gamma=0.5, sigma=0.3, k=2.0, T=10.0)
+    q = np.linspace(-20.0, 20.0, 9)
+    t = np.linspace(0.0, 10.0, 5)
+    d_bid, d_ask = as_deltas_grid(q[:, None], t[None, :], p)
+    assert d_bid.shape == (9, 5)
+    for i, qi in enumerate(q):
+        for j, tj in enumerate(t):
+            assert (d_bid[i, j], d_ask[i, j]) == pytest.approx(as_deltas(q=qi, t=tj, p=p))
+
+    bid, ask, _, _ = as_quotes_grid(100.0, q, 0.0, p, gamma=np.array([[0.5], [1.0]]))
+    assert bid.shape == (2, 9)
+    assert np.all(bid <= 100.0) and np.all(ask >= 100.0)
+
+    with pytest.raises(ValueError):
+        as_deltas_grid(q, 11.0, p)
+    with pytest.raises(ValueError):
+        as_deltas_grid(q, 0.0, p, gamma=np.array([0.1, 0.0]))
+
+
+def test_birth_death_stationary():
+    import numpy as np
+
+    from optimal_quoting.model.avellaneda_stoikov import birth_death_stationary
+
+    sym = birth_death_stationary(np.full(5, 0.2), np.full(5, 0.2))
+    assert sym == pytest.approx(np.full(5, 0.2))
+
+    # up / down = 1/2 everywhere: geometric
+    pi = birth_death_stationary(np.full((2, 4), 0.1), np.full((2, 4), 0.2))
+    expected = 0.5 ** np.arange(4)
+    assert pi[1] == pytest.approx(expected / expected.sum())
+
+    with pytest.raises(ValueError):
+        birth_death_stationary(np.array([0.1, 0.0, 0.1]), np.full(3, 0.1))
+
+
+def test_as_expectations_vectorized_over_gamma():
+    import numpy as np
+
+    from optimal_quoting.model.avellaneda_stoikov import as_expectations
+
+    p = ASParams(gamma=0.1, sigma=0.05, k=1.0, T=500.0)
+    gammas = np.array([1e-6, 0.5, 5.0])
+    grid = as_expectations(p, A=1.2, dt=0.01, order_size=0.01, max_lots=10, gamma=gammas)
+    assert grid.expected_pnl.shape == (3,)
+    for i, g in enumerate(gammas):
+        one = as_expectations(p, A=1.2, dt=0.01, order_size=0.01, max_lots=10, gamma=g)
+        assert one.expected_pnl == pytest.approx(grid.expected_pnl[i])
+        assert one.inventory_var == pytest.approx(grid.inventory_var[i])
+
+    # no skew: symmetric quotes at 1/k, λ = A / e, uniform inventory over the
+    # 21 states, one side off at each limit: capture = 2 A / (e k) (1 - 1/21)
+    lam = 1.2 * np.exp(-1.0)
+    assert grid.fill_rate_bid[0] == pytest.approx(grid.fill_rate_ask[0])
+    assert grid.inventory_mean[0] == pytest.approx(0.0, abs=1e-12)
+    assert grid.spread_capture[0] == pytest.approx(0.01 * 2 * lam * 20 / 21, rel=0.01)
+    assert grid.expected_pnl[0] == pytest.approx(500.0 * grid.spread_capture[0])
+
+
+def test_as_expectations_match_backtest():
+    import numpy as np
+
+    from optimal_quoting.backtest.engine import MMParams, run_mm_toy_arrays
+    from optimal_quoting.model.avellaneda_stoikov import as_expectations
+
+    T, dt = 500.0, 0.1
+    ex = as_expectations(
+        ASParams(gamma=1.0, sigma=0.05, k=1.0, T=T), A=1.2, dt=dt, order_size=0.01, max_lots=5,
+        fee_bps=1.0, mid0=100.0,
+    )
+
+    rate, inv_var, pnl = [], [], []
+    for seed in range(6):
+        out = run_mm_toy_arrays(
+            MMParams(
+                dt=dt, T=T, mid0=100.0, sigma=0.05, A=1.2, k=1.0, base_spread=0.4, phi=0.0,
+                order_size=0.01, fee_bps=1.0, seed=seed, policy="as", gamma=1.0, inv_limit=0.05,
+            )
+        )
+        rate.append(0.5 * (out["fill_bid"].sum() + out["fill_ask"].sum()) / T)
+        inv_var.append(out["inventory"].var())
+        pnl.append(out["equity"][-1])
+
+    assert np.mean(rate) == pytest.approx(0.5 * (ex.fill_rate_bid + ex.fill_rate_ask), rel=0.05)
+    assert np.mean(inv_var) == pytest.approx(ex.inventory_var, rel=0.3)
+    assert np.mean(pnl) == pytest.approx(ex.expected_pnl, abs=3 * ex.pnl_std / np.sqrt(6))
@@ -1,8 +1,14 @@
 import numpy as np
+import pytest
 
 from optimal_quoting.backtest.engine import MMParams, run_mm_toy
 from optimal_quoting.calibration.dataset import build_intensity_dataset_from_mm
-from optimal_quoting.calibration.mle import fit_intensity_exp_mle
+from optimal_quoting.calibration.mle import (
+    compress_intensity_samples,
+    fit_intensity_exp_mle,
+    fit_intensity_mle,
+)
+from optimal_quoting.model.intensity import get_intensity_family
 
 
 def _run_calibration(dt: float, probing: bool, seed: int):
@@ -54,3 +60,34 @@ def test_mle_is_biased_without_probing():
 
     # We EXPECT bias in non-identifiable regime
     assert abs(est.k - p.k) > 0.2
+
+
+@pytest.mark.parametrize("family", ["exp", "power", "logistic"])
+def test_generic_mle_recovers_family_params(family):
+    rng = np.random.default_rng(7)
+    dt = 0.1
+    delta = rng.random(100_000) * 2.0
+    lam = get_intensity_family(family).intensity(np.array([1.2, 1.0]), delta)
+    n = (rng.random(delta.size) < 1.0 - np.exp(-lam * dt)).astype(float)
+
+    fit = fit_intensity_mle(delta, n, dt=dt, family=family, k_bounds=(0.0, 5.0))
+
+    assert fit.converged
+    assert abs(fit.A - 1.2) < 0.15
+    assert abs(fit.k - 1.0) < 0.15
+
+
+def test_generic_mle_matches_exp_mle_and_compression():
+    rng = np.random.default_rng(3)
+    delta = rng.choice([0.1, 0.3, 0.6, 1.2], size=20_000)
+    n = (rng.random(delta.size) < 1.0 - np.exp(-1.2 * np.exp(-delta) * 0.1)).astype(float)
+
+    ref = fit_intensity_exp_mle(delta, n, dt=0.1, k_bounds=(0.0, 5.0), grid_size=300)
+    fit = fit_intensity_mle(delta, n, dt=0.1, k_bounds=(0.0, 5.0))
+    dc, nc, wc = compress_intensity_samples(delta, n)
+    fit_c = fit_intensity_mle(dc, nc, dt=0.1, w=wc, k_bounds=(0.0, 5.0))
+
+    assert dc.shape == (4,)
+    assert fit.k == pytest.approx(ref.k, abs=1e-5)
+    assert fit.nll == pytest.approx(ref.nll, rel=1e-9)
+    assert fit_c.k == pytest.approx(fit.k, abs=1e-8)
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from optimal_quoting.backtest.checkpoint import STATE, load_segments, run_checkpointed
+from optimal_quoting.backtest.engine import ToySimulation, run_mm_toy_arrays
+from optimal_quoting.metrics.intraday import IntradayRiskConfig, IntradayRiskMonitor
+from optimal_quoting.metrics.markout import MarkoutTracker
+
+BASE = dict(dt=0.5, T=300.0, sigma=0.05, base_spread=0.4, phi=0.01, order_size=0.01, fee_bps=1.0)
+VARIANTS = [
+    dict(),
+    dict(policy="probing", probing_p=0.3, probing_jitter=0.2),
+    dict(rng_streams=True, antithetic=True, policy="as", gamma=0.5),
+    dict(tick_size=0.01, inv_limit=0.03, adverse_jump=0.01, adverse_drift=0.01, adverse_half_life=5.0),
+    dict(hawkes_alpha=0.3, quote_tolerance=0.05, quote_max_rate=0.5),
+    dict(fill_model="lob", tick_size=0.05, rng_streams=True),
+]
+
+
+def _assert_same(a: dict, b: dict) -> None:
+    assert a.keys() == b.keys()
+    for key in a:
+        np.testing.assert_array_equal(a[key], b[key], err_msg=key)
+
+
+@pytest.mark.parametrize("variant", VARIANTS)
+def test_segments_with_save_load_are_bit_identical(variant, tmp_path, mm_params):
+    p = mm_params(**BASE, **variant)
+    ref_markouts = MarkoutTracker((0, 1, 10))
+    ref = run_mm_toy_arrays(p, markouts=ref_markouts)
+
+    sim = ToySimulation(p, markouts=MarkoutTracker((0, 1, 10)))
+    parts = []
+    while not sim.done:
+        parts.append(sim.run(97))
+        sim.save(tmp_path / "sim.pkl")
+        sim = ToySimulation.load(tmp_path / "sim.pkl")
+
+    _assert_same(ref, {key: np.concatenate([part[key] for part in parts]) for key in ref})
+    np.testing.assert_array_equal(sim.markouts.frame(dt=p.dt).to_numpy(), ref_markouts.frame(dt=p.dt).to_numpy())
+    assert sim.run(10)["mid"].shape == (0,)
+
+
+def test_checkpointed_run_resumes_across_calls(tmp_path, mm_params):
+    p = mm_params(**BASE, rng_streams=True)
+    ref = run_mm_toy_arrays(p)
+
+    sim = run_checkpointed(p, tmp_path, segment_steps=128, max_segments=2)
+    assert not sim.done and sim.t == 256
+    # crash after a segment file was written, before the state was updated
+    ToySimulation.load(tmp_path / STATE).run(128)
+    sim = run_checkpointed(p, tmp_path, segment_steps=100)
+    assert sim.done
+
+    _assert_same(ref, load_segments(tmp_path))
+    with pytest.raises(ValueError, match="different params"):
+        run_checkpointed(mm_params(**BASE, seed=1), tmp_path, segment_steps=100)
+
+
+def test_monitor_breach_is_kept_across_resume(tmp_path, mm_params):
+    p = mm_params(**BASE)
+
+    def monitor() -> IntradayRiskMonitor:
+        return IntradayRiskMonitor(IntradayRiskConfig(window=20, snapshot_every=50, max_abs_inventory=0.03))
+
+    ref = run_mm_toy_arrays(p, monitor=monitor())
+    assert len(ref["mid"]) < int(p.T / p.dt) + 1
+
+    sim = run_checkpointed(p, tmp_path, segment_steps=7, monitor=monitor())
+    assert sim.done and sim.stopped
+    _assert_same(ref, load_segments(tmp_path))
+
+
+def test_load_segments_detects_gaps(tmp_path, mm_params):
+    run_checkpointed(mm_params(**BASE), tmp_path, segment_steps=200)
+    (tmp_path / "segment_000000000200.npz").unlink()
+    with pytest.raises(ValueError, match="missing steps"):
+        load_segments(tmp_path)
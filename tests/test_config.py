@@ -0,0 +1,79 @@
+import pickle
+
+import pandas as pd
+import pytest
+import yaml
+
+from optimal_quoting.cli import main
+from optimal_quoting.config import (
+    load_benchmark_config,
+    load_simulate_config,
+    load_stress_config,
+    resolve_mm_params,
+)
+
+FLAT = dict(
+    dt=1, T=100, mid0=100.0, sigma=0.02, A=1.2, k=1.0,
+    base_spread=0.2, phi=0.0, order_size=0.01, fee_bps=0.0,
+)
+
+
+def test_flat_and_nested_layouts_resolve_to_same_params():
+    nested = {
+        "dt": 1, "T": 100, "mid0": 100.0, "sigma": 0.02,
+        "intensity": {"A": 1.2, "k": 1.0},
+        "strategy": {"base_spread": 0.2, "phi": 0.0, "order_size": 0.01},
+        "costs": {"fee_bps": 0.0},
+        "policy": {"name": "as", "gamma": 0.2},
+    }
+    p = resolve_mm_params(nested)
+    assert p == resolve_mm_params(FLAT, policy="as", gamma=0.2)
+    assert isinstance(p.T, float) and p.T == 100.0
+
+
+def test_invalid_configs_rejected():
+    with pytest.raises(ValueError, match="unknown"):
+        resolve_mm_params({**FLAT, "sigmaa": 0.1})
+    with pytest.raises(ValueError, match="missing"):
+        resolve_mm_params({k: v for k, v in FLAT.items() if k != "A"})
+    with pytest.raises(ValueError, match="sigma"):
+        resolve_mm_params({**FLAT, "sigma": "high"})
+    with pytest.raises(ValueError, match="rng_streams"):
+        resolve_mm_params({**FLAT, "rng_streams": "yes"})
+    with pytest.raises(ValueError, match="lob_levels"):
+        resolve_mm_params(FLAT, lob_levels=2.7)
+    with pytest.raises(ValueError, match="spawn_key"):
+        resolve_mm_params(FLAT, spawn_key=[1, 2.5])
+    with pytest.raises(ValueError, match="policy"):
+        resolve_mm_params(FLAT, policy="AS")
+    with pytest.raises(ValueError, match="fill_model"):
+        resolve_mm_params(FLAT, fill_model="queue")
+    assert resolve_mm_params(FLAT, lob_levels=3.0).lob_levels == 3
+
+
+def test_repo_configs_resolve_once():
+    assert load_simulate_config("configs/mm_toy.yaml").params.policy == "baseline"
+    assert load_simulate_config("configs/as_toy.yaml").params.policy == "as"
+
+    stress = load_stress_config("configs/stress.yaml")
+    assert len(stress.runs) == 3 * 3 * 2 * 5 * 3
+    bench = load_benchmark_config("configs/benchmark.yaml")
+    assert len(bench.runs) == 3 * 5 * 2
+    # runs travel to workers as compact pickled params
+    assert pickle.loads(pickle.dumps(bench.runs[0])) == bench.runs[0]
+
+
+def test_cli_stress_writes_results(tmp_path, monkeypatch):
+    cfg = {
+        **{k: v for k, v in FLAT.items() if k not in ("A", "k")},
+        "T": 50.0, "out_csv": str(tmp_path / "stress.csv"),
+        "A_grid": [1.0], "k_grid": [1.0, 2.0], "seeds": [0, 1], "policies": ["baseline", "as"],
+    }
+    path = tmp_path / "stress.yaml"
+    path.write_text(yaml.safe_dump(cfg), encoding="utf-8")
+
+    main(["stress", "--config", str(path)])
+
+    df = pd.read_csv(tmp_path / "stress.csv")
+    assert len(df) == 8
+    assert {"A", "k", "seed", "policy", "pnl_final", "sharpe"} <= set(df.columns)
@@ -1,4 +1,7 @@
-from optimal_quoting.backtest.engine import MMParams, run_mm_toy
+import numpy as np
+
+from optimal_quoting.backtest.engine import MMParams, run_mm_toy, run_mm_toy_arrays
+from optimal_quoting.calibration.dataset import build_intensity_dataset_from_mm
 
 
 def test_run_mm_toy_runs():
@@ -18,3 +21,71 @@ def test_run_mm_toy_runs():
     df = run_mm_toy(p)
     assert len(df) > 5
     assert "equity" in df.columns
+
+
+def _crn_params(**kw) -> MMParams:
+    base = dict(
+        dt=1.0, T=200.0, mid0=100.0, sigma=0.02, A=1.2, k=1.0,
+        base_spread=0.2, phi=0.0, order_size=0.01, fee_bps=0.0, seed=7, rng_streams=True,
+    )
+    base.update(kw)
+    return MMParams(**base)
+
+
+def test_rng_streams_share_mid_path_across_policies():
+    base = run_mm_toy(_crn_params())
+    probing = run_mm_toy(_crn_params(policy="probing", probing_p=0.5, probing_jitter=0.5))
+
+    assert (base["mid"].to_numpy() == probing["mid"].to_numpy()).all()
+    assert not (base["bid"].to_numpy() == probing["bid"].to_numpy()).all()
+
+
+def test_antithetic_run_mirrors_mid_shocks():
+    up = run_mm_toy(_crn_params())["mid"].to_numpy()
+    down = run_mm_toy(_crn_params(antithetic=True))["mid"].to_numpy()
+
+    assert np.allclose(up - 100.0, -(down - 100.0))
+
+
+def test_tick_lattice_quotes_and_exact_inventory():
+    df = run_mm_toy(_crn_params(T=2000.0, tick_size=0.01, base_spread=0.2))
+
+    bid_ticks = df["bid"].to_numpy() / 0.01
+    ask_ticks = df["ask"].to_numpy() / 0.01
+    assert np.allclose(bid_ticks, np.round(bid_ticks))
+    assert np.allclose(ask_ticks, np.round(ask_ticks))
+    # snapping is outwards only
+    assert (df["mid"] - df["bid"] >= 0.1 - 1e-9).all()
+    assert (df["ask"] - df["mid"] >= 0.1 - 1e-9).all()
+
+    lots = np.cumsum(df["fill_bid"].astype(int) - df["fill_ask"].astype(int))
+    assert (df["inventory"].to_numpy() == lots.to_numpy() * 0.01).all()
+
+
+def test_inventory_limit_bounds_inventory_and_suppresses_sides():
+    p = _crn_params(T=3000.0, order_size=1.0, inv_limit=3.0)
+    df = run_mm_toy(p)
+
+    assert df["inventory"].abs().max() <= 3.0
+    # quotes at step t are set from the inventory carried in from step t-1
+    q_prev = df["inventory"].shift(1, fill_value=0.0)
+    at_long = q_prev >= 3.0
+    at_short = q_prev <= -3.0
+    assert at_long.any() or at_short.any()
+    assert df.loc[at_long, "bid"].isna().all()
+    assert not df.loc[at_long, "fill_bid"].any()
+    assert df.loc[at_short, "ask"].isna().all()
+    assert df.loc[~(at_long | at_short), ["bid", "ask"]].notna().all().all()
+
+    delta, _ = build_intensity_dataset_from_mm(df, dt=p.dt)
+    assert np.isfinite(delta).all()
+    assert len(delta) == 2 * len(df) - int(at_long.sum() + at_short.sum())
+
+
+def test_arrays_core_matches_frame():
+    p = _crn_params(policy="probing", T=300.0)
+    arrays = run_mm_toy_arrays(p)
+    df = run_mm_toy(p)
+    assert list(arrays) == list(df.columns)
+    for col, values in arrays.items():
+        assert np.array_equal(values, df[col].to_numpy(), equal_nan=True)
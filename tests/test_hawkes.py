@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from optimal_quoting.backtest.engine import run_mm_toy
+from optimal_quoting.calibration.hawkes import excitation_sums, fit_hawkes_mle, hawkes_loglik, hawkes_residuals
+from optimal_quoting.sim.hawkes import HawkesParams, simulate_hawkes
+
+
+def _naive_loglik(t: np.ndarray, T: float, p: HawkesParams) -> float:
+    lam = np.array([p.mu + p.alpha * np.sum(np.exp(-p.beta * (t[i] - t[:i]))) for i in range(t.size)])
+    comp = p.mu * T + (p.alpha / p.beta) * np.sum(1.0 - np.exp(-p.beta * (T - t)))
+    return float(np.sum(np.log(lam)) - comp)
+
+
+def test_simulated_rate_and_recursive_loglik():
+    p = HawkesParams(mu=0.5, alpha=0.6, beta=1.5)
+    t = simulate_hawkes(p, 20000.0, np.random.default_rng(1))
+
+    assert t.size / 20000.0 == pytest.approx(p.stationary_rate, rel=0.05)
+    assert np.all(np.diff(t) >= 0)
+
+    head = t[t < 1000.0]
+    assert hawkes_loglik(head, 1000.0, p) == pytest.approx(_naive_loglik(head, 1000.0, p), rel=1e-10)
+
+
+def test_excitation_sums_chunks_match_naive():
+    t = np.sort(np.random.default_rng(0).uniform(0.0, 300.0, 500))
+    for beta in (0.01, 1.0, 200.0):
+        naive = np.array([np.sum(np.exp(-beta * (t[i] - t[:i]))) for i in range(t.size)])
+        assert np.allclose(excitation_sums(t, beta, chunk=37), naive, rtol=1e-10, atol=1e-12)
+
+
+def test_mle_recovers_parameters():
+    p = HawkesParams(mu=0.4, alpha=0.9, beta=1.5)
+    T = 30000.0
+    t = simulate_hawkes(p, T, np.random.default_rng(3))
+    fit = fit_hawkes_mle(t, T)
+
+    assert fit.converged
+    assert fit.mu == pytest.approx(p.mu, rel=0.1)
+    assert fit.alpha / fit.beta == pytest.approx(p.branching_ratio, abs=0.05)
+    assert fit.beta == pytest.approx(p.beta, rel=0.2)
+
+    r = hawkes_residuals(t, T, fit.params)
+    assert r.mean() == pytest.approx(1.0, abs=0.02)
+
+
+def test_engine_hawkes_clusters_fills(mm_params):
+    poisson = run_mm_toy(mm_params(T=20000.0, A=0.3, seed=2))
+    hawkes = run_mm_toy(mm_params(T=20000.0, A=0.3, seed=2, hawkes_alpha=0.25, hawkes_beta=0.5))
+
+    def lag1(x):
+        x = x.to_numpy(dtype=float)
+        return np.corrcoef(x[:-1], x[1:])[0, 1]
+
+    assert abs(lag1(poisson["fill_bid"])) < 0.03
+    assert lag1(hawkes["fill_bid"]) > 0.1
+    assert hawkes["fill_bid"].mean() > poisson["fill_bid"].mean()
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+CORE_MODULES = [
+    "optimal_quoting.backtest.engine",
+    "optimal_quoting.backtest.multi_asset",
+    "optimal_quoting.calibration.mle",
+    "optimal_quoting.calibration.hawkes",
+    "optimal_quoting.metrics.performance",
+    "optimal_quoting.config",
+]
+HEAVY = ("pandas", "matplotlib", "yaml", "scipy")
+
+# Budget for importing the core modules in a fresh interpreter (numpy included).
+IMPORT_BUDGET_S = 0.5
+
+
+def _importtime() -> tuple[float, set[str]]:
+    """Total import time (s) and the imported module names, from `python -X importtime`."""
+    code = "import " + ", ".join(CORE_MODULES)
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    ).stderr
+    total_us = 0
+    names = set()
+    for line in out.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        total_us += int(self_us)
+        names.add(name.strip())
+    return total_us * 1e-6, names
+
+
+def test_core_path_does_not_import_heavy_dependencies():
+    _, names = _importtime()
+    loaded = sorted(n for n in names if n.split(".")[0] in HEAVY)
+    assert loaded == []
+
+
+def test_core_import_time_within_budget():
+    best = min(_importtime()[0] for _ in range(3))
+    assert best < IMPORT_BUDGET_S, f"core import took {best:.3f}s (budget {IMPORT_BUDGET_S}s)"
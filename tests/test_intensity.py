@@ -1,7 +1,9 @@
 import math
+
+import numpy as np
 import pytest
 
-from optimal_quoting.model.intensity import intensity_exp
+from optimal_quoting.model.intensity import get_intensity_family, intensity_exp
 
 
 def test_intensity_exp_basic():
@@ -16,3 +18,44 @@ def test_intensity_exp_monotone():
 def test_intensity_exp_invalid(A,k,delta):
     with pytest.raises(ValueError):
         intensity_exp(A,k,delta)
+
+
+@pytest.mark.parametrize("name", ["exp", "power", "logistic"])
+def test_family_value_at_mid_and_batch_shapes(name):
+    fam = get_intensity_family(name)
+    delta = np.linspace(0.0, 2.0, 50)
+    theta = np.array([[1.5, 0.5], [2.0, 1.0], [0.7, 3.0]])
+
+    lam = fam.intensity(theta, delta)
+    assert lam.shape == (3, 50)
+    assert np.allclose(lam[:, 0], theta[:, 0])
+    assert (np.diff(lam, axis=1) < 0).all()
+
+    n = (delta < 1.0).astype(float)
+    assert fam.loglik(theta, delta, n, dt=0.1).shape == (3,)
+    assert fam.grad(theta, delta, n, dt=0.1).shape == (3, 2)
+    assert fam.hess(theta, delta, n, dt=0.1).shape == (3, 2, 2)
+
+
+@pytest.mark.parametrize("name", ["exp", "power", "logistic"])
+def test_family_derivatives_match_finite_differences(name):
+    fam = get_intensity_family(name)
+    rng = np.random.default_rng(0)
+    delta = rng.random(200) * 2.0
+    n = rng.integers(0, 2, size=200).astype(float)
+    theta = np.array([1.1, 0.9])
+    eps = 1e-6
+
+    g = fam.grad(theta, delta, n, dt=0.1)
+    H = fam.hess(theta, delta, n, dt=0.1)
+    for i in range(2):
+        e = eps * np.eye(2)[i]
+        fd = (fam.loglik(theta + e, delta, n, 0.1) - fam.loglik(theta - e, delta, n, 0.1)) / (2 * eps)
+        fd_row = (fam.grad(theta + e, delta, n, 0.1) - fam.grad(theta - e, delta, n, 0.1)) / (2 * eps)
+        assert g[i] == pytest.approx(fd, rel=1e-5)
+        assert np.allclose(H[i], fd_row, rtol=1e-5)
+
+
+def test_family_unknown_name():
+    with pytest.raises(ValueError):
+        get_intensity_family("gamma")
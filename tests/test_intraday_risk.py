@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from optimal_quoting.backtest.engine import run_mm_toy
+from optimal_quoting.metrics.intraday import (
+    IntradayRiskConfig,
+    IntradayRiskMonitor,
+    MonotonicWindow,
+    RollingMoments,
+)
+
+
+def test_rolling_primitives_match_numpy():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=500)
+    w = 37
+
+    mom = RollingMoments(w)
+    mx = MonotonicWindow(w, mode="max")
+    mn = MonotonicWindow(w, mode="min")
+    for i, v in enumerate(x):
+        mom.push(v)
+        hi = mx.push(v)
+        lo = mn.push(v)
+        ref = x[max(0, i - w + 1) : i + 1]
+        assert hi == ref.max()
+        assert lo == ref.min()
+        assert mom.mean() == pytest.approx(ref.mean())
+        assert mom.std() == pytest.approx(ref.std(), abs=1e-9)
+
+
+def test_monitor_snapshots_without_limits_do_not_change_run(mm_params):
+    p = mm_params(seed=5)
+    mon = IntradayRiskMonitor(IntradayRiskConfig(window=100, snapshot_every=250, inv_limit=3.0))
+    df = run_mm_toy(p, monitor=mon)
+
+    assert df.equals(run_mm_toy(p))
+    snaps = mon.snapshot_frame()
+    assert len(snaps) == len(df) // 250
+    assert (snaps["rolling_drawdown"] <= 0).all()
+    assert (snaps["var"] >= 0).all()
+    assert ((snaps["frac_at_inv_limit"] >= 0) & (snaps["frac_at_inv_limit"] <= 1)).all()
+
+
+def test_monitor_stops_run_on_inventory_breach(mm_params):
+    mon = IntradayRiskMonitor(IntradayRiskConfig(window=100, snapshot_every=0, max_abs_inventory=2.0))
+    df = run_mm_toy(mm_params(seed=5), monitor=mon)
+
+    assert mon.breached and mon.breach_reason == "max_abs_inventory"
+    assert len(df) < 2001
+    assert abs(df["inventory"].iloc[-1]) > 2.0
+    assert (df["inventory"].iloc[:-1].abs() <= 2.0).all()
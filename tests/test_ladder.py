@@ -0,0 +1,98 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from optimal_quoting.calibration.ladder import fit_ladder_mle, ladder_from_taq, simulate_ladder
+from optimal_quoting.calibration.mle import fit_intensity_mle
+from optimal_quoting.data.schema import TopOfBookArray, TradeArray
+from optimal_quoting.model.intensity import get_intensity_family
+
+
+def _ns(ts_s):
+    return (np.asarray(ts_s, dtype=float) * 1e9).astype(np.int64).view("M8[ns]")
+
+
+def test_bit_packed_ladder_totals_match_dense_counts():
+    rng = np.random.default_rng(0)
+    lm = simulate_ladder(1.0, 1.0, np.linspace(0.0, 2.0, 5), 1.0, 1001, rng, chunk=64)
+
+    assert lm.nbytes == 2 * 126 * 5
+    e, f = lm.unpack()
+    assert e.shape == (1001, 5) and e.all()
+    n, w = lm.totals(chunk_rows=7)
+    np.testing.assert_array_equal(n, f.sum(axis=0))
+    np.testing.assert_array_equal(w, 1001)
+    # coupled levels: a fill at a wider level implies fills at every tighter one
+    assert (np.diff(f.astype(int), axis=1) <= 0).all()
+
+
+def test_joint_mle_is_unbiased_when_fills_are_frequent():
+    rng = np.random.default_rng(1)
+    lm = simulate_ladder(1.2, 1.0, np.linspace(0.0, 3.0, 13), 1.0, 200_000, rng)
+
+    fit = fit_ladder_mle(lm)
+    assert fit.converged
+    assert fit.A == pytest.approx(1.2, rel=0.02)
+    assert fit.k == pytest.approx(1.0, rel=0.02)
+
+    # the Poisson approximation on the same statistics underestimates A when λ dt ~ 1
+    delta, n, w = lm.samples()
+    assert fit_intensity_mle(delta, n, lm.dt, w=w).A < 0.9
+
+
+def test_ladder_from_taq_marks_levels_reached_per_step():
+    q = TopOfBookArray.empty(5)
+    q.data["ts"] = _ns([0, 1, 2, 3, 4])
+    q.data["bid"] = [99.9, 99.9, 100.1, 99.9, 99.9]      # locked book at t = 2
+    q.data["ask"] = [100.1, 100.1, 100.1, 100.1, 100.1]
+    q.data["bid_size"] = q.data["ask_size"] = np.nan
+
+    tr = TradeArray.empty(3)
+    tr.data["ts"] = _ns([0.5, 0.7, 3.5])
+    tr.data["price"] = [99.95, 99.7, 100.15]
+    tr.data["size"] = 1.0
+    tr.data["side"] = [-1, -1, 1]
+
+    lm = ladder_from_taq(q, tr, [0.0, 0.2], dt=1.0)
+    e, f = lm.unpack()
+
+    # columns: bid 0.0, bid 0.2, ask 0.0, ask 0.2
+    np.testing.assert_array_equal(e[:, 0], [True, True, False, True])
+    np.testing.assert_array_equal(f[0], [True, True, False, False])
+    np.testing.assert_array_equal(f[3], [False, False, True, False])
+    assert f[1:3].sum() == 0
+
+
+def test_failed_line_search_is_not_reported_as_converged():
+    # wrong k-derivatives: Newton directions do not increase the likelihood
+    exp = get_intensity_family("exp")
+
+    def flipped(delta, k, order=0):
+        hs = exp.log_shape(delta, k, order=order)
+        return (hs[0], *(-h for h in hs[1:]))
+
+    lm = simulate_ladder(1.2, 1.0, np.linspace(0.0, 3.0, 13), 1.0, 20_000, np.random.default_rng(1))
+    assert not fit_ladder_mle(lm, family=replace(exp, log_shape=flipped)).converged
+
+
+def test_ladder_from_taq_does_not_depend_on_chunking():
+    rng = np.random.default_rng(2)
+    q = TopOfBookArray.empty(500)
+    q.data["ts"] = _ns(np.concatenate([[0.0], np.sort(rng.random(499)) * 100]))
+    mid = 100 + np.cumsum(rng.normal(0, 0.01, 500))
+    half = rng.choice([0.01, 0.02, -0.005], 500, p=[0.5, 0.4, 0.1])
+    q.data["bid"], q.data["ask"] = mid - half, mid + half
+    q.data["bid_size"] = q.data["ask_size"] = np.nan
+
+    tr = TradeArray.empty(800)
+    tr.data["ts"] = _ns(np.sort(rng.random(800)) * 100)
+    tr.data["price"] = 100 + rng.normal(0, 0.1, 800)
+    tr.data["size"] = 1.0
+    tr.data["side"] = rng.choice([-1, 1], 800)
+
+    ref = ladder_from_taq(q, tr, np.linspace(0.0, 0.1, 8), dt=0.3, max_staleness=1.0)
+    small = ladder_from_taq(q, tr, np.linspace(0.0, 0.1, 8), dt=0.3, max_staleness=1.0, chunk=8)
+    np.testing.assert_array_equal(ref.exposure, small.exposure)
+    np.testing.assert_array_equal(ref.fills, small.fills)
+    assert 0 < ref.fills.sum() < ref.exposure.sum()
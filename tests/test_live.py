@@ -0,0 +1,56 @@
+import asyncio
+import math
+
+import numpy as np
+
+from optimal_quoting.live.gateway import ASK, BID
+from optimal_quoting.live.mock_exchange import MockExchange, MockExchangeConfig
+from optimal_quoting.live.quoting import QuotingService, policy_quoter, run_mock_session
+
+
+def test_mock_exchange_fill_rate_matches_intensity():
+    cfg = MockExchangeConfig(dt=1.0, mid0=100.0, sigma=0.0, A=1.0, k=1.0, seed=3)
+    fills = []
+    ex = MockExchange(cfg, on_fill=fills.append)
+
+    async def quote_fixed(n: int) -> None:
+        async for tick in ex.feed(n):
+            await ex.replace(BID, tick.mid - 0.5, 1.0)
+            await ex.replace(ASK, tick.mid + 0.5, 1.0)
+
+    n = 20_000
+    asyncio.run(quote_fixed(n))
+
+    expected = -math.expm1(-math.exp(-0.5))
+    for side in (BID, ASK):
+        rate = sum(f.side == side for f in fills) / (n - 1)
+        assert abs(rate - expected) < 0.02
+
+
+def test_mock_session_accounts_fills_and_messages(mm_params):
+    st = run_mock_session(mm_params(order_size=0.01, seed=0))
+
+    assert st.ticks == 2001
+    assert st.fills > 0
+    assert st.messages == 2 * st.ticks   # baseline quotes both sides every tick
+    assert math.isfinite(st.equity)
+    lat = list(st.latency_us.values())
+    assert list(st.latency_us) == ["p50", "p90", "p99", "p99.9"]
+    assert lat == sorted(lat) and lat[0] > 0
+
+
+def test_inventory_limit_pulls_the_side_at_the_limit(mm_params):
+    p = mm_params(order_size=0.01, seed=0, A=5.0, base_spread=0.0, inv_limit=0.03)
+    ex = MockExchange(MockExchangeConfig.from_params(p))
+    svc = QuotingService(ex, policy_quoter(p), p.order_size, inv_limit=p.inv_limit)
+    inv = []
+
+    def on_fill(fill):
+        svc.on_fill(fill)
+        inv.append(svc.inventory)
+
+    ex.on_fill = on_fill
+    asyncio.run(svc.run(ex.feed(3000)))
+
+    # the limit is reached but never crossed
+    assert np.isclose(np.max(np.abs(inv)), 0.03)
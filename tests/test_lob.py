@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from optimal_quoting.backtest.engine import run_mm_toy
+from optimal_quoting.sim.lob import ASK, BID, LOBConfig, LOBSimulator
+
+
+def _quiet_book(**kw) -> LOBSimulator:
+    cfg = dict(tick_size=0.01, n_levels=10, limit_rate=5.0, cancel_rate=1e-12, mo_rate=0.0, mo_size=1)
+    cfg.update(kw)
+    return LOBSimulator(LOBConfig(**cfg), dt=1.0, mid0=100.0, rng=np.random.default_rng(0))
+
+
+def test_mid_move_shifts_ring_buffer():
+    book = _quiet_book(limit_rate=0.0)
+    bid0, ask0 = book.depth(BID).copy(), book.depth(ASK).copy()
+
+    book.step(100.03, None, None)       # touch moves up 3 ticks on both sides
+
+    assert np.array_equal(book.depth(BID)[3:], bid0[:-3])
+    assert np.array_equal(book.depth(ASK)[:-3], ask0[3:])
+
+
+def test_fill_only_after_queue_ahead_is_consumed():
+    book = _quiet_book(limit_rate=0.0, mo_rate=0.7, mo_size=3)
+    touch_bid = book.touch[BID]
+    ahead0 = int(book.depth(BID)[0])
+    total0 = int(book.vol[BID].sum())
+
+    for _ in range(500):
+        filled, _ = book.step(100.0, touch_bid, None)
+        removed = total0 - int(book.vol[BID].sum())
+        if filled:
+            assert removed >= ahead0
+            break
+        assert removed <= ahead0
+        assert book.ahead[BID] == ahead0 - removed
+    else:
+        pytest.fail("order never filled")
+
+
+def test_engine_lob_fill_model(mm_params):
+    lob = dict(sigma=0.002, base_spread=0.04, tick_size=0.01, fill_model="lob", lob_mo_rate=1.0, inv_limit=3.0)
+    df = run_mm_toy(mm_params(**lob))
+    assert 0 < df["fill_bid"].sum() < len(df)
+    assert df["inventory"].abs().max() <= 3.0
+
+    with pytest.raises(ValueError):
+        run_mm_toy(mm_params(**{**lob, "tick_size": 0.0}))
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_order_scrolling_back_into_the_book_queues_behind_fresh_volume(seed):
+    # a bid held while the touch moves more than n_levels ticks: it rests
+    # outside the tracked depth, then the touch comes back down to it
+    cfg = LOBConfig(tick_size=0.01, n_levels=5, limit_rate=1.0, cancel_rate=0.2, mo_rate=0.0)
+    book = LOBSimulator(cfg, dt=1.0, mid0=100.08, rng=np.random.default_rng(seed))
+    tick = book.touch[BID] - 8
+    for mid in (100.08,) * 3 + (100.0,) * 10:
+        book.step(mid, tick, None)
+        level = book._level_of(BID, tick)
+        if 0 <= level < cfg.n_levels:
+            assert 0 <= book.ahead[BID] <= book.depth(BID)[level]
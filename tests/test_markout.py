@@ -0,0 +1,32 @@
+import numpy as np
+
+from optimal_quoting.metrics.markout import MarkoutTracker, markouts_from_path
+
+
+def test_streaming_matches_offline():
+    rng = np.random.default_rng(0)
+    n = 400
+    mid = 100.0 + np.cumsum(rng.normal(0.0, 0.05, n))
+    count = rng.integers(0, 2, n)
+    qty = count * rng.choice([-1.0, 1.0], n)
+    notional = qty * (mid - 0.1 * qty)
+
+    mk = MarkoutTracker([0, 3, 25])
+    for t in range(n):
+        mk.update(mid[t], qty[t], notional[t], count[t])
+
+    pnl, fills = markouts_from_path(mid, qty, notional, count, [0, 3, 25])
+    assert np.allclose(mk.pnl, pnl)
+    assert np.array_equal(mk.fills, fills)
+    assert np.allclose(mk.per_fill()[0], 0.1)
+
+
+def test_batched_frame_layout():
+    mk = MarkoutTracker([1, 2], shape=(3,))
+    for t in range(5):
+        mk.update(np.full(3, 100.0 + t), np.ones(3), np.full(3, 100.0 + t), np.ones(3, dtype=int))
+
+    df = mk.frame(dt=0.5)
+    assert len(df) == 6
+    assert list(df["horizon_s"].unique()) == [0.5, 1.0]
+    assert np.allclose(df.loc[df.horizon_steps == 2, "markout_per_fill"], 2.0)
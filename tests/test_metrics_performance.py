@@ -1,7 +1,8 @@
 import numpy as np
 import pandas as pd
+import pytest
 
-from optimal_quoting.metrics.performance import performance_summary
+from optimal_quoting.metrics.performance import performance_summary, performance_summary_batch
 
 
 def test_performance_summary_smoke():
@@ -14,3 +15,16 @@ def test_performance_summary_smoke():
     out = performance_summary(df)
     assert "pnl_final" in out
     assert "sharpe" in out
+
+
+def test_performance_summary_batch_matches_per_run():
+    rng = np.random.default_rng(0)
+    equity = np.cumsum(rng.normal(size=(4, 200)), axis=1)
+    inventory = rng.integers(-3, 4, size=(4, 200)).astype(float)
+
+    batch = performance_summary_batch(equity, inventory)
+
+    for i in range(4):
+        single = performance_summary(pd.DataFrame({"equity": equity[i], "inventory": inventory[i]}))
+        for key, value in single.items():
+            assert batch[key][i] == pytest.approx(value)
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from optimal_quoting.backtest.multi_asset import MultiAssetParams, multi_asset_summary, run_mm_multi
+
+
+@pytest.fixture
+def multi_params(mm_params):
+    def make(corr: np.ndarray, **kw) -> MultiAssetParams:
+        return mm_params(MultiAssetParams, T=3000.0, corr=corr, seed=3, block=256, **kw)
+
+    return make
+
+
+def test_correlated_mids_and_shapes(multi_params):
+    corr = np.array([[1.0, 0.8, 0.0], [0.8, 1.0, 0.0], [0.0, 0.0, 1.0]])
+    res = run_mm_multi(multi_params(corr))
+
+    assert res.mid.shape == (3001, 3)
+    assert res.inventory.shape == res.equity.shape == (3001, 3)
+    c = np.corrcoef(np.diff(res.mid, axis=0).T)
+    assert c[0, 1] == pytest.approx(0.8, abs=0.05)
+    assert abs(c[0, 2]) < 0.08
+
+
+def test_inventory_limit_and_summary_rows(multi_params):
+    corr = np.eye(4)
+    res = run_mm_multi(multi_params(corr, inv_limit=[2.0, 2.0, 5.0, 5.0]))
+
+    assert np.abs(res.inventory[:, :2]).max() <= 2.0
+    assert np.abs(res.inventory[:, 2:]).max() <= 5.0
+
+    summary = multi_asset_summary(res)
+    assert list(summary["asset"]) == ["0", "1", "2", "3", "portfolio"]
+    assert summary["pnl_final"].iloc[-1] == pytest.approx(summary["pnl_final"].iloc[:-1].sum())
+
+
+def test_invalid_corr_rejected(multi_params):
+    with pytest.raises(ValueError):
+        run_mm_multi(multi_params(np.array([[1.0, 0.5], [0.2, 1.0]])))
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from optimal_quoting.backtest.engine import MMParams
+from optimal_quoting.config import load_optimize_config
+from optimal_quoting.experiments.optimizer import (
+    OptimizerConfig,
+    SearchDim,
+    optimize_policy,
+    sample_candidates,
+)
+
+BASE = MMParams(
+    dt=1.0, T=1000.0, mid0=100.0, sigma=0.02, A=1.2, k=1.0,
+    base_spread=0.2, phi=0.0, order_size=0.01, fee_bps=0.0,
+)
+SPACE = (SearchDim("base_spread", 0.1, 4.0),)
+
+
+def test_latin_hypercube_covers_every_stratum():
+    cfg = OptimizerConfig(space=(SearchDim("gamma", 0.01, 100.0, log=True),), seeds=(0,), n_candidates=8)
+    import numpy as np
+
+    u = np.log10([c["gamma"] for c in sample_candidates(cfg)])   # [-2, 2]
+    assert sorted(np.floor((u + 2.0) / 0.5).astype(int)) == list(range(8))
+
+
+def test_successive_halving_schedule_and_optimum():
+    cfg = OptimizerConfig(space=SPACE, seeds=tuple(range(9)), n_candidates=9, eta=3)
+    res = optimize_policy(BASE, cfg)
+
+    # rung 0: 9 x 1 seed, rung 1: 3 x 3 (seed 0 reused), rung 2: 1 x 9
+    assert res.n_runs == 9 + 3 * 2 + 6
+    df = res.frame()
+    assert df["rung"].value_counts().sort_index().tolist() == [6, 2, 1]
+    assert df.iloc[0]["n_seeds"] == 9
+    # λ(δ) δ is maximized at δ = 1 / k, i.e. base_spread = 2
+    assert 1.0 <= res.best["base_spread"] <= 3.5
+
+
+def test_checkpoint_resume_and_budget(tmp_path):
+    ckpt = tmp_path / "opt.json"
+    small = OptimizerConfig(space=SPACE, seeds=tuple(range(9)), n_candidates=9, budget=12)
+    partial = optimize_policy(BASE, small, checkpoint=ckpt)
+    assert partial.n_runs == 9          # rung 1 (15 runs in total) does not fit in 12
+    assert len(json.loads(ckpt.read_text())["results"]) == 9
+
+    full = optimize_policy(BASE, OptimizerConfig(space=SPACE, seeds=tuple(range(9)), n_candidates=9),
+                           workers=2, checkpoint=ckpt)
+    assert full.n_new_runs == full.n_runs - 9
+    fresh = optimize_policy(BASE, OptimizerConfig(space=SPACE, seeds=tuple(range(9)), n_candidates=9))
+    assert fresh.best == full.best and fresh.best_objective == pytest.approx(full.best_objective)
+    # a smaller budget than the checkpoint already holds: replay, run nothing new
+    replay = optimize_policy(BASE, small, checkpoint=ckpt)
+    assert replay.n_new_runs == 0 and replay.best == full.best
+
+    with pytest.raises(ValueError, match="different search"):
+        optimize_policy(BASE, OptimizerConfig(space=SPACE, seeds=tuple(range(9)), n_candidates=5), checkpoint=ckpt)
+    with pytest.raises(ValueError, match="too small"):
+        optimize_policy(BASE, OptimizerConfig(space=SPACE, seeds=(0,), n_candidates=9, budget=5))
+
+
+def test_invalid_search_rejected():
+    with pytest.raises(ValueError, match="float MMParams"):
+        optimize_policy(BASE, OptimizerConfig(space=(SearchDim("policy", 0.0, 1.0),), seeds=(0,)))
+    with pytest.raises(ValueError, match="log"):
+        optimize_policy(BASE, OptimizerConfig(space=(SearchDim("phi", 0.0, 1.0, log=True),), seeds=(0,)))
+
+
+def test_repo_optimize_config():
+    spec = load_optimize_config("configs/optimize.yaml")
+    assert [d.name for d in spec.optimizer.space] == ["base_spread", "phi"]
+    assert spec.base.policy == "baseline"
+    assert spec.optimizer.budget == 100
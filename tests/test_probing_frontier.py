@@ -0,0 +1,48 @@
+import numpy as np
+
+from optimal_quoting.backtest.engine import MMParams
+from optimal_quoting.experiments.probing_frontier import (
+    AdaptiveFrontierConfig,
+    _refine_points,
+    run_probing_frontier_adaptive,
+    summarize_frontier_cells,
+)
+
+
+def _base() -> MMParams:
+    return MMParams(
+        dt=1.0, T=300.0, mid0=100.0, sigma=0.02, A=1.2, k=1.0,
+        base_spread=0.2, phi=0.0, order_size=0.01, fee_bps=0.0,
+    )
+
+
+def test_adaptive_frontier_stops_converged_cells_at_min_seeds():
+    cfg = AdaptiveFrontierConfig(
+        p_grid=[0.0, 0.3], jitter_grid=[0.5], seeds=list(range(8)),
+        pnl_tol=1e9, kerr_tol=1e9, min_seeds=3, refine_rounds=0,
+    )
+    cells = summarize_frontier_cells(run_probing_frontier_adaptive(_base(), cfg))
+
+    assert (cells["n_seeds"] == 3).all()
+
+
+def test_adaptive_frontier_uses_full_budget_when_tolerance_unreachable():
+    cfg = AdaptiveFrontierConfig(
+        p_grid=[0.0, 0.3], jitter_grid=[0.5], seeds=list(range(6)),
+        pnl_tol=0.0, kerr_tol=0.0, min_seeds=3, refine_rounds=0,
+    )
+    df = run_probing_frontier_adaptive(_base(), cfg)
+
+    assert len(df) == 12
+    assert {"pnl_final", "k_abs_error", "sharpe"} <= set(df.columns)
+
+
+def test_refine_points_targets_the_bend():
+    p_grid = [0.0, 0.1, 0.2, 0.3, 0.4]
+    # straight line, then a sharp corner at p=0.3
+    kerr = np.array([[1.0], [0.8], [0.6], [0.4], [0.4]])
+    pnl = np.array([[0.0], [0.2], [0.4], [0.6], [0.0]])
+
+    new = _refine_points(p_grid, kerr, pnl, angle_deg=30.0, max_new=4)
+
+    assert np.allclose(new, [0.25, 0.35])
@@ -1,6 +1,7 @@
 import numpy as np
 
 from optimal_quoting.strategy.probing import ProbingConfig, compute_probing_quotes
+from optimal_quoting.strategy.quotes import compute_quotes, inventory_limit_sides, suppress_sides
 
 
 def test_probing_widens_deltas_when_enabled():
@@ -15,3 +16,15 @@ def test_probing_widens_deltas_when_enabled():
     quotes = compute_probing_quotes(mid, q, base_spread, phi, cfg, rng)
     assert quotes.delta_bid >= 0.1
     assert quotes.delta_ask >= 0.1
+
+
+def test_suppress_sides_and_inventory_limit():
+    quotes = compute_quotes(100.0, 0.0, 0.2, 0.0)
+
+    assert inventory_limit_sides(q_lots=5, max_lots=5) == (False, True)
+    assert inventory_limit_sides(q_lots=-5, max_lots=5) == (True, False)
+    assert inventory_limit_sides(q_lots=0, max_lots=None) == (True, True)
+
+    one_sided = suppress_sides(quotes, bid=False)
+    assert one_sided.bid is None and one_sided.delta_bid is None
+    assert one_sided.ask == quotes.ask
@@ -0,0 +1,79 @@
+import numpy as np
+
+from optimal_quoting.backtest.engine import run_mm_toy_arrays
+from optimal_quoting.metrics.performance import messages_per_fill
+from optimal_quoting.sim.lob import ASK, BID
+from optimal_quoting.strategy.quote_manager import CANCEL, REPLACE, QuoteManager, QuoteManagerConfig
+
+
+def test_moves_within_tolerance_are_suppressed():
+    qm = QuoteManager(QuoteManagerConfig(tolerance=0.05))
+
+    assert qm.update(BID, 99.90, 0.0) == REPLACE
+    assert qm.update(BID, 99.93, 1.0) is None
+    assert qm.update(BID, 99.96, 2.0) == REPLACE
+    assert qm.resting[BID] == 99.96
+    assert (qm.n_replace, qm.n_suppressed) == (2, 1)
+
+
+def test_sub_tick_moves_are_suppressed():
+    qm = QuoteManager(QuoteManagerConfig(tick_size=0.01))
+
+    assert qm.update(ASK, 100.10, 0.0) == REPLACE
+    assert qm.update(ASK, 100.105, 1.0) is None
+    assert qm.update(ASK, 100.11, 2.0) == REPLACE
+
+
+def test_rate_limit_throttles_but_never_blocks_cancels():
+    qm = QuoteManager(QuoteManagerConfig(max_rate=1.0, burst=2))
+
+    assert qm.update(BID, 99.0, 0.0) == REPLACE
+    assert qm.update(ASK, 101.0, 0.0) == REPLACE
+    assert qm.update(BID, 98.0, 0.0) is None          # bucket empty
+    assert qm.update(ASK, None, 0.0) == CANCEL
+    assert qm.update(BID, 98.0, 1.0) == REPLACE       # one token refilled
+    assert qm.n_throttled == 1 and qm.n_messages == 4
+
+
+def test_fill_consumes_the_resting_quote():
+    qm = QuoteManager()
+    qm.update(BID, 99.9, 0.0)
+    qm.on_fill(BID)
+
+    assert qm.resting[BID] is None
+    assert qm.update(BID, 99.9, 1.0) == REPLACE
+
+
+def test_engine_tolerance_cuts_messages_per_fill(mm_params):
+    def mpf(out):
+        return messages_per_fill(out["messages"], out["fill_bid"], out["fill_ask"])
+
+    every = run_mm_toy_arrays(mm_params(T=3000.0, order_size=0.01, seed=1))
+    lazy = run_mm_toy_arrays(mm_params(T=3000.0, order_size=0.01, seed=1, quote_tolerance=0.05))
+
+    assert every["messages"].max() <= 2
+    assert lazy["messages"].sum() < every["messages"].sum()
+    assert mpf(lazy) < mpf(every)
+    # a kept quote is never more than the tolerance away from the fresh one
+    live = ~np.isnan(lazy["bid"])
+    assert np.all(np.abs(lazy["mid"][live] - lazy["bid"][live] - 0.1) <= 0.05 + 1e-9)
+
+
+def test_messages_per_fill_without_fills_is_nan():
+    assert np.isnan(messages_per_fill(np.array([2, 2]), np.zeros(2, bool), np.zeros(2, bool)))
+
+
+def test_engine_tolerance_with_lob_fills(mm_params):
+    # kept quotes rest at a fixed tick while the book scrolls, possibly
+    # beyond lob_levels and back
+    lob = dict(
+        T=400.0, sigma=0.01, base_spread=0.05, order_size=0.01, fill_model="lob", tick_size=0.01,
+        lob_cancel_rate=0.05, lob_levels=5,
+    )
+    n_fills = 0
+    for seed in range(6):
+        every = run_mm_toy_arrays(mm_params(seed=seed, **lob))
+        lazy = run_mm_toy_arrays(mm_params(seed=seed, quote_tolerance=0.02, **lob))
+        assert lazy["messages"].sum() < every["messages"].sum()
+        n_fills += int(lazy["fill_bid"].sum() + lazy["fill_ask"].sum())
+    assert n_fills > 0
@@ -0,0 +1,97 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from optimal_quoting import report
+from optimal_quoting.report import FIGURES, build_report
+
+FRONTIER = ["frontier_pnl_heatmap", "frontier_inv_heatmap", "frontier_kerr_heatmap", "frontier_pnl_vs_kerr"]
+
+
+def _frontier_table(scale: float = 1.0) -> pd.DataFrame:
+    rows = [
+        {"p_explore": p, "jitter": j, "seed": s, "pnl_final": scale * (p + j + s),
+         "inv_max_abs": 0.1 * s, "k_abs_error": j}
+        for p, j, s in itertools.product([0.0, 0.2], [0.0, 0.1], [0, 1])
+    ]
+    return pd.DataFrame(rows)
+
+
+def _probing_table(k_hat: float = 1.1) -> pd.DataFrame:
+    return pd.DataFrame({"name": ["baseline", "probing"], "k_hat": [k_hat, 1.0], "k_true": [1.0, 1.0]})
+
+
+def test_only_figures_of_changed_tables_are_rebuilt(tmp_path):
+    _frontier_table().to_csv(tmp_path / "frontier_results.csv", index=False)
+    _probing_table().to_csv(tmp_path / "probing_results.csv", index=False)
+
+    first = build_report(tmp_path, workers=2)
+    assert set(first.rendered) == set(FRONTIER) | {"probing_khat_comparison"}
+    assert "intensity_fit" in first.missing_tables
+    assert all((tmp_path / "figures" / f"{n}.png").exists() for n in first.rendered)
+
+    again = build_report(tmp_path)
+    assert again.rendered == ()
+
+    _probing_table(k_hat=1.3).to_csv(tmp_path / "probing_results.csv", index=False)
+    third = build_report(tmp_path)
+    assert third.rendered == ("probing_khat_comparison",)
+    assert set(third.up_to_date) == set(FRONTIER)
+
+
+def test_missing_png_and_force_trigger_rebuilds(tmp_path):
+    _frontier_table().to_csv(tmp_path / "frontier_results.csv", index=False)
+    build_report(tmp_path, figures=FRONTIER)
+
+    (tmp_path / "figures" / "frontier_pnl_heatmap.png").unlink()
+    assert build_report(tmp_path, figures=FRONTIER).rendered == ("frontier_pnl_heatmap",)
+    assert set(build_report(tmp_path, figures=FRONTIER, force=True).rendered) == set(FRONTIER)
+
+
+def test_html_lists_tables_and_available_figures(tmp_path):
+    _frontier_table().to_csv(tmp_path / "frontier_results.csv", index=False)
+    res = build_report(tmp_path, figures=["frontier_pnl_heatmap"])
+
+    page = res.html.read_text(encoding="utf-8")
+    assert "frontier_results.csv" in page
+    assert 'src="figures/frontier_pnl_heatmap.png"' in page
+    assert "probing_khat_comparison" not in page
+    assert set(FIGURES) >= set(FRONTIER)
+
+
+def test_editing_a_shared_helper_rebuilds_its_figures(tmp_path, monkeypatch):
+    _frontier_table().to_csv(tmp_path / "frontier_results.csv", index=False)
+    _probing_table().to_csv(tmp_path / "probing_results.csv", index=False)
+    build_report(tmp_path)
+
+    heatmap = report._heatmap_mean
+
+    def edited_heatmap(df, value_col, title, out_path):
+        heatmap(df, value_col, title.upper(), out_path)
+
+    monkeypatch.setattr(report, "_heatmap_mean", edited_heatmap)
+    res = build_report(tmp_path)
+    assert set(res.rendered) == {"frontier_pnl_heatmap", "frontier_inv_heatmap", "frontier_kerr_heatmap"}
+
+
+def test_editing_a_helper_imported_by_a_renderer_rebuilds_its_figure(tmp_path, monkeypatch):
+    from optimal_quoting.calibration import diagnostics
+
+    pd.DataFrame([{"A_true": 1.2, "k_true": 1.0, "A_hat": 1.1, "k_hat": 0.9, "nll": 0.0, "dt": 1.0}]).to_csv(
+        tmp_path / "calibration_fit.csv", index=False
+    )
+    delta = np.random.default_rng(0).random(2000)
+    pd.DataFrame({"delta": delta, "n": (np.arange(len(delta)) % 3 == 0).astype(int)}).to_csv(
+        tmp_path / "calibration_samples.csv", index=False
+    )
+    calibration = ["intensity_fit", "intensity_empirical_fit", "intensity_profile_nll"]
+    build_report(tmp_path, figures=calibration)
+
+    binned = diagnostics.empirical_intensity_binned
+
+    def edited_binned(*args, **kwargs):
+        return binned(*args, **kwargs)
+
+    monkeypatch.setattr(diagnostics, "empirical_intensity_binned", edited_binned)
+    assert build_report(tmp_path, figures=calibration).rendered == ("intensity_empirical_fit",)
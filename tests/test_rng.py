@@ -0,0 +1,55 @@
+from dataclasses import asdict
+
+import numpy as np
+import pytest
+
+from optimal_quoting.backtest.engine import run_mm_toy_arrays
+from optimal_quoting.config import load_stress_config, resolve_mm_params
+from optimal_quoting.sim.rng import experiment_entropy, seed_sequence, sweep_seed
+
+
+def test_experiment_entropy_is_stable():
+    # sha256-based: the same on every machine / interpreter
+    assert experiment_entropy("stress") == 179296889368767543710887076488976809460
+    assert experiment_entropy("stress") != experiment_entropy("stress2")
+    with pytest.raises(ValueError):
+        experiment_entropy("")
+
+
+def test_sweep_seed_is_the_spawned_child():
+    fields = sweep_seed("bench", cell=3, replicate=5)
+    direct = seed_sequence(fields["seed"], fields["spawn_key"])
+
+    root = np.random.SeedSequence(experiment_entropy("bench"))
+    child = root.spawn(4)[3].spawn(6)[5]
+    np.testing.assert_array_equal(direct.generate_state(8), child.generate_state(8))
+
+    # empty key: same stream as a plain integer seed
+    assert np.random.default_rng(seed_sequence(7)).random() == np.random.default_rng(7).random()
+    with pytest.raises(ValueError):
+        sweep_seed("bench", cell=-1, replicate=0)
+
+
+def test_keyed_runs_are_reproducible_and_distinct(mm_params):
+    p = mm_params(T=200.0, order_size=0.01, **sweep_seed("exp", 2, 1))
+    again = resolve_mm_params({**asdict(p), "spawn_key": [2, 1]})
+    assert again == p
+    np.testing.assert_array_equal(run_mm_toy_arrays(p)["equity"], run_mm_toy_arrays(again)["equity"])
+
+    other = mm_params(T=200.0, order_size=0.01, **sweep_seed("exp", 2, 2))
+    assert not np.array_equal(run_mm_toy_arrays(p)["mid"], run_mm_toy_arrays(other)["mid"])
+    with pytest.raises(ValueError, match="spawn_key"):
+        resolve_mm_params({**asdict(p), "spawn_key": ["a"]})
+
+
+def test_stress_runs_keyed_by_regime_and_seed():
+    spec = load_stress_config("configs/stress.yaml")
+    keys = {}
+    for run in spec.runs:
+        labels = dict(run.labels)
+        regime_seed = (labels["A"], labels["k"], labels["hawkes_alpha"], labels["seed"])
+        keys.setdefault(regime_seed, set()).add((run.params.seed, run.params.spawn_key))
+    # policies share the streams of a (regime, seed); every pair has its own key
+    assert all(len(k) == 1 for k in keys.values())
+    assert len({next(iter(k)) for k in keys.values()}) == len(keys)
+    assert {run.params.seed for run in spec.runs} == {experiment_entropy("stress")}
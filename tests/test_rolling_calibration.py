@@ -0,0 +1,51 @@
+import numpy as np
+
+from optimal_quoting.calibration.mle import fit_intensity_mle
+from optimal_quoting.calibration.rolling import (
+    detect_change_points,
+    fit_intensity_rolling,
+    intensity_prefix_stats,
+)
+
+
+def _regime_switch_data(T: int, dt: float, seed: int):
+    rng = np.random.default_rng(seed)
+    delta = rng.random((T, 2)) * 2.0
+    k = np.where(np.arange(T) < T // 2, 1.0, 2.0)[:, None]
+    lam = 1.2 * np.exp(-k * delta)
+    n = (rng.random((T, 2)) < 1.0 - np.exp(-lam * dt)).astype(float)
+    return delta, n
+
+
+def test_prefix_stats_totals():
+    delta, n = _regime_switch_data(T=1000, dt=0.1, seed=0)
+    stats = intensity_prefix_stats(delta, n, dt=0.1, block=100, nbins=10)
+
+    assert stats.n_blocks == 10
+    assert stats.exposure[-1].sum() == delta.size
+    assert stats.counts[-1].sum() == n.sum()
+
+
+def test_rolling_fit_tracks_regime_and_matches_global_fit():
+    dt = 0.1
+    delta, n = _regime_switch_data(T=200_000, dt=dt, seed=1)
+
+    roll = fit_intensity_rolling(delta, n, dt=dt, window=20_000, step=1_000, k_bounds=(0.0, 5.0))
+
+    assert roll.k.shape == (181,)
+    assert abs(np.median(roll.k[roll.end <= 100_000]) - 1.0) < 0.15
+    assert abs(np.median(roll.k[roll.start >= 100_000]) - 2.0) < 0.3
+
+    # binning only costs a little accuracy vs the exact per-sample fit
+    ref = fit_intensity_mle(delta[:20_000].ravel(), n[:20_000].ravel(), dt=dt, k_bounds=(0.0, 5.0))
+    assert abs(roll.k[0] - ref.k) < 0.05
+
+
+def test_change_point_detection():
+    dt = 0.1
+    delta, n = _regime_switch_data(T=200_000, dt=dt, seed=2)
+
+    cps = detect_change_points(delta, n, dt=dt, block=2_000, k_bounds=(0.0, 5.0))
+
+    assert len(cps) == 1
+    assert abs(cps[0] - 100_000) <= 4_000
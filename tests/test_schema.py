@@ -0,0 +1,72 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from optimal_quoting.data.loader import CSVSpec, load_top_of_book_csv
+from optimal_quoting.data.schema import TopOfBook, TopOfBookArray, Trade, TradeArray
+
+
+def _top_frame(n: int = 4) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "ts": pd.date_range("2025-01-01", periods=n, freq="s"),
+            "bid": 100.0 + 0.1 * np.arange(n),
+            "ask": 100.2 + 0.1 * np.arange(n),
+        }
+    )
+
+
+def test_top_of_book_array_is_packed_and_vectorized():
+    tob = TopOfBookArray.from_frame(_top_frame())
+
+    assert tob.data.dtype.itemsize == 40
+    assert tob.nbytes == 4 * 40
+    np.testing.assert_allclose(tob.mid(), 100.1 + 0.1 * np.arange(4))
+    np.testing.assert_allclose(tob.spread(), 0.2)
+    assert np.isnan(tob.bid_size).all()
+
+
+def test_to_frame_shares_memory():
+    tob = TopOfBookArray.from_frame(_top_frame())
+    df = tob.to_frame()
+
+    assert np.shares_memory(df["bid"].to_numpy(), tob.data)
+    tob.bid[0] = 99.0
+    assert df["bid"].iloc[0] == 99.0
+
+
+def test_loader_frame_roundtrip(tmp_path):
+    p = tmp_path / "top.csv"
+    pd.DataFrame(
+        {"timestamp": ["2025-01-01 00:00:00", "2025-01-01 00:00:01"], "bid": [100.0, 100.1],
+         "ask": [100.2, 100.3], "bs": [5.0, 6.0], "as": [7.0, 8.0]}
+    ).to_csv(p, index=False)
+    df = load_top_of_book_csv(p, CSVSpec(bid_size_col="bs", ask_size_col="as"))
+
+    back = TopOfBookArray.from_frame(df).to_frame()
+
+    pd.testing.assert_frame_equal(back, df, check_dtype=False)
+
+
+def test_indexing_returns_records_and_views():
+    t0 = datetime(2025, 1, 1, 9, 30)
+    rec = TopOfBook(ts=t0, bid=99.9, ask=100.1, bid_size=3.0)
+    tob = TopOfBookArray.from_records([rec, rec])
+
+    assert tob[0] == rec
+    assert np.shares_memory(tob[1:].data, tob.data)
+
+
+def test_trade_array_side_codes():
+    t0 = datetime(2025, 1, 1)
+    trades = TradeArray.from_records([Trade(t0, 100.0, 2.0, "buy"), Trade(t0, 100.1, 1.0, "sell")])
+
+    np.testing.assert_array_equal(trades.signed_size(), [2.0, -1.0])
+    assert trades[1].side == "sell"
+    assert trades.data.dtype.itemsize == 25
+
+    df = pd.DataFrame({"ts": [t0], "price": [1.0], "size": [1.0], "side": ["hold"]})
+    with pytest.raises(ValueError):
+        TradeArray.from_frame(df)
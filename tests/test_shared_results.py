@@ -0,0 +1,82 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from optimal_quoting.backtest.engine import MMParams
+from optimal_quoting.cli import run_sweep
+from optimal_quoting.config import SweepRun
+from optimal_quoting.experiments.shared_results import SharedResults, _run_batch
+
+
+def _runs(n: int) -> tuple[SweepRun, ...]:
+    return tuple(
+        SweepRun(
+            labels=(("seed", s),),
+            params=MMParams(
+                dt=1.0, T=200.0, mid0=100.0, sigma=0.02, A=1.5, k=1.5,
+                base_spread=0.2, phi=0.01, order_size=0.01, fee_bps=0.0, seed=s,
+            ),
+        )
+        for s in range(n)
+    )
+
+
+def _cell(x: float):
+    return {"a": x}, None, None
+
+
+def test_write_then_frame_roundtrip():
+    with SharedResults.create(3, ["a", "b"], n_steps=4) as res:
+        for cell in (2, 0, 1):
+            res.write(cell, {"a": cell, "b": 10.0 * cell}, np.full(4, cell), -np.ones(4))
+        df = res.frame([{"cell": i} for i in range(3)])
+
+        assert list(df.columns) == ["cell", "a", "b"]
+        np.testing.assert_array_equal(df["b"], [0.0, 10.0, 20.0])
+        np.testing.assert_array_equal(res.equity[:, 0], [0.0, 1.0, 2.0])
+
+
+def test_frame_rejects_unwritten_cells():
+    with SharedResults.create(2, ["a"]) as res:
+        res.write(0, {"a": 1.0})
+        with pytest.raises(RuntimeError):
+            res.frame()
+
+
+def test_close_unlinks_segments():
+    res = SharedResults.create(2, ["a"], n_steps=3)
+    names = [res.spec.metrics_name, res.spec.paths_name]
+    res.close()
+
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+def test_parallel_sweep_matches_serial():
+    runs = _runs(4)
+    labels = [dict(r.labels) for r in runs]
+    with run_sweep(runs, workers=1, keep_paths=True) as serial:
+        df1, eq1 = serial.frame(labels), serial.equity.copy()
+    with run_sweep(runs, workers=2, keep_paths=True) as parallel:
+        df2, eq2 = parallel.frame(labels), parallel.equity.copy()
+
+    assert df1.equals(df2)
+    np.testing.assert_array_equal(eq1, eq2)
+
+
+def test_worker_batch_detaches_after_writing(monkeypatch):
+    closed = []
+    close = SharedResults.close
+
+    def tracking_close(self):
+        closed.append(self.owner)
+        close(self)
+
+    monkeypatch.setattr(SharedResults, "close", tracking_close)
+    with SharedResults.create(3, ["a"]) as res:
+        assert _run_batch((res.spec, _cell, [(0, 1.0), (2, 3.0)])) == 2
+        np.testing.assert_array_equal(res.done, [True, False, True])
+        assert closed == [False]          # the worker's attachment, not the owner
+    assert closed == [False, True]
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from optimal_quoting.calibration.mle import fit_intensity_mle
+from optimal_quoting.calibration.taq import build_ladder_dataset
+from optimal_quoting.data.schema import TopOfBookArray, TradeArray
+
+
+def _quotes(ts_s, bid, ask) -> TopOfBookArray:
+    q = TopOfBookArray.empty(len(ts_s))
+    q.data["ts"] = (np.asarray(ts_s) * 1e9).astype(np.int64).view("M8[ns]")
+    q.data["bid"], q.data["ask"] = bid, ask
+    q.data["bid_size"] = q.data["ask_size"] = np.nan
+    return q
+
+
+def _trades(ts_s, price, side) -> TradeArray:
+    tr = TradeArray.empty(len(ts_s))
+    tr.data["ts"] = (np.asarray(ts_s) * 1e9).astype(np.int64).view("M8[ns]")
+    tr.data["price"], tr.data["size"], tr.data["side"] = price, 1.0, side
+    return tr
+
+
+def test_counts_trades_through_each_level():
+    q = _quotes([0, 10, 20], [99.9, 100.0, 100.0], [100.1, 100.2, 100.2])   # mids 100, 100.1
+    tr = _trades(
+        [1, 2, 10, 11, 25],
+        [99.85, 100.35, 99.0, 100.1, 90.0],
+        [-1, 1, -1, 1, -1],
+    )
+    ds = build_ladder_dataset(q, tr, [0.0, 0.1, 0.3])
+
+    # t=10 matches the first quote (strictly before); t=25 is after the last update
+    np.testing.assert_array_equal(ds.n_bid, [2, 2, 1])     # sells at x = 0.15, 1.0
+    np.testing.assert_array_equal(ds.n_ask, [2, 1, 1])     # buys at x = 0.35, 0.0
+    np.testing.assert_allclose(ds.exposure_bid, 20.0)
+
+
+def test_crossed_book_and_stale_quotes_are_excluded():
+    q = _quotes([0, 10, 20, 100], [99.9, 100.1, 99.9, 99.9], [100.1, 100.1, 100.1, 100.1])
+    tr = _trades([5, 15, 25, 50], [99.0] * 4, [-1] * 4)
+    ds = build_ladder_dataset(q, tr, [0.5], max_staleness=10.0)
+
+    # [10, 20) is locked; [20, 100) counts 10 s and the trade at t=50 is stale
+    np.testing.assert_allclose(ds.exposure_bid, 20.0)
+    np.testing.assert_array_equal(ds.n_bid, [2])
+
+
+def test_unsorted_trades_raise():
+    q = _quotes([0, 1], [99.9, 99.9], [100.1, 100.1])
+    with pytest.raises(ValueError):
+        build_ladder_dataset(q, _trades([0.5, 0.2], [100.0, 100.0], [1, 1]), [0.1])
+
+
+def test_recovers_intensity_from_synthetic_taq():
+    rng = np.random.default_rng(0)
+    A, k, T = 1.0, 2.0, 20_000
+    mid = 100.0 + np.cumsum(rng.normal(0.0, 0.01, T))
+    q = _quotes(np.arange(T), mid - 0.05, mid + 0.05)
+
+    n = rng.poisson(2 * A * (T - 1))
+    t = np.sort(rng.uniform(0.0, T - 1, n))
+    side = rng.choice(np.array([-1, 1], dtype=np.int8), n)
+    price = mid[np.floor(t).astype(int)] + side * rng.exponential(1.0 / k, n)
+    ds = build_ladder_dataset(q, _trades(t, price, side), np.linspace(0.0, 2.0, 21))
+
+    delta, cnt, w = ds.samples()
+    fit = fit_intensity_mle(delta, cnt, dt=1.0, w=w)
+    assert fit.A == pytest.approx(A, rel=0.05)
+    assert fit.k == pytest.approx(k, rel=0.05)
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from optimal_quoting.metrics.variance_reduction import (
+    control_variate_adjust,
+    inventory_pnl_control,
+    paired_difference,
+)
+
+
+def test_inventory_pnl_control_shapes():
+    inv = np.array([[0.0, 1.0, 1.0], [0.0, -1.0, 0.0]])
+    mid = np.array([[100.0, 101.0, 103.0], [100.0, 99.0, 98.0]])
+
+    x = inventory_pnl_control(inv, mid)
+
+    assert x.shape == (2,)
+    assert x == pytest.approx([2.0, 1.0])
+
+
+def test_control_variate_keeps_mean_and_cuts_variance():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=2000)
+    y = 1.0 + 3.0 * x + 0.1 * rng.normal(size=2000)
+
+    y_cv, beta = control_variate_adjust(y, x, mu_x=0.0)
+
+    assert beta == pytest.approx(3.0, abs=0.05)
+    assert np.mean(y_cv) == pytest.approx(1.0, abs=0.02)
+    assert np.var(y_cv) < 0.01 * np.var(y)
+
+
+def test_paired_difference():
+    mean, se = paired_difference(np.array([2.0, 3.0, 4.0]), np.array([1.0, 2.0, 3.0]))
+    assert mean == pytest.approx(1.0)
+    assert se == pytest.approx(0.0)